@@ -0,0 +1,88 @@
+"""Monster and class art, loaded once and kept ready to print.
+
+Each piece comes in two sizes: art/<file> (compact, fits the 80-column
+default) and art/fullsize/<file>. frame() picks the full size when the
+player's terminal is wide enough for it and the compact one otherwise, and
+returns the colored text pre-rendered so showing it is a single write.
+Pieces are kept in a bounded LRU (missing files included, so a monster
+whose art isn't installed doesn't hit the disk every encounter); a server
+running many sessions holds at most max_entries of them.
+"""
+import os
+import threading
+from collections import OrderedDict
+
+from renderer import format_text, columns
+from utils import get_resource_path
+
+COMPACT = "art"
+FULLSIZE = os.path.join("art", "fullsize")
+
+
+class ArtPiece:
+    __slots__ = ("lines", "width", "rendered")
+
+    def __init__(self, lines):
+        self.lines = lines
+        self.width = max((len(line) for line in lines), default=0)
+        # As write() would color it, but never wrapped (the width is checked instead)
+        self.rendered = format_text("\n".join(lines), width=max(self.width, 1))
+
+
+class ArtCache:
+    def __init__(self, max_entries=64):
+        self.max_entries = max_entries
+        self._pieces = OrderedDict()  # (subfolder, art_file) -> ArtPiece, or None if missing
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def piece(self, art_file, fullsize=False):
+        """The ArtPiece for art_file in one size (None if it isn't installed)."""
+        key = (FULLSIZE if fullsize else COMPACT, art_file)
+        with self._lock:
+            if key in self._pieces:
+                self.hits += 1
+                self._pieces.move_to_end(key)
+                return self._pieces[key]
+            self.misses += 1
+        piece = _load(*key)
+        with self._lock:
+            self._pieces[key] = piece
+            if len(self._pieces) > self.max_entries:
+                self._pieces.popitem(last=False)
+        return piece
+
+    def lines(self, art_file, fullsize=False):
+        piece = self.piece(art_file, fullsize)
+        return list(piece.lines) if piece else []
+
+    def frame(self, art_file, width=None):
+        """Pre-rendered art that fits width columns (the terminal's by default), or None."""
+        if width is None:
+            width = columns()
+        full = self.piece(art_file, fullsize=True)
+        if full and full.width <= width:
+            return full.rendered
+        compact = self.piece(art_file)
+        return compact.rendered if compact else None
+
+    def clear(self):
+        with self._lock:
+            self._pieces.clear()
+
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "pieces": len(self._pieces)}
+
+
+def _load(subfolder, art_file):
+    try:
+        with open(get_resource_path(art_file, subfolder=subfolder), "r") as f:
+            return ArtPiece([line.rstrip("\n") for line in f if not line.startswith("#")])
+    except OSError:
+        return None  # Not installed; callers just skip the art
+
+
+# Shared cache used by combat
+art_cache = ArtCache()
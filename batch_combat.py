@@ -0,0 +1,315 @@
+"""Vectorised fight resolver for balance sweeps.
+
+resolve_batch() plays n fights of one player build against one monster at
+once as NumPy arrays, using the same rules as combat_engine: level_scale,
+initiative, dodge and crit at 2% per Agility, armor reduction (including
+Player.get_total_armor_value), MP regen of 0.3 x W, and the monster skill
+roll. The player either attacks every turn or casts one direct-damage
+skill whenever it has the MP.
+
+check_consistency() runs the same matchup through combat_engine and
+compares the summaries, so the two stay in step:
+
+    python batch_combat.py --check
+    python batch_combat.py --classes 1,2,3 --levels 1,5,10 -n 20000
+
+NumPy is optional for the game; only this module needs it.
+"""
+import sys
+import time
+import random
+import argparse
+
+try:
+    import numpy as np
+except ImportError:  # Only balance sweeps need NumPy
+    np = None
+
+import combat_engine as engine
+from content import index, load_content
+from skillbook import skillbook
+
+# Player skill effects the resolver understands (others are rejected)
+_PLAYER_EFFECTS = ("direct_damage", "life-steal")
+_MONSTER_EFFECTS = ("direct_damage", "damage_bonus", "damage_over_time", "armor_bonus", "dodge_bonus", "curse")
+_MONSTER_SCALING = {"damage_bonus": 0.5, "direct_damage": 1.0, "damage_over_time": 0.2,
+                    "armor_bonus": 0.5, "dodge_bonus": 0.5}
+
+
+def _require_numpy():
+    if np is None:
+        raise RuntimeError("batch_combat needs NumPy (pip install numpy)")
+
+
+def _player_skill(player, skill_name):
+    """(mp_cost, direct damage) for a skill the resolver can cast."""
+    skill = skillbook.skill(skill_name)
+    if not skill:
+        raise ValueError(f"Unknown skill {skill_name!r}")
+    damage = 0
+    for effect in skill.effects:
+        if effect.type not in _PLAYER_EFFECTS:
+            raise ValueError(f"Skill {skill_name!r} has a {effect.type} effect; only direct damage is vectorised")
+        if effect.type == "direct_damage":
+            damage += effect.scaled(player.stats, 1.0)
+    return skill.mp_cost, damage
+
+
+def _monster_skills(monster):
+    skills = skillbook.for_monster(monster.get("skills"))
+    for s in skills:
+        if s.effect.type not in _MONSTER_EFFECTS:
+            raise ValueError(f"Monster skill {s.name!r} ({s.effect.type}) isn't vectorised")
+    return skills
+
+
+def _level_bounds(player, monster):
+    if monster["spawn_chance"] != 0:
+        lo = max(monster["level_range"]["min"], player.level - 2)
+        hi = min(monster["level_range"]["max"], player.level + 2)
+        if lo > hi:
+            lo, hi = hi, lo
+        return lo, hi
+    return monster["level_range"]["min"], monster["level_range"]["max"]
+
+
+def resolve_batch(player, monster_name, n, boss_fight=False, skill=None, seed=None, max_turns=200):
+    """Resolve n fights at once.
+
+    Returns a dict of arrays: won, turns (player actions taken), hp_lost
+    and level (the monster's rolled level). The player isn't modified.
+    """
+    _require_numpy()
+    rng = np.random.default_rng(seed)
+    monster = index.monster(monster_name)
+    if monster is None:
+        raise ValueError(f"Unknown monster {monster_name!r}")
+    m_stats = monster["stats"]
+    is_boss = monster["rare"] or boss_fight
+    monster_skills = _monster_skills(monster)
+
+    # Monster roll, as in combat_engine.start_combat / CombatState
+    lo, hi = _level_bounds(player, monster)
+    level = rng.integers(lo, hi + 1, n)
+    scale = 1 + (level - 1) * (0.1 if monster["rare"] else 0.05)
+    m_hp = rng.uniform(monster["hp_range"]["min"], monster["hp_range"]["max"], n) * scale
+    m_max_mp = 2 * m_stats["W"] * scale
+    m_mp = m_max_mp.copy()
+    m_min = monster["damage_range"]["min"] * scale
+    m_max = monster["damage_range"]["max"] * scale
+    if is_boss:
+        m_hp *= 1.5
+        m_min = m_min * 1.2
+        m_max = m_max * 1.2
+
+    # Player side; stats don't change during a fight
+    p_hp = np.full(n, float(player.hp))
+    p_mp = np.full(n, float(player.mp))
+    p_min, p_max = engine.get_weapon_damage_range(player)
+    p_armor = player.get_total_armor_value()
+    p_dodge = player.dodge_chance()
+    p_crit = player.crit_chance()
+    p_regen = player.stats["W"] * 0.3
+    skill_cost, skill_dmg = _player_skill(player, skill) if skill else (None, 0)
+
+    # Monster skill state
+    m_armor_bonus = np.zeros(n)
+    m_dodge_bonus = np.zeros(n)
+    # Turns left on each timed monster skill, counted down at the end of the monster's turn
+    m_effect_turns = {s.name: np.zeros(n, dtype=np.int64) for s in monster_skills
+                      if s.effect.type in ("damage_bonus", "damage_over_time", "armor_bonus", "dodge_bonus")}
+    p_curse_turns = np.zeros(n, dtype=np.int64)  # Counted down at the end of the player's turn
+
+    def scaled(s):
+        factor = _MONSTER_SCALING.get(s.effect.type)
+        return s.effect.base_dmg if factor is None else s.effect.scaled(m_stats, factor)
+
+    p_init = player.initiative()
+    m_init = (m_stats["A"] * 0.5 + m_stats["L"] * 0.5) / 100
+    first_chance = p_init / (p_init + m_init) if p_init + m_init > 0 else 0.5
+    player_first = rng.random(n) < first_chance
+
+    active = np.ones(n, dtype=bool)
+    won = np.zeros(n, dtype=bool)
+    turns = np.zeros(n, dtype=np.int64)
+
+    def monster_attack(mask):
+        bonus = np.zeros(n)
+        for s in monster_skills:
+            if s.effect.type == "damage_bonus":
+                bonus += np.where(m_effect_turns[s.name] > 0, scaled(s), 0)
+        damage = rng.uniform(m_min, m_max) + bonus
+        hit = mask & ~(rng.random(n) < p_dodge)
+        np.subtract(p_hp, damage * (1 - p_armor / 100), out=p_hp, where=hit)
+
+    for rnd in range(max_turns):
+        # Monster turn (skipped on the first round if the player won initiative)
+        m_turn = active & ~player_first if rnd == 0 else active.copy()
+        np.minimum(m_mp + m_stats["W"] * 0.3, m_max_mp, out=m_mp, where=m_turn)
+        if monster_skills:
+            # Like _monster_turn: each skill in order gets a 50% roll if affordable
+            undecided = m_turn & (m_mp > 0)
+            no_mp = m_turn & ~undecided
+            for s in monster_skills:
+                cast = undecided & (m_mp >= s.mp_cost) & (rng.random(n) < 0.5)
+                undecided &= ~cast
+                m_mp[cast] -= s.mp_cost
+                amount, effect = scaled(s), s.effect.type
+                if s.name in m_effect_turns:
+                    m_effect_turns[s.name][cast] = s.effect.duration
+                if effect == "direct_damage":
+                    p_hp[cast] -= amount
+                elif effect == "armor_bonus":
+                    m_armor_bonus[cast] = amount
+                elif effect == "dodge_bonus":
+                    m_dodge_bonus[cast] = amount
+                elif effect == "curse":
+                    p_curse_turns[cast] = s.effect.duration
+            # Monsters that rolled no skill (or had no MP) attack
+            monster_attack(undecided | no_mp)
+        else:
+            monster_attack(m_turn)
+        for s in monster_skills:
+            if s.name in m_effect_turns:
+                left = m_effect_turns[s.name]
+                ticking = m_turn & (left > 0)
+                if s.effect.type == "damage_over_time":
+                    p_hp[ticking] -= scaled(s)
+                left[ticking] -= 1
+                ended = ticking & (left == 0)
+                if s.effect.type == "armor_bonus":
+                    m_armor_bonus[ended] = 0
+                elif s.effect.type == "dodge_bonus":
+                    m_dodge_bonus[ended] = 0
+        dead = active & (p_hp <= 0)
+        active &= ~dead
+
+        # Player turn: MP regen, then attack or cast
+        np.minimum(p_mp + p_regen, player.max_mp, out=p_mp, where=active)
+        turns[active] += 1
+        cast = active & (p_mp >= skill_cost) & (p_curse_turns == 0) if skill else np.zeros(n, dtype=bool)
+        p_mp[cast] -= skill_cost or 0
+        m_hp[cast] -= skill_dmg
+        swing = active & ~cast
+        damage = rng.uniform(p_min, p_max, n)
+        dodged = rng.random(n) < (m_stats["A"] * 0.02 + m_dodge_bonus / 100)
+        crit = rng.random(n) < p_crit
+        damage = np.where(crit, damage * 1.5, damage) * (1 - (monster["armor_value"] + m_armor_bonus) / 100)
+        np.subtract(m_hp, damage, out=m_hp, where=swing & ~dodged)
+        p_curse_turns[active & (p_curse_turns > 0)] -= 1
+        killed = active & (m_hp <= 0)
+        won |= killed
+        active &= ~killed
+        if not active.any():
+            break
+
+    return {"won": won, "turns": turns, "hp_lost": player.hp - np.maximum(p_hp, 0), "level": level}
+
+
+def summarize(result):
+    won = result["won"]
+    turns = result["turns"][won] if won.any() else result["turns"]
+    return {
+        "fights": len(won),
+        "win_rate": float(won.mean()),
+        "turns_mean": float(turns.mean()),
+        "turns_p50": float(np.percentile(turns, 50)),
+        "turns_p90": float(np.percentile(turns, 90)),
+        "hp_lost_mean": float(result["hp_lost"].mean()),
+        "hp_lost_p90": float(np.percentile(result["hp_lost"], 90)),
+    }
+
+
+def scalar_batch(player, monster_name, n, boss_fight=False, skill=None, seed=None, max_turns=200):
+    """The same matchup and policy played fight by fight through combat_engine."""
+    _require_numpy()
+    rng = random.Random(seed)
+    start = (player.hp, player.mp, player.gold, player.exp)
+    won, turns, hp_lost = [], [], []
+    cost = index.skill(skill)["mp_cost"] if skill else None
+    for _ in range(n):
+        player.hp, player.mp, player.gold, player.exp = start
+        state, _ = engine.start_combat(player, boss_fight, monster_name, rng=rng)
+        actions = 0
+        while not state.over and actions < max_turns:
+            actions += 1
+            if skill and player.mp >= cost and not state.player_status.get("curse", 0) > 0:
+                engine.use_skill(state, player, skill)
+            else:
+                engine.attack(state, player)
+        won.append(state.result == "victory")
+        turns.append(actions)
+        hp_lost.append(start[0] - max(player.hp, 0))
+    player.hp, player.mp, player.gold, player.exp = start
+    return {"won": np.array(won), "turns": np.array(turns), "hp_lost": np.array(hp_lost)}
+
+
+def check_consistency(class_type="1", level=3, monster_name="Goblin", n=20000, skill=None, seed=7):
+    """Compare resolve_batch with combat_engine on one matchup.
+
+    Returns (ok, vector_summary, scalar_summary). Win rates must agree to
+    within 2 points and mean turns / HP lost to within 5%.
+    """
+    from simulate import make_player
+    player = make_player(class_type, level)
+    vector = summarize(resolve_batch(player, monster_name, n, skill=skill, seed=seed))
+    scalar = summarize(scalar_batch(player, monster_name, n, skill=skill, seed=seed))
+    ok = abs(vector["win_rate"] - scalar["win_rate"]) <= 0.02
+    for key in ("turns_mean", "hp_lost_mean"):
+        ok = ok and abs(vector[key] - scalar[key]) <= 0.05 * max(abs(scalar[key]), 1e-9) + 0.05
+    return ok, vector, scalar
+
+
+def sweep(classes, levels, monsters, n, skills=None, seed=1):
+    """Yield (class, level, monster, summary) for every combination."""
+    from simulate import make_player
+    for class_type in classes:
+        for level in levels:
+            player = make_player(class_type, level)
+            skill = (skills or {}).get(class_type)
+            for i, monster_name in enumerate(monsters):
+                result = resolve_batch(player, monster_name, n, skill=skill, seed=(seed, int(class_type), level, i))
+                yield class_type, level, monster_name, summarize(result)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Vectorised fight sweeps.")
+    parser.add_argument("-n", type=int, default=10000, help="fights per matchup")
+    parser.add_argument("--classes", default="1,2,3")
+    parser.add_argument("--levels", default="1,5,10,15,20")
+    parser.add_argument("--monsters", default=None, help="comma separated (default: all regular monsters)")
+    parser.add_argument("--check", action="store_true", help="compare against combat_engine and exit")
+    args = parser.parse_args(argv)
+    _require_numpy()
+
+    import renderer
+    renderer.set_mode("silent")
+
+    if args.check:
+        failures = 0
+        for class_type, level, monster_name, skill in [("1", 3, "Goblin", None), ("2", 2, "Goblin", "Fireball"),
+                                                      ("3", 8, "Troll", None), ("1", 4, "Ogre King", None)]:
+            ok, vector, scalar = check_consistency(class_type, level, monster_name, skill=skill)
+            failures += not ok
+            print(f"{'ok  ' if ok else 'FAIL'} class {class_type} L{level} vs {monster_name} ({skill or 'attack'})")
+            for label, s in (("vector", vector), ("scalar", scalar)):
+                print(f"     {label}: win {s['win_rate']:.3f}  turns {s['turns_mean']:.2f}  hp lost {s['hp_lost_mean']:.2f}")
+        return 1 if failures else 0
+
+    monsters = args.monsters.split(",") if args.monsters else [
+        m["name"] for m in load_content("monster.json").get("monsters", []) if not m["rare"]]
+    start = time.perf_counter()
+    fights = 0
+    print(f"{'class':<6}{'lvl':>4}  {'monster':<22}{'win%':>7}{'turns':>7}{'p90':>6}{'hp lost':>9}{'p90':>7}")
+    for class_type, level, monster_name, s in sweep(args.classes.split(","), [int(l) for l in args.levels.split(",")],
+                                                     monsters, args.n):
+        fights += s["fights"]
+        print(f"{class_type:<6}{level:>4}  {monster_name:<22}{100 * s['win_rate']:>6.1f}%{s['turns_mean']:>7.2f}"
+              f"{s['turns_p90']:>6.0f}{s['hp_lost_mean']:>9.1f}{s['hp_lost_p90']:>7.1f}")
+    elapsed = time.perf_counter() - start
+    print(f"\n{fights} fights in {elapsed:.2f}s ({fights / elapsed:.0f}/s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,503 @@
+"""Combat rules with no terminal attached.
+
+start_combat() rolls a monster and returns a CombatState; the player then
+acts through attack(), use_item(), use_skill() and flee(). Each call plays
+out the player's action, the monster's reply and the start of the next
+player turn, and returns a list of event dicts ({"type": ..., ...}) that a
+front-end can render (see combat.combat) or a simulation can count.
+Gold and XP are credited on victory; level-ups are left to the caller
+because they ask the player to allocate stat points.
+"""
+from content import load_content, index
+from effects import EffectTimers
+from rngs import stream
+from sampling import SamplerCache
+from skillbook import skillbook
+from statblocks import stat_blocks
+import items
+
+
+def get_weapon_damage_range(player):
+    return player.weapon_damage_range()
+
+
+def monster_damage_bonus(monster_skill_effects, monster_stats):
+    """Sum the damage bonus from the monster's active damage_bonus skills."""
+    bonus = 0
+    for s_name, turns in monster_skill_effects.items():
+        s = skillbook.skill(s_name, "monster")
+        if s and s.effect.type == "damage_bonus" and turns > 0:
+            bonus += s.effect.scaled(monster_stats["stats"], 0.5)
+    return bonus
+
+
+def _spawn_pool(data, boss_fight):
+    monsters = data.get("monsters", [])
+    pool = [m for m in monsters if m["rare"] == boss_fight]
+    if not pool:  # No rare/regular monsters at all: use the full pool
+        pool = monsters
+    return pool, [m["spawn_chance"] for m in pool]
+
+
+def _encounter_pool(data, player_level):
+    # Regular monsters whose level range overlaps the player's level +/- 2
+    monsters = data.get("monsters", [])
+    pool = [m for m in monsters
+            if not m["rare"] and m["spawn_chance"] > 0
+            and m["level_range"]["min"] <= player_level + 2 and m["level_range"]["max"] >= player_level - 2]
+    if not pool:  # Nothing fits this level: fall back to the first regular monster
+        pool = [m for m in monsters if not m["rare"]][:1]
+        return pool, [1] * len(pool)
+    return pool, [m["spawn_chance"] for m in pool]
+
+
+def _boss_pool(data, key):
+    monsters = data.get("monsters", [])
+    pool = [m for m in monsters if m["rare"] and m["spawn_chance"] > 0]
+    if not pool:
+        pool = [m for m in monsters if not m["rare"]]
+    return pool, [1] * len(pool)
+
+
+_spawn_samplers = SamplerCache("monster.json", _spawn_pool)
+_encounter_samplers = SamplerCache("monster.json", _encounter_pool)
+_boss_samplers = SamplerCache("monster.json", _boss_pool)
+
+
+def get_encounter_sampler(player_level):
+    """Alias sampler over the regular monsters for this level window, or None."""
+    return _encounter_samplers.get(player_level)
+
+
+def get_boss_sampler():
+    """Uniform sampler over the spawnable bosses, or None."""
+    return _boss_samplers.get()
+
+
+def load_monster_from_json(monster_name=None, boss_fight=False, player_level=None, rng=None):
+    """Return a copy of the monster's content record (None if it isn't known)."""
+    if monster_name:
+        monster = index.monster(monster_name)
+        if not monster:
+            return None
+    else:
+        monster = _spawn_samplers.get(bool(boss_fight)).sample(rng or stream("combat"))
+    # Copy so per-fight changes (item effects) don't leak into the shared content cache
+    return dict(monster)
+
+
+class CombatState:
+    """Everything about one fight that isn't stored on the Player."""
+
+    def __init__(self, monster_stats, level, boss_fight, rng=None):
+        self.rng = rng = rng or stream("combat")
+        self.monster_stats = monster_stats
+        self.level = level
+        self.boss_fight = boss_fight
+        # Scaled ranges, dodge and initiative, shared by every fight with this monster/level
+        self.block = block = stat_blocks.block(monster_stats, level, boss_fight)
+        self.is_boss = block.is_boss
+        self.name = block.name
+        self.monster_hp = block.roll_hp(rng)
+        self.monster_mp = self.monster_max_mp = block.max_mp
+        self.monster_min_dmg = block.min_dmg
+        self.monster_max_dmg = block.max_dmg
+
+        self.monster_skills = monster_stats.get("skills") or []
+        # The monster's compiled skills, in skills.json order for the per-turn rolls
+        self.monster_skill_data = skillbook.for_monster(self.monster_skills)
+        # Timed effects, each on its owner's clock: the monster's tick at the end of
+        # its turn, the player's after each action (only curse affects players for now)
+        self.monster_skill_effects = EffectTimers()
+        self.monster_status = EffectTimers()  # sleep, curse, poison
+        self.player_status = EffectTimers()
+        self.player_skill_effects = EffectTimers()
+        # Offensive items on the monster tick whenever an item is used
+        monster_stats["effects"] = EffectTimers(_item_effect_tick)
+
+        # Temporary bonuses from skills
+        self.player_armor_bonus = 0
+        self.player_dodge_bonus = 0
+        self.monster_armor_bonus = 0
+        self.monster_dodge_bonus = 0
+
+        self.turn = "player"
+        self.turns = 0
+        self.result = None  # "victory", "defeat" or "fled" once the fight is over
+        self.xp = 0
+        self.gold = 0
+
+    @property
+    def over(self):
+        return self.result is not None
+
+
+def start_combat(player, boss_fight=False, monster_name=None, rng=None):
+    """Roll the monster and initiative. Returns (state, events).
+
+    rng defaults to the session's "combat" stream; the fight keeps using it.
+    """
+    rng = rng or stream("combat")
+    events = []
+    monster_stats = load_monster_from_json(monster_name, boss_fight, player.level, rng)
+    if monster_stats is None:
+        events.append({"type": "warning", "message": f"Monster '{monster_name}' not found in monster.json. Using fallback."})
+        monster_stats = dict(load_content("monster.json")["monsters"][0])
+
+    if monster_stats["spawn_chance"] != 0:
+        min_level = max(monster_stats["level_range"]["min"], player.level - 2)
+        max_level = min(monster_stats["level_range"]["max"], player.level + 2)
+        if min_level > max_level:
+            min_level, max_level = max_level, min_level
+    else:  # Quest bosses keep their own level range
+        min_level = monster_stats["level_range"]["min"]
+        max_level = monster_stats["level_range"]["max"]
+
+    level = rng.randint(min_level, max_level)
+    state = CombatState(monster_stats, level, boss_fight, rng)
+
+    player_initiative = player.initiative()
+    monster_initiative = state.block.initiative
+    total_initiative = player_initiative + monster_initiative
+    player_goes_first = rng.random() < (player_initiative / total_initiative) if total_initiative > 0 else rng.random() < 0.5
+    state.turn = "player" if player_goes_first else "monster"
+    events.append({"type": "initiative", "player_first": player_goes_first})
+    events.append({"type": "appear", "name": state.name, "level": level, "hp": state.monster_hp,
+                   "art_file": monster_stats.get("art_file")})
+    _advance(state, player, events)
+    return state, events
+
+
+def _check_end(state, player, events):
+    if player.hp <= 0:
+        state.result = "defeat"
+        events.append({"type": "defeat"})
+    elif state.monster_hp <= 0:
+        state.result = "victory"
+        state.xp = state.level * 2 * (1.5 if state.is_boss else 1)
+        state.gold = state.rng.randint(state.level * 2, state.level * 5) * (2 if state.is_boss else 1)
+        player.gold += state.gold
+        player.exp += state.xp
+        events.append({"type": "victory", "monster": state.monster_stats["name"], "xp": state.xp, "gold": state.gold})
+    return state.over
+
+
+def _advance(state, player, events):
+    """Run the monster's turn if it's due, then start the player's turn."""
+    if _check_end(state, player, events):
+        return
+    if state.turn == "monster":
+        _monster_turn(state, player, events)
+        state.turn = "player"
+        if _check_end(state, player, events):
+            return
+    # Start of the player's turn: MP regeneration and timed consumables
+    state.turns += 1
+    if player.mp < player.max_mp:
+        mp_regen = player.stats["W"] * 0.3
+        player.mp = min(player.mp + mp_regen, player.max_mp)
+        events.append({"type": "mp_regen", "amount": mp_regen})
+    if player.active_effects:
+        player.active_effects.tick(player, lambda text: events.append({"type": "item_message", "text": text}))
+
+
+def _monster_attack(state, player, events):
+    rng = state.rng
+    dodge_chance = player.dodge_chance() + (state.player_dodge_bonus / 100)
+    monster_bonus = monster_damage_bonus(state.monster_skill_effects, state.monster_stats)
+    damage = rng.uniform(state.monster_min_dmg, state.monster_max_dmg) + monster_bonus
+    if rng.random() < dodge_chance:
+        events.append({"type": "player_dodge"})
+    else:
+        armor_reduction = (player.get_total_armor_value() + state.player_armor_bonus) / 100
+        reduced_damage = damage * (1 - armor_reduction)
+        player.hp -= reduced_damage
+        events.append({"type": "monster_hit", "damage": reduced_damage, "raw": damage})
+
+
+def _monster_turn(state, player, events):
+    rng = state.rng
+    stats = state.monster_stats["stats"]
+    if state.monster_mp < state.monster_max_mp:
+        state.monster_mp = min(state.monster_mp + stats["W"] * 0.3, state.monster_max_mp)
+
+    if state.monster_hp > 0:
+        if state.monster_status.get("sleep", 0) > 0:
+            if rng.random() < stats["I"] * 0.05:
+                state.monster_status.end("sleep")
+                events.append({"type": "monster_wakes"})
+            else:
+                events.append({"type": "monster_asleep"})
+        elif state.monster_skills and state.monster_mp > 0 and not state.monster_status.get("curse", 0) > 0:
+            try:
+                for skill in state.monster_skill_data:
+                    if skill.mp_cost <= state.monster_mp and rng.random() < 0.5:
+                        _monster_skill(state, player, skill, events)
+                        break
+                else:
+                    _monster_attack(state, player, events)
+            except Exception as e:
+                events.append({"type": "error", "message": f"Monster skill processing failed: {e}"})
+        else:
+            _monster_attack(state, player, events)
+
+    # The monster's effects and statuses count down on its own turn
+    state.monster_skill_effects.tick(state, player, events)
+    state.monster_status.tick()
+
+
+# Callbacks for timed effects: (name, state, player, events)
+def _monster_dot_tick(skill_name, state, player, events):
+    dot_dmg = skillbook.skill(skill_name, "monster").effect.scaled(state.monster_stats["stats"], 0.2)
+    player.hp -= dot_dmg
+    events.append({"type": "monster_dot", "skill": skill_name, "damage": dot_dmg})
+
+
+def _monster_armor_ended(skill_name, state, player, events):
+    state.monster_armor_bonus = 0
+
+
+def _monster_dodge_ended(skill_name, state, player, events):
+    state.monster_dodge_bonus = 0
+
+
+def _item_effect_tick(item_name, state):
+    state.monster_hp -= 5
+
+
+# What each skill effect does when cast: handler(state, player, skill, effect, amount)
+def _monster_set_effect(state, player, skill, effect, amount):
+    state.monster_skill_effects.start(skill.name, effect.duration)
+
+
+def _monster_damage_over_time(state, player, skill, effect, amount):
+    state.monster_skill_effects.start(skill.name, effect.duration, on_tick=_monster_dot_tick)
+
+
+def _monster_armor_bonus(state, player, skill, effect, amount):
+    state.monster_skill_effects.start(skill.name, effect.duration, on_expire=_monster_armor_ended)
+    state.monster_armor_bonus = amount
+
+
+def _monster_dodge_bonus(state, player, skill, effect, amount):
+    state.monster_skill_effects.start(skill.name, effect.duration, on_expire=_monster_dodge_ended)
+    state.monster_dodge_bonus = amount
+
+
+def _monster_direct_damage(state, player, skill, effect, amount):
+    player.hp -= amount
+
+
+def _monster_curse(state, player, skill, effect, amount):
+    state.player_status.start("curse", effect.duration)
+
+
+MONSTER_EFFECTS = {
+    "direct_damage": _monster_direct_damage,
+    "damage_bonus": _monster_set_effect,
+    "damage_over_time": _monster_damage_over_time,
+    "armor_bonus": _monster_armor_bonus,
+    "dodge_bonus": _monster_dodge_bonus,
+    "curse": _monster_curse,
+}
+
+
+def _player_set_effect(state, player, skill, effect, amount):
+    """Keep skill active for effect.duration player turns; its effects share one timer."""
+    ticks = any(e.type in PLAYER_TICKS for e in skill.effects)
+    ends = any(e.type in PLAYER_ENDS for e in skill.effects)
+    state.player_skill_effects.start(skill.name, effect.duration,
+                                     _player_skill_tick if ticks else None,
+                                     _player_skill_ended if ends else None)
+
+
+def _player_direct_damage(state, player, skill, effect, amount):
+    state.monster_hp -= amount
+
+
+def _player_heal(state, player, skill, effect, amount):
+    player.hp = min(player.hp + amount, player.max_hp)
+
+
+def _player_damage_over_time(state, player, skill, effect, amount):
+    _player_set_effect(state, player, skill, effect, amount)
+    state.monster_status.start("poison", effect.duration)
+
+
+def _player_armor_bonus(state, player, skill, effect, amount):
+    _player_set_effect(state, player, skill, effect, amount)
+    state.player_armor_bonus = amount
+
+
+def _player_dodge_bonus(state, player, skill, effect, amount):
+    _player_set_effect(state, player, skill, effect, amount)
+    state.player_dodge_bonus = amount
+
+
+def _player_sleep(state, player, skill, effect, amount):
+    state.monster_status.start("sleep", effect.duration)
+
+
+def _player_curse(state, player, skill, effect, amount):
+    state.monster_status.start("curse", effect.duration)
+
+
+PLAYER_EFFECTS = {
+    "direct_damage": _player_direct_damage,
+    "heal": _player_heal,
+    "damage_bonus": _player_set_effect,
+    "heal_over_time": _player_set_effect,
+    "damage_over_time": _player_damage_over_time,
+    "armor_bonus": _player_armor_bonus,
+    "dodge_bonus": _player_dodge_bonus,
+    "sleep": _player_sleep,
+    "curse": _player_curse,
+}
+
+
+# Effects that keep working on later turns: handler(state, player, skill_name, effect) -> event amount
+def _tick_damage_over_time(state, player, skill_name, effect):
+    armor_reduction = (state.block.armor + state.monster_armor_bonus) / 100
+    reduced_damage = effect.scaled(player.stats, 0.2, whole=False) * (1 - armor_reduction)
+    state.monster_hp -= reduced_damage
+    return reduced_damage
+
+
+def _tick_heal_over_time(state, player, skill_name, effect):
+    healed = effect.scaled(player.stats, 0.5, whole=False)
+    player.hp = min(player.hp + healed, player.max_hp)
+    return healed
+
+
+PLAYER_TICKS = {
+    "damage_over_time": _tick_damage_over_time,
+    "heal_over_time": _tick_heal_over_time,
+}
+
+
+# What running out undoes: handler(state, player)
+def _end_armor_bonus(state, player):
+    state.player_armor_bonus = 0
+
+
+def _end_dodge_bonus(state, player):
+    state.player_dodge_bonus = 0
+
+
+PLAYER_ENDS = {
+    "armor_bonus": _end_armor_bonus,
+    "dodge_bonus": _end_dodge_bonus,
+}
+
+
+def _player_skill_tick(skill_name, state, player, events):
+    """Player damage/heal over time, applied after each player action."""
+    for effect in skillbook.skill(skill_name).effects:
+        tick = PLAYER_TICKS.get(effect.type)
+        if tick:
+            events.append({"type": "skill_tick", "skill": skill_name, "effect": effect.type,
+                           "amount": tick(state, player, skill_name, effect)})
+
+
+def _player_skill_ended(skill_name, state, player, events):
+    for effect in skillbook.skill(skill_name).effects:
+        end = PLAYER_ENDS.get(effect.type)
+        if end:
+            end(state, player)
+
+
+def _no_effect(state, player, skill, effect, amount):
+    pass
+
+
+def _monster_skill(state, player, skill, events):
+    state.monster_mp -= skill.mp_cost
+    effect = skill.effect
+    amount = effect.base_dmg
+    if effect.scaling is not None and effect.type not in ("heal", "heal_over_time"):
+        amount = effect.scaled(state.monster_stats["stats"], effect.scaling)
+    MONSTER_EFFECTS.get(effect.type, _no_effect)(state, player, skill, effect, amount)
+    events.append({"type": "monster_skill", "skill": skill.name, "effect": effect.type,
+                   "amount": amount, "duration": effect.duration})
+
+
+def _end_player_turn(state, player, events):
+    state.player_skill_effects.tick(state, player, events)
+    state.player_status.tick()
+    state.turn = "monster"
+    _advance(state, player, events)
+    return events
+
+
+def attack(state, player):
+    rng = state.rng
+    events = []
+    min_dmg, max_dmg = get_weapon_damage_range(player)
+    dodge_chance = state.block.dodge + (state.monster_dodge_bonus / 100)
+    crit_chance = player.crit_chance()
+    damage = rng.uniform(min_dmg, max_dmg)
+    if rng.random() < dodge_chance:
+        events.append({"type": "monster_dodge"})
+    else:
+        critical = rng.random() < crit_chance
+        if critical:
+            damage *= 1.5
+        armor_reduction = (state.block.armor + state.monster_armor_bonus) / 100
+        reduced_damage = damage * (1 - armor_reduction)
+        state.monster_hp -= reduced_damage
+        events.append({"type": "player_hit", "damage": reduced_damage, "raw": damage, "critical": critical})
+    return _end_player_turn(state, player, events)
+
+
+def use_item(state, player, item_name):
+    """Use or equip an inventory item. A failed use doesn't end the turn."""
+    events = []
+    monster_stats = state.monster_stats
+    monster_stats["hp"] = state.monster_hp  # Lets direct-damage items hit the monster
+    used = items.use_item(player, item_name, monster_stats,
+                          out=lambda text: events.append({"type": "item_message", "text": text}))
+    state.monster_hp = monster_stats.pop("hp")
+    if not used:
+        events.append({"type": "item_failed", "item": item_name})
+        return events
+    monster_stats["effects"].tick(state)
+    events.append({"type": "item_used", "item": item_name})
+    return _end_player_turn(state, player, events)
+
+
+def use_skill(state, player, skill_name):
+    """Cast one of the player's skills. An unusable skill doesn't end the turn."""
+    events = []
+    if not player.skills or state.player_status.get("curse", 0) > 0:
+        events.append({"type": "skill_unavailable", "skill": skill_name,
+                       "reason": "no_skills" if not player.skills else "cursed"})
+        return events
+    skill = skillbook.skill(skill_name)
+    if not skill or player.mp < skill.mp_cost:
+        events.append({"type": "skill_unavailable", "skill": skill_name,
+                       "reason": "no_mp" if skill else "unknown"})
+        return events
+
+    player.mp -= skill.mp_cost
+    for effect in skill.effects:
+        amount = effect.base_dmg
+        if effect.stat != "none":
+            if effect.scaling is not None:
+                amount = effect.scaled(player.stats, effect.scaling)
+            elif effect.type == "life-steal":
+                amount = 0
+        PLAYER_EFFECTS.get(effect.type, _no_effect)(state, player, skill, effect, amount)
+        events.append({"type": "player_skill", "skill": skill_name, "effect": effect.type,
+                       "amount": amount, "duration": effect.duration})
+    return _end_player_turn(state, player, events)
+
+
+def flee(state, player):
+    events = []
+    flee_chance = 0.5 + (player.stats["A"] - state.monster_stats["stats"]["A"]) * 0.05
+    if state.rng.random() < flee_chance:
+        state.result = "fled"
+        events.append({"type": "fled"})
+        return events
+    events.append({"type": "flee_failed"})
+    return _end_player_turn(state, player, events)
@@ -0,0 +1,130 @@
+"""Consoles: where a session's text goes and its answers come from.
+
+A console is a renderer.Renderer (write, write_menu, read_line, pause)
+with its own read_input(). game.main(console=...) installs one for the
+session; every menu then talks to it through the renderer functions.
+
+    TerminalConsole  stdin/stdout, the normal game
+    ScriptedConsole  queued answers, output captured (tests, load runs, replays)
+    NetworkConsole   an asyncio stream pair (server.py)
+"""
+import io
+import asyncio
+from collections import deque
+
+from renderer import Renderer
+
+IAC = 255
+SE, SB = 240, 250
+WILL, WONT, DO, DONT = 251, 252, 253, 254
+
+
+class TerminalConsole(Renderer):
+    """Reads with input() and writes to sys.stdout."""
+
+    def read_input(self, prompt):
+        return input(prompt)
+
+
+class ScriptExhausted(EOFError):
+    """The game asked for more answers than the script has."""
+
+
+class ScriptedConsole(Renderer):
+    """Answers prompts from a queue; output is kept in self.output (a StringIO).
+
+    feed() adds answers while a session is running; read_line raises
+    ScriptExhausted once they run out.
+    """
+
+    def __init__(self, answers=(), mode="fast"):
+        super().__init__(mode=mode, stream=io.StringIO())
+        self.answers = deque(answers)
+        self.answered = 0
+        self.prompts = []
+
+    @property
+    def output(self):
+        self.flush()
+        return self.stream.getvalue()
+
+    def feed(self, *answers):
+        self.answers.extend(answers)
+
+    def read_input(self, prompt):
+        self.prompts.append(prompt)
+        if not self.answers:
+            raise ScriptExhausted(prompt)
+        self.answered += 1
+        if self.mode != "silent":
+            self.stream.write(prompt)
+        return self.answers.popleft()
+
+
+def strip_telnet(data):
+    """Remove telnet command sequences (IAC ...) from a received line."""
+    if IAC not in data:
+        return data
+    out = bytearray()
+    i = 0
+    while i < len(data):
+        byte = data[i]
+        if byte != IAC or i + 1 >= len(data):
+            out.append(byte)
+            i += 1
+            continue
+        command = data[i + 1]
+        if command == IAC:  # Escaped 255
+            out.append(IAC)
+            i += 2
+        elif command in (WILL, WONT, DO, DONT):
+            i += 3
+        elif command == SB:
+            end = data.find(bytes([IAC, SE]), i + 2)
+            i = len(data) if end < 0 else end + 2
+        else:
+            i += 2
+    return bytes(out)
+
+
+class SocketStream:
+    """File-like end of a NetworkConsole: text goes into the socket's buffer."""
+
+    def __init__(self, writer):
+        self.writer = writer
+
+    def write(self, text):
+        self.writer.write(text.replace("\n", "\r\n").encode("utf-8", "replace"))
+
+    def flush(self):
+        pass  # Sent when the session next waits for input
+
+
+class NetworkConsole(Renderer):
+    """A telnet-compatible line session over an asyncio (reader, writer) pair.
+
+    Output is buffered into the socket and sent when the game waits for
+    input; disconnecting, idling past idle_timeout or sending an overlong
+    line raises EOFError out of read_line.
+    """
+
+    def __init__(self, reader, writer, idle_timeout=None):
+        super().__init__(mode="fast", stream=SocketStream(writer))
+        self.reader = reader
+        self.writer = writer
+        self.idle_timeout = idle_timeout
+
+    async def read_input(self, prompt):
+        self.stream.write(prompt)
+        await self.writer.drain()
+        try:
+            line = await asyncio.wait_for(self.reader.readline(), self.idle_timeout)
+        except asyncio.TimeoutError:
+            self.write("\nIdle too long, disconnecting.")
+            self.flush()
+            raise EOFError("idle timeout")
+        except ValueError:  # readline's limit overrun
+            raise EOFError("line too long")
+        if not line:
+            raise EOFError("client disconnected")
+        return strip_telnet(line).decode("utf-8", "replace").rstrip("\r\n")
@@ -0,0 +1,249 @@
+import os
+import json
+import bisect
+import threading
+from itertools import accumulate
+from utils import get_resource_path
+from renderer import write
+
+
+class ContentRegistry:
+    """Process-wide cache for the game's content files.
+
+    Files are parsed once and shared by every module. Each lookup stats the
+    file and only re-parses it when its mtime or size changed, so edits to the
+    JSON files still show up without restarting the game.
+
+    The returned data is shared: treat it as read-only and copy anything you
+    need to mutate (e.g. monster dicts that pick up combat effects).
+    """
+
+    def __init__(self):
+        self._entries = {}  # path -> (mtime_ns, size, data)
+        self._paths = {}  # (filename, subfolder) -> resolved path
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.version = 0  # Bumped whenever any file is (re)loaded
+        # False skips the per-lookup stat once a file is cached (long batch runs)
+        self.revalidate = True
+
+    def _path(self, filename, subfolder):
+        path = self._paths.get((filename, subfolder))
+        if path is None:
+            path = self._paths[(filename, subfolder)] = get_resource_path(filename, subfolder=subfolder)
+        return path
+
+    def _get(self, filename, subfolder, loader, default):
+        path = self._path(filename, subfolder)
+        if not self.revalidate:
+            entry = self._entries.get(path)
+            if entry:
+                self.hits += 1
+                return entry[2]
+        try:
+            st = os.stat(path)
+        except OSError as e:
+            write(f"Error loading {path}: {e}")
+            return default
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry and entry[0] == st.st_mtime_ns and entry[1] == st.st_size:
+                self.hits += 1
+                return entry[2]
+            self.misses += 1
+        try:
+            with open(path, "r") as f:
+                data = loader(f)
+        except Exception as e:
+            write(f"Error loading {path}: {e}")
+            return default
+        with self._lock:
+            self._entries[path] = (st.st_mtime_ns, st.st_size, data)
+            self.version += 1
+        return data
+
+    def load(self, filename, subfolder=None, default=None):
+        """Return the parsed JSON for a content file ({} if it can't be read)."""
+        return self._get(filename, subfolder, json.load, {} if default is None else default)
+
+    def load_lines(self, filename, subfolder=None):
+        """Return a text content file as a list of lines ([] if it can't be read)."""
+        return self._get(filename, subfolder, lambda f: f.read().splitlines(), [])
+
+    def exists(self, filename, subfolder=None):
+        return os.path.exists(self._path(filename, subfolder))
+
+    def invalidate(self, filename=None, subfolder=None):
+        """Drop one cached file, or everything when no filename is given."""
+        with self._lock:
+            if filename is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(self._path(filename, subfolder), None)
+            self.version += 1
+
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "files": len(self._entries), "version": self.version}
+
+
+# Shared registry used by every module
+registry = ContentRegistry()
+
+
+def load_content(filename, subfolder=None, default=None):
+    return registry.load(filename, subfolder=subfolder, default=default)
+
+
+def load_content_lines(filename, subfolder=None):
+    return registry.load_lines(filename, subfolder=subfolder)
+
+
+def content_exists(filename, subfolder=None):
+    return registry.exists(filename, subfolder=subfolder)
+
+
+def _first_by(records, key):
+    """Map key(record) -> record, keeping the first record like next(...) scans did."""
+    table = {}
+    for record in records:
+        table.setdefault(key(record), record)
+    return table
+
+
+class ContentIndex:
+    """Name-keyed lookup tables built on top of the registry.
+
+    Each table is built once per loaded version of its source file and is
+    rebuilt automatically when the registry re-parses that file.
+    """
+
+    def __init__(self, registry):
+        self._registry = registry
+        self._built = {}  # filename -> (parsed data, tables)
+
+    def _tables(self, filename, builder):
+        data = self._registry.load(filename)
+        cached = self._built.get(filename)
+        if cached is not None and cached[0] is data:
+            return cached[1]
+        tables = builder(data)
+        self._built[filename] = (data, tables)
+        return tables
+
+    def _gear_tables(self):
+        def build(gear):
+            gear = gear if isinstance(gear, list) else []
+            return {
+                "name": _first_by(gear, lambda g: g["name"]),
+                "name_slot": _first_by(gear, lambda g: (g["name"], g.get("slot"))),
+            }
+        return self._tables("gear.json", build)
+
+    def _skill_tables(self):
+        def build(data):
+            skills = data.get("skills", []) if isinstance(data, dict) else []
+            by_class = {}
+            for skill in skills:
+                by_class.setdefault(skill.get("class_type"), []).append(skill)
+            return {
+                "name": _first_by(skills, lambda s: s["name"]),
+                "class_name": _first_by(skills, lambda s: (s.get("class_type"), s["name"])),
+                "class": by_class,
+            }
+        return self._tables("skills.json", build)
+
+    def _key_item_tables(self):
+        def build(data):
+            key_items = data.get("key_items", []) if isinstance(data, dict) else []
+            by_name = _first_by(key_items, lambda k: k["name"])
+            by_monster = {}
+            for item in key_items:
+                by_monster.setdefault(item.get("drop_from"), []).append(item)
+            return {
+                "name": by_name,
+                "sources": {
+                    name: {"drop_from": k["drop_from"], "drop_chance": k["drop_chance"], "quest": k["quest"]}
+                    for name, k in by_name.items()
+                },
+                "monster": by_monster,
+            }
+        return self._tables("keyitems.json", build)
+
+    def _event_tables(self):
+        def build(events):
+            events = events if isinstance(events, list) else []
+            # Levels where some event's range starts or ends split the levels into bands
+            bounds = sorted({e["level_range"]["min"] for e in events} | {e["level_range"]["max"] + 1 for e in events})
+            bands = []
+            for low in bounds:
+                members = [e for e in events if e["level_range"]["min"] <= low <= e["level_range"]["max"]]
+                bands.append((members, list(accumulate(e["spawn_chance"] for e in members)),
+                              frozenset(e["name"] for e in members)))
+            return {"name": _first_by(events, lambda e: e["name"]), "bounds": bounds, "bands": bands}
+        return self._tables("event.json", build)
+
+    def _list_table(self, filename, key="name", section=None):
+        def build(data):
+            records = data.get(section, []) if section else data
+            if not isinstance(records, list):
+                records = []
+            return _first_by(records, lambda r: r[key])
+        return self._tables(filename, build)
+
+    def gear(self, name, slot=None):
+        tables = self._gear_tables()
+        if slot is None:
+            return tables["name"].get(name)
+        return tables["name_slot"].get((name, slot))
+
+    def consumable(self, name):
+        return self._list_table("consumables.json").get(name)
+
+    def treasure(self, name):
+        return self._list_table("treasures.json").get(name)
+
+    def monster(self, name):
+        return self._list_table("monster.json", section="monsters").get(name)
+
+    def quest(self, quest_name):
+        return self._list_table("quest.json", key="quest_name", section="quests").get(quest_name)
+
+    def lore(self, quest_name):
+        return self._list_table("lore.json", key="quest_name", section="lore").get(quest_name)
+
+    def skill(self, name, class_type=None):
+        tables = self._skill_tables()
+        if class_type is None:
+            return tables["name"].get(name)
+        return tables["class_name"].get((class_type, name))
+
+    def skills_for_class(self, class_type):
+        """All skills for a class ("1"-"3" or "monster"), in skills.json order."""
+        return self._skill_tables()["class"].get(class_type, [])
+
+    def event(self, name):
+        return self._event_tables()["name"].get(name)
+
+    def events_for_level(self, level):
+        """(events, cum_weights, names) for the events a level can roll, in event.json order."""
+        tables = self._event_tables()
+        band = bisect.bisect_right(tables["bounds"], level) - 1
+        if band < 0:
+            return [], [], frozenset()
+        return tables["bands"][band]
+
+    def key_item(self, name):
+        return self._key_item_tables()["name"].get(name)
+
+    def key_item_sources(self, name):
+        """Where a key item drops from: {"drop_from", "drop_chance", "quest"} or None."""
+        return self._key_item_tables()["sources"].get(name)
+
+    def key_items_from(self, monster_name):
+        return self._key_item_tables()["monster"].get(monster_name, [])
+
+
+# Shared indexes over the registry's content
+index = ContentIndex(registry)
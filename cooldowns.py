@@ -0,0 +1,70 @@
+"""Named cooldowns that count down in ticks.
+
+Expiry times are kept on a min-heap keyed by the tick they run out on, so
+tick() only touches the entries that actually expire instead of walking
+every name that was ever put on cooldown.
+"""
+import heapq
+
+
+class Cooldowns:
+    """Names that are unavailable for a number of ticks.
+
+    start(name, ticks) keeps name active through the next `ticks - 1`
+    calls to tick(), matching a counter decremented once per tick. Saves
+    store remaining() as {name: ticks left}; pass that back to the
+    constructor to resume.
+    """
+
+    def __init__(self, remaining=None):
+        self.clock = 0
+        self._expires = {}  # name -> tick it expires on
+        self._heap = []  # (expires, name); stale entries are skipped when popped
+        for name, ticks in (remaining or {}).items():
+            self.start(name, ticks)
+
+    def start(self, name, ticks):
+        if ticks <= 0:
+            self.end(name)
+            return
+        expires = self.clock + ticks
+        self._expires[name] = expires
+        heapq.heappush(self._heap, (expires, name))
+
+    def tick(self, ticks=1):
+        """Advance the clock and drop the cooldowns that ran out."""
+        self._advance(ticks, ())
+
+    def _advance(self, ticks, context):
+        self.clock += ticks
+        heap = self._heap
+        while heap and heap[0][0] <= self.clock:
+            expires, name = heapq.heappop(heap)
+            if self._expires.get(name) == expires:  # Not restarted or ended since
+                del self._expires[name]
+                self._expired(name, context)
+
+    def end(self, name, *context):
+        """Drop name now, as if it had run out."""
+        if self._expires.pop(name, None) is not None:
+            self._expired(name, context)
+
+    def _expired(self, name, context):
+        pass  # Subclasses react to a name running out; context is what tick()/end() were given
+
+    def left(self, name):
+        """Ticks until name is available again (0 if it already is)."""
+        expires = self._expires.get(name)
+        return 0 if expires is None else expires - self.clock
+
+    def remaining(self):
+        return {name: expires - self.clock for name, expires in self._expires.items()}
+
+    def __contains__(self, name):
+        return name in self._expires
+
+    def __iter__(self):
+        return iter(self._expires)
+
+    def __len__(self):
+        return len(self._expires)
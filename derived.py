@@ -0,0 +1,167 @@
+"""Combat numbers derived from a player's stats and equipment.
+
+Armor, dodge, crit, initiative and the weapon's damage range only change
+when the player's stats or equipment do, yet combat reads them on every
+swing. Player keeps both in TrackedDicts that clear its DerivedStats on
+any write, so each value is computed once per change (or per content
+reload) however many turns read it.
+
+The HP/MP formulas live here too so character creation, starting gear
+and level-ups share one copy.
+"""
+import copy
+
+from content import index, registry
+from skillbook import skillbook
+
+
+class TrackedDict(dict):
+    """A dict that calls on_change() after every write."""
+
+    __slots__ = ("on_change",)
+
+    def __init__(self, data=(), on_change=None):
+        super().__init__(data)
+        self.on_change = on_change
+
+    def _changed(self):
+        if self.on_change is not None:
+            self.on_change()
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._changed()
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._changed()
+
+    def pop(self, *args):
+        value = super().pop(*args)
+        self._changed()
+        return value
+
+    def popitem(self):
+        item = super().popitem()
+        self._changed()
+        return item
+
+    def setdefault(self, key, default=None):
+        value = super().setdefault(key, default)
+        self._changed()
+        return value
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self._changed()
+
+    def clear(self):
+        super().clear()
+        self._changed()
+
+    # Copies and pickles are plain dicts; the callback stays with its player
+    def __copy__(self):
+        return dict(self)
+
+    def __deepcopy__(self, memo):
+        return copy.deepcopy(dict(self), memo)
+
+    def __reduce__(self):
+        return dict, (dict(self),)
+
+
+def armor(player):
+    total_av = 0
+    for item in player.equipment.values():
+        if item:
+            _, _, scaling_stat, base_av = item
+            total_av += base_av + player.stats[scaling_stat] * 0.1
+    return min(total_av, 100)
+
+
+def dodge(player):
+    return player.stats["A"] * 0.02
+
+
+def crit(player):
+    return player.stats["A"] * 0.02
+
+
+def initiative(player):
+    return (player.stats["A"] * 0.5 + player.stats["L"] * 0.5) / 100
+
+
+def weapon_range(player):
+    """(min, max) from the main-hand weapon and its stats, or None without a usable weapon."""
+    weapon = player.equipment.get("main_hand")
+    if not weapon:
+        return None
+    weapon_name, stats, modifier, armor_value = weapon
+    weapon_data = index.gear(weapon_name, "main_hand")
+    if weapon_data and weapon_data["damage"]:
+        try:
+            min_dmg, max_dmg = map(float, weapon_data["damage"].split("-"))
+            stat_bonus = player.stats[modifier] * 0.5
+            for stat, value in stats.items():
+                if value > 0:
+                    stat_bonus += player.stats[stat] * 0.5
+            return (min_dmg + stat_bonus, max_dmg + stat_bonus)
+        except (ValueError, AttributeError):
+            pass
+    return None
+
+
+def rage_bonus(player):
+    """Damage Rage adds while it's active."""
+    skill = skillbook.skill("Rage")
+    effect = skill.find("damage_bonus") if skill else None
+    return effect.scaled(player.stats, 0.5) if effect else 0
+
+
+DERIVED = {
+    "armor": armor,
+    "dodge": dodge,
+    "crit": crit,
+    "initiative": initiative,
+    "weapon_range": weapon_range,
+    "rage_bonus": rage_bonus,
+}
+
+
+class DerivedStats:
+    """Memoized DERIVED values for one player."""
+
+    def __init__(self, player):
+        self.player = player
+        self.computed = 0  # Recomputations, for profiling
+        self.clear()
+
+    def clear(self):
+        self._values = {}
+        self._content_version = registry.version
+
+    def get(self, name):
+        if self._content_version != registry.version:  # gear.json or skills.json reloaded
+            self.clear()
+        try:
+            return self._values[name]
+        except KeyError:
+            self.computed += 1
+            value = self._values[name] = DERIVED[name](self.player)
+            return value
+
+
+def base_max_hp(stats):
+    return 10 + 2 * stats["S"]
+
+
+def base_max_mp(stats, class_type):
+    return 3 * stats["W"] if class_type == "2" else 2 * stats["W"]
+
+
+def level_hp_gain(stats):
+    return 2 + 2 * stats["S"]  # Base 2 + 2 per Strength
+
+
+def level_mp_gain(stats):
+    return 1 + 2 * stats["W"]  # Base 1 + 2 per Wisdom
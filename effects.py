@@ -0,0 +1,66 @@
+"""Timed effects (buffs, statuses, damage/heal over time) on one turn clock.
+
+Each owner's effects live in one EffectTimers: expiry turns sit on the
+Cooldowns heap, so ending effects costs O(log n) per effect instead of a
+decrement-and-delete pass over every dict each turn, and the per-turn
+work is a callback per effect that actually does something each turn.
+Combat keeps one per track (see combat_engine.CombatState) and the
+player's timed consumables live in Player.active_effects.
+"""
+from cooldowns import Cooldowns
+
+
+class EffectTimers(Cooldowns):
+    """Named effects that last a number of turns.
+
+    start(name, turns, on_tick, on_expire) keeps name active for the next
+    `turns` calls to tick(). While it is active, each tick(*context) calls
+    on_tick(name, *context) before the turn is counted; when it runs out,
+    or end(name, *context) drops it early, on_expire(name, *context) runs.
+    on_tick defaults to the one given to the constructor. Restarting an
+    active effect refreshes its turns and callbacks without expiring it.
+    """
+
+    def __init__(self, on_tick=None):
+        super().__init__()
+        self.on_tick = on_tick
+        self._ticking = {}  # name -> on_tick, in the order the effects started
+        self._on_expire = {}
+
+    def start(self, name, turns, on_tick=None, on_expire=None):
+        if turns <= 0:  # Nothing to run; drop any earlier effect quietly
+            self._ticking.pop(name, None)
+            self._on_expire.pop(name, None)
+            super().start(name, turns)
+            return
+        super().start(name, turns)
+        on_tick = on_tick or self.on_tick
+        if on_tick is not None:
+            self._ticking[name] = on_tick
+        else:
+            self._ticking.pop(name, None)
+        if on_expire is not None:
+            self._on_expire[name] = on_expire
+        else:
+            self._on_expire.pop(name, None)
+
+    def tick(self, *context):
+        """Run this turn's callbacks, then count the turn and expire what ran out."""
+        if self._ticking:
+            for name, on_tick in list(self._ticking.items()):
+                if self._ticking.get(name) is on_tick:  # Not ended by an earlier callback
+                    on_tick(name, *context)
+        self._advance(1, context)
+
+    def _expired(self, name, context):
+        self._ticking.pop(name, None)
+        on_expire = self._on_expire.pop(name, None)
+        if on_expire is not None:
+            on_expire(name, *context)
+
+    def get(self, name, default=0):
+        """Turns left on name, like the {name: turns} dicts this replaced."""
+        return self.left(name) if name in self else default
+
+    def items(self):
+        return self.remaining().items()
@@ -1,40 +1,44 @@
 import os
 import sys
-import time
-import builtins
-import random
-import json
-import importlib
+import asyncio
 import shutil
-import textwrap
 import re
-from colorama import init, Fore, Back, Style
-from player import Player, save_game, load_game
+from colorama import init, Fore, Style
+from player import (Player, save_game, load_game, flush_saves, delete_save, has_save, list_characters,
+                    claim_character, set_password, check_password)
 from combat import combat
-from shop import shop_menu, calculate_price
-from tavern import tavern_menu, Tavern
+from combat_engine import get_encounter_sampler, get_boss_sampler
+from shop import shop_menu
+from tavern import Tavern
 from guild import Guild
 from events import random_event
-from utils import load_json, load_file, load_art_file, parse_stats, get_resource_path, save_json
-from commands import handle_command
+from content import load_content, load_content_lines, index
+from loot import loot_tables, ADVENTURE_TYPES
+from sampling import AliasSampler, SamplerCache
+import renderer
+from renderer import write, write_menu, read_line
+from rngs import stream
 
 # Initialize colorama
 init()
 
-# Global sleep delay (in seconds)
-MENU_DELAY = 0.0005  # Very fast for menus
-TEXT_DELAY = 0.001   # Fast for normal text
-ANIMATION_DELAY = 0.005  # Normal for special animations
+async def _store_call(offload, func, *args, **kwargs):
+    """Call a save-store function, on a worker thread when offload is set.
 
-# Store the original print function
-_original_print = builtins.print
+    Server sessions share one event loop, and store calls wait on SQLite
+    (behind the writer thread's batches) or hash a password; run inline
+    they would freeze every other session meanwhile.
+    """
+    if offload:
+        return await asyncio.to_thread(func, *args, **kwargs)
+    return func(*args, **kwargs)
 
 def progress_bar(progress, total, length=50, fill='█', empty='░'):
     """Display a progress bar animation."""
     percent = progress / total
     filled_length = int(length * percent)
     bar = fill * filled_length + empty * (length - filled_length)
-    _original_print(f'\r[{bar}] {int(percent * 100)}%', end='', flush=True)
+    write(f'\r[{bar}] {int(percent * 100)}%', end='', animation=None, flush=True)
 
 def spinning_cursor():
     """Display a spinning cursor animation."""
@@ -42,98 +46,20 @@ def spinning_cursor():
         for cursor in '|/-\\':
             yield cursor
 
-def fade_text(text, steps=10, delay=0.05):
-    """Create a fade-in effect for text."""
-    for i in range(steps):
-        alpha = i / steps
-        faded_text = f"\033[38;2;255;255;255;{int(alpha * 255)}m{text}\033[0m"
-        _original_print(faded_text, end='\r', flush=True)
-        time.sleep(delay)
-    _original_print(text)
-
-def pulse_text(text, cycles=3, delay=0.1):
-    """Create a pulsing effect for text."""
-    for _ in range(cycles):
-        for i in range(10):
-            brightness = int(255 * (i / 10))
-            _original_print(f"\033[38;2;{brightness};{brightness};{brightness}m{text}\033[0m", end='\r', flush=True)
-            time.sleep(delay)
-        for i in range(10, 0, -1):
-            brightness = int(255 * (i / 10))
-            _original_print(f"\033[38;2;{brightness};{brightness};{brightness}m{text}\033[0m", end='\r', flush=True)
-            time.sleep(delay)
-    _original_print(text)
-
-def scroll_text(text, width=80, delay=0.05):
-    """Create a scrolling text effect."""
-    if len(text) <= width:
-        return text
-    
-    for i in range(len(text) - width + 1):
-        _original_print(f"\r{text[i:i+width]}", end='', flush=True)
-        time.sleep(delay)
-    return text[-width:]
-
-def format_text(text, color=Fore.WHITE, style=Style.NORMAL, width=80):
-    """Format text with color, style, and proper wrapping."""
-    # Wrap text to specified width
-    wrapped_text = textwrap.fill(text, width=width)
-    # Apply color and style
-    return f"{style}{color}{wrapped_text}{Style.RESET_ALL}"
-
 def print_section(title, color=Fore.CYAN):
     """Print a section header with a border."""
     border = "=" * 80
-    _original_print(format_text(border, color))
-    _original_print(format_text(title.center(80), color))
-    _original_print(format_text(border, color))
+    write(border, color=color, animation=None)
+    write(title.center(80), color=color, animation=None)
+    write(border, color=color, animation=None)
 
 def print_important(text, color=Fore.YELLOW):
     """Print important information with emphasis."""
-    _original_print(format_text(f"! {text} !", color, Style.BRIGHT))
+    write(f"! {text} !", color=color, style=Style.BRIGHT, animation=None)
 
 def print_menu_item(number, text, color=Fore.GREEN):
     """Print a menu item with consistent formatting."""
-    _original_print(format_text(f"{number}. {text}", color))
-
-# Override print to include a typing animation and formatting
-def print(*args, **kwargs):
-    # Get the text to print
-    text = " ".join(str(arg) for arg in args)
-    
-    # Determine color, style, and animation from kwargs
-    color = kwargs.pop('color', Fore.WHITE)
-    style = kwargs.pop('style', Style.NORMAL)
-    animation = kwargs.pop('animation', 'type')  # Default to typing animation
-    is_menu = kwargs.pop('is_menu', False)  # New parameter for menu text
-    
-    # Format the text
-    formatted_text = format_text(text, color, style)
-    
-    # Choose appropriate delay based on context
-    delay = MENU_DELAY if is_menu else TEXT_DELAY
-    
-    if animation == 'type':
-        # Print character by character with appropriate delay
-        for char in formatted_text:
-            _original_print(char, end='', flush=True)
-            time.sleep(delay)
-    elif animation == 'fade':
-        fade_text(formatted_text)
-    elif animation == 'pulse':
-        pulse_text(formatted_text)
-    elif animation == 'scroll':
-        scroll_text(formatted_text)
-    
-    # Print newline if needed
-    if not kwargs.get('end', ''):
-        _original_print()
-    
-    # Add a small delay after each line
-    time.sleep(delay * 2)
-
-# Replace the built-in print with our version
-builtins.print = print
+    write(f"{number}. {text}", color=color, animation=None)
 
 # Import the update checker
 try:
@@ -153,7 +79,7 @@ try:
 except (ImportError, ModuleNotFoundError) as e:
     def check_for_updates():
         pass  # Dummy function if update.py is missing
-    print("Warning: update.py not found. Skipping update checks.")
+    write("Warning: update.py not found. Skipping update checks.")
 
 def get_resource_path(relative_path):
     """Get absolute path to resource, works for dev and PyInstaller"""
@@ -165,22 +91,13 @@ def get_resource_path(relative_path):
 
 def check_repo_status():
     if not shutil.which("git"):
-        print("Warning: Git not installed. Update checking skipped.")
+        write("Warning: Git not installed. Update checking skipped.")
         return False
     if not os.path.exists(".git"):
-        print("Warning: Not a git repository. Update checking skipped.")
+        write("Warning: Not a git repository. Update checking skipped.")
         return False
 
 
-def load_json(file_path):
-    try:
-        with open(file_path, 'r') as f:
-            return json.load(f)
-    except Exception as e:
-        print(f"Error loading {file_path}: {e}")
-        return []
-
-
 def parse_gear_drop_info(gear_line):
     parts = gear_line.split()
     if not parts or not parts[-1].startswith("[") or not parts[-1].endswith("]"):
@@ -196,7 +113,7 @@ def parse_gear_drop_info(gear_line):
         is_rare = True
     
     if len(bracket) != 9:  # Expect 9 elements: L:1-10, slot, scaling_stat, stats, damage, AV:value, drop_rate, gold
-        print(f"Warning: Invalid gear format: {gear_line}")
+        write(f"Warning: Invalid gear format: {gear_line}")
         return (1, 1), 0.0, False
     
     try:
@@ -216,44 +133,43 @@ def parse_gear_drop_info(gear_line):
         
         return (min_level, max_level), drop_chance, is_rare
     except (ValueError, IndexError) as e:
-        print(f"Error parsing gear '{gear_line}': {e}. Using defaults.")
+        write(f"Error parsing gear '{gear_line}': {e}. Using defaults.")
         return (1, 1), 0.0, False
 
 
 def display_inventory(player):
-    gear = load_json("gear.json")
-    standard_items = [item for item in player.inventory if not any(item == g["name"] for g in gear)]
-    print("\nStandard Items:", ", ".join(standard_items) if standard_items else "No standard items in inventory!")
+    standard_items = [item if count == 1 else f"{item} x{count}"
+                      for item, count in player.inventory.items() if index.gear(item) is None]
+    write("\nStandard Items:", ", ".join(standard_items) if standard_items else "No standard items in inventory!")
     
-    print("Equipment:")
+    write("Equipment:")
     for slot, item in player.equipment.items():
         if item:
             item_name, stats, scaling_stat, armor_value = item
             stat_display = ", ".join([f"+{val} {stat[:3].capitalize()}" for stat, val in stats.items() if val > 0])
-            damage = next((g["damage"] for g in gear if g["name"] == item_name), "none")
+            gear_item = index.gear(item_name)
+            damage = gear_item["damage"] if gear_item else "none"
             parts = [stat_display] if stat_display else []
             parts.append(f"AV:{armor_value}")
             if damage != "none":
                 parts.append(f"Dmg:{damage}")
             display_str = f"{item_name} ({', '.join(parts)})"
-            print(f"{slot.capitalize()}: {display_str}")
+            write(f"{slot.capitalize()}: {display_str}")
         else:
-            print(f"{slot.capitalize()}: None")
+            write(f"{slot.capitalize()}: None")
 
 
-def inventory_menu(player):
-    gear = load_json("gear.json")
+async def inventory_menu(player):
     while True:
         display_inventory(player)
-        print("\n1. Change Gear | 2. Back")
-        choice = input("Selection: ")
+        write("\n1. Change Gear | 2. Back")
+        choice = await read_line("Selection: ")
         
         if choice == "1":
-            print("\nSelect slot to change:")
+            write("\nSelect slot to change:")
             slots = list(player.equipment.keys())
-            for idx, slot in enumerate(slots, 1):
-                print(f"{idx}. {slot.capitalize()}")
-            slot_choice = input("Selection (or 0 to back): ")
+            write_menu([slot.capitalize() for slot in slots])
+            slot_choice = await read_line("Selection (or 0 to back): ")
             
             if slot_choice == "0":
                 continue
@@ -261,14 +177,14 @@ def inventory_menu(player):
                 slot_idx = int(slot_choice) - 1
                 if 0 <= slot_idx < len(slots):
                     selected_slot = slots[slot_idx]
-                    compatible_items = [item for item in player.inventory if any(g["name"] == item and g["slot"] == selected_slot for g in gear)]
+                    compatible_items = [item for item in player.inventory.names() if index.gear(item, selected_slot)]
                     if not compatible_items and not player.equipment[selected_slot]:
-                        print("No compatible gear for this slot!")
+                        write("No compatible gear for this slot!")
                         continue
                     
-                    print(f"\nAvailable gear for {selected_slot.capitalize()}:")
+                    write(f"\nAvailable gear for {selected_slot.capitalize()}:")
                     for idx, item in enumerate(compatible_items, 1):
-                        g = next(g for g in gear if g["name"] == item)
+                        g = index.gear(item, selected_slot)
                         stats = g["stats"]
                         stat_display = ", ".join([f"+{val} {stat[:3].capitalize()}" for stat, val in stats.items() if val > 0])
                         armor_value = g["armor_value"]
@@ -278,10 +194,10 @@ def inventory_menu(player):
                         if damage:
                             parts.append(f"Dmg:{damage}")
                         display_str = f"{item} ({', '.join(parts)})"
-                        print(f"{idx}. {display_str}")
-                    print(f"{len(compatible_items) + 1}. Remove")
-                    print(f"{len(compatible_items) + 2}. Back")
-                    gear_choice = input("Selection: ")
+                        write(f"{idx}. {display_str}")
+                    write(f"{len(compatible_items) + 1}. Remove")
+                    write(f"{len(compatible_items) + 2}. Back")
+                    gear_choice = await read_line("Selection: ")
                     
                     try:
                         gear_idx = int(gear_choice) - 1
@@ -292,14 +208,14 @@ def inventory_menu(player):
                                 for stat, val in player.equipment[selected_slot][1].items():
                                     player.stats[stat] -= val
                                 player.equipment[selected_slot] = None
-                                print(f"Removed {old_item} from {selected_slot}.")
+                                write(f"Removed {old_item} from {selected_slot}.")
                             else:
-                                print("Nothing equipped in this slot!")
+                                write("Nothing equipped in this slot!")
                         elif gear_idx == len(compatible_items) + 1:  # Back
                             continue
                         elif 0 <= gear_idx < len(compatible_items):
                             new_item = compatible_items[gear_idx]
-                            g = next(g for g in gear if g["name"] == new_item)
+                            g = index.gear(new_item, selected_slot)
                             if player.equipment[selected_slot]:
                                 old_item = player.equipment[selected_slot][0]
                                 player.inventory.append(old_item)
@@ -309,140 +225,153 @@ def inventory_menu(player):
                             for stat, val in g["stats"].items():
                                 player.stats[stat] += val
                             player.inventory.remove(new_item)
-                            print(f"Equipped {new_item} to {selected_slot}.")
+                            write(f"Equipped {new_item} to {selected_slot}.")
                         else:
-                            print("Invalid selection!")
+                            write("Invalid selection!")
                     except ValueError:
-                        print("Invalid input!")
+                        write("Invalid input!")
                 else:
-                    print("Invalid slot!")
+                    write("Invalid slot!")
             except ValueError:
-                print("Invalid input!")
+                write("Invalid input!")
         elif choice == "2":
             break
         else:
-            print("Invalid choice!")
+            write("Invalid choice!")
+
+
+CHEST_TYPES = AliasSampler(["unlocked", "locked", "magical"], [70, 20, 10])
+_treasure_samplers = SamplerCache(
+    "treasures.json",
+    lambda treasures, key: ([t["name"] for t in treasures if t["drop_rate"] > 0],
+                            [t["drop_rate"] for t in treasures if t["drop_rate"] > 0]))
 
 
 def award_treasure_chest(player):
-    treasures = load_json("treasures.json")
-    chest_type = random.choices(["unlocked", "locked", "magical"], weights=[70, 20, 10], k=1)[0]
-    print(f"\nYou find a {chest_type} treasure chest!")
+    rng = stream("loot")
+    treasure_pool = _treasure_samplers.get()
+    chest_type = CHEST_TYPES.sample(rng)
+    write(f"\nYou find a {chest_type} treasure chest!")
 
     if chest_type == "unlocked":
-        valid_treasures = [(t["name"], t["drop_rate"]) for t in treasures if t["drop_rate"] > 0]
-        if valid_treasures:
-            items = random.choices([t[0] for t in valid_treasures], weights=[t[1] for t in valid_treasures], k=random.randint(1, 2))
-            gold = random.randint(10, 25)
+        if treasure_pool:
+            items = treasure_pool.sample_many(rng.randint(1, 2), rng)
+            gold = rng.randint(10, 25)
             player.inventory.extend(items)
             player.gold += gold
-            print(f"You open it and find: {', '.join(items)} and {gold} gold!")
+            write(f"You open it and find: {', '.join(items)} and {gold} gold!")
         else:
-            print("The chest is empty!")
+            write("The chest is empty!")
     elif chest_type == "locked":
-        if random.random() < player.stats["A"] * 0.05:
-            valid_treasures = [(t["name"], t["drop_rate"]) for t in treasures if t["drop_rate"] > 0]
-            if valid_treasures:
-                items = random.choices([t[0] for t in valid_treasures], weights=[t[1] for t in valid_treasures], k=random.randint(1, 3))
-                gold = random.randint(15, 30)
+        if rng.random() < player.stats["A"] * 0.05:
+            if treasure_pool:
+                items = treasure_pool.sample_many(rng.randint(1, 3), rng)
+                gold = rng.randint(15, 30)
                 player.inventory.extend(items)
                 player.gold += gold
-                print(f"You pick the lock and find: {', '.join(items)} and {gold} gold!")
+                write(f"You pick the lock and find: {', '.join(items)} and {gold} gold!")
             else:
-                print("You pick the lock, but the chest is empty!")
+                write("You pick the lock, but the chest is empty!")
         else:
-            print("The lock holds firm—you leave empty-handed.")
+            write("The lock holds firm—you leave empty-handed.")
     elif chest_type == "magical":
-        if random.random() < player.stats["I"] * 0.05:
-            valid_treasures = [(t["name"], t["drop_rate"]) for t in treasures if t["drop_rate"] > 0]
-            if valid_treasures:
-                items = random.choices([t[0] for t in valid_treasures], weights=[t[1] for t in valid_treasures], k=random.randint(2, 4))
-                gold = random.randint(20, 40)
+        if rng.random() < player.stats["I"] * 0.05:
+            if treasure_pool:
+                items = treasure_pool.sample_many(rng.randint(2, 4), rng)
+                gold = rng.randint(20, 40)
                 player.inventory.extend(items)
                 player.gold += gold
-                print(f"You dispel the ward and find: {', '.join(items)} and {gold} gold!")
+                write(f"You dispel the ward and find: {', '.join(items)} and {gold} gold!")
             else:
-                print("You dispel the ward, but the chest is empty!")
+                write("You dispel the ward, but the chest is empty!")
         else:
             damage = player.max_hp * 0.1
             player.hp -= damage
-            print(f"The ward backfires, dealing {round(damage, 1)} damage!")
+            write(f"The ward backfires, dealing {round(damage, 1)} damage!")
 
 
-def update_kill_count(player, monster_name):
-    quests_data = load_json("quest.json")
-    quests = quests_data.get("quests", [])
-    
-    if not quests:
-        print("Warning: No quests found in quest.json!", color=Fore.RED, animation='pulse')
-        return
-    
-    for quest in player.active_quests:
-        quest_info = next((q for q in quests if q["quest_name"] == quest["quest_name"]), None)
-        if quest_info is None:
-            print(f"Warning: Quest '{quest['quest_name']}' in active_quests not found in quest.json!", 
-                  color=Fore.RED, animation='pulse')
-            continue
-        if "target_monster" not in quest_info:
-            print(f"Warning: Quest '{quest['quest_name']}' in quest.json missing 'target_monster' key!", 
-                  color=Fore.RED, animation='pulse')
-            continue
-        if quest_info["target_monster"] == monster_name:
-            quest["kill_count"] = quest.get("kill_count", 0) + 1
-            progress_text = f"Progress on '{quest['quest_name']}': {quest['kill_count']}/{quest_info['kill_count_required']} {monster_name}s killed."
-            print(progress_text, color=Fore.YELLOW, animation='fade')
-
-def main():
+async def main(console=None, check_updates=True, login=False, commands_enabled=None):
+    """Run one game. login=True (server sessions) loads a character by name and
+    password instead of listing every save, and refuses one another session has open.
+    commands_enabled turns the debug commands on or off; by default they are on
+    when commands_enabled.txt sits next to the game."""
+    if console is not None:
+        renderer.use(console)  # This session's output and answers (see console.py)
     if getattr(sys, 'frozen', False):
         base_path = os.path.dirname(sys.executable)
     else:
         base_path = os.path.dirname(__file__)
-    save_path = os.path.join(base_path, "save.json")
 
     from commands import handle_command  # Import command handler
-    commands_enabled = os.path.exists(os.path.join(base_path, "commands_enabled.txt"))
+    if commands_enabled is None:
+        commands_enabled = os.path.exists(os.path.join(base_path, "commands_enabled.txt"))
 
-    if os.path.exists(save_path):
-        print("1. New Game | 2. Load Game")
-        choice = input("Selection: ").strip().lower()
-        if handle_command(choice, None, commands_enabled):
+    if await _store_call(login, has_save):
+        write("1. New Game | 2. Load Game")
+        choice = (await read_line("Selection: ")).strip().lower()
+        if await handle_command(choice, None, commands_enabled):
             return
         if choice == "2":
             try:
-                player = load_game()
-                print(f"Welcome back, {player.name}!")
+                name = None
+                if login:
+                    name = (await read_line("Character name: ")).strip()
+                    password = await read_line("Password: ")
+                    if not await _store_call(login, check_password, name, password):
+                        raise ValueError("unknown character or wrong password")
+                    if not claim_character(name, console):
+                        raise ValueError(f"{name} is already being played in another session")
+                    characters = []
+                else:
+                    characters = await _store_call(login, list_characters)
+                if len(characters) > 1:
+                    write_menu([f"{character['name']} (Level {character['level']})" for character in characters])
+                    pick = (await read_line("Load which character? ")).strip()
+                    if pick.isdigit() and 1 <= int(pick) <= len(characters):
+                        name = characters[int(pick) - 1]["name"]
+                player = await _store_call(login, load_game, name)
+                write(f"Welcome back, {player.name}!")
             except Exception as e:
-                print(f"Failed to load save: {e}. Starting new game.")
+                write(f"Failed to load save: {e}. Starting new game.")
                 choice = "1"
         else:
             choice = "1"
     else:
-        print("No save file detected, forcing new game.")
+        write("No save file detected, forcing new game.")
         choice = "1"
 
-    check_for_updates()
+    if check_updates:
+        check_for_updates()
 
     if choice == "1":
-        lore_data = load_json("lore.json")
+        lore_data = load_content("lore.json")
         if not isinstance(lore_data, dict) or "lore" not in lore_data:
-            print("Error: Could not load lore.json or 'lore' key missing. Skipping intro.")
+            write("Error: Could not load lore.json or 'lore' key missing. Skipping intro.")
             intro_lore = None
         else:
-            intro_lore = next((l for l in lore_data["lore"] if l["quest_name"] == "intro"), None)
+            intro_lore = index.lore("intro")
             if intro_lore:
-                print("\n=== Welcome to Snowcaller ===")
-                print(intro_lore["lore_text"])
-
-        name = input("\nEnter your name: ")
-        print("Select your class:")
-        print("1. Warrior (High Strength) | 2. Mage (High Intelligence) | 3. Rogue (High Agility)")
-        class_type = input("Selection: ")
+                write("\n=== Welcome to Snowcaller ===")
+                write(intro_lore["lore_text"])
+
+        name = await read_line("\nEnter your name: ")
+        # Saving would overwrite that character (or one being created in another session)
+        while await _store_call(login, has_save, name) or (login and not claim_character(name, console)):
+            write(f"A character named {name} already exists. Load it instead or choose another name.")
+            name = await read_line("Enter your name: ")
+        if login:
+            password = await read_line("Choose a password: ")
+            while not password:
+                password = await read_line("Choose a password: ")
+            await _store_call(login, set_password, name, password)
+        write("Select your class:")
+        write("1. Warrior (High Strength) | 2. Mage (High Intelligence) | 3. Rogue (High Agility)")
+        class_type = await read_line("Selection: ")
         while class_type not in ["1", "2", "3"]:
-            print("Invalid class! Choose 1, 2, or 3.")
-            class_type = input("Selection: ")
+            write("Invalid class! Choose 1, 2, or 3.")
+            class_type = await read_line("Selection: ")
 
         player = Player(name, class_type)
-        print("Calling load_starting_data...")
         player.load_starting_data()
         save_game(player)
 
@@ -467,60 +396,51 @@ def main():
 
         # Display ASCII art and lore for the selected class
         selected_class = class_data[class_type]
-        print(f"\n=== You have chosen the {selected_class['name']} ===")
+        write(f"\n=== You have chosen the {selected_class['name']} ===")
         
         # Display class lore
-        print(f"\n{selected_class['lore']}")
+        write(f"\n{selected_class['lore']}")
 
-        print(f"Welcome, {player.name} the {selected_class['name']}!")
+        write(f"Welcome, {player.name} the {selected_class['name']}!")
         if player.skills:
-            print(f"Skills unlocked: {', '.join(player.skills)}")
+            write(f"Skills unlocked: {', '.join(player.skills)}")
 
     save_game(player)
-    print("Game autosaved!")
+    write("Game autosaved!")
 
     # Initialize Tavern and Guild instances
     tavern = Tavern(player)
     guild = Guild(player)
 
     while True:
-        print(f"\n{'-' * 20} {player.name}: Level {player.level} {'-' * 20}")
-        print(f"HP: {round(player.hp, 1)}/{player.max_hp} | MP: {player.mp}/{player.max_mp} | Gold: {player.gold}")
-        print("1. Adventure | 2. Inventory | 3. Stats | 4. Shop | 5. Tavern | 6. Guild | 7. Save | 8. Quit", is_menu=True)
-        choice = input("Selection: ").strip().lower()
-        if handle_command(choice, player, commands_enabled):
+        write(f"\n{'-' * 20} {player.name}: Level {player.level} {'-' * 20}")
+        write(f"HP: {round(player.hp, 1)}/{player.max_hp} | MP: {player.mp}/{player.max_mp} | Gold: {player.gold}")
+        write("1. Adventure | 2. Inventory | 3. Stats | 4. Shop | 5. Tavern | 6. Guild | 7. Save | 8. Quit", is_menu=True)
+        choice = (await read_line("Selection: ")).strip().lower()
+        if await handle_command(choice, player, commands_enabled):
             continue
 
         if choice == "1":
-            print("\nChoose your adventure type:")
-            print("1. Short Trip (2-3 encounters)", is_menu=True)
-            print("2. Adventure (3-6 encounters)", is_menu=True)
-            print("3. Dungeon (6-10 encounters)", is_menu=True)
-            adventure_length = input("Selection: ").strip()
+            write("\nChoose your adventure type:")
+            write("1. Short Trip (2-3 encounters)", is_menu=True)
+            write("2. Adventure (3-6 encounters)", is_menu=True)
+            write("3. Dungeon (6-10 encounters)", is_menu=True)
+            adventure_length = (await read_line("Selection: ")).strip()
             
             while adventure_length not in ["1", "2", "3"]:
-                print("Invalid choice! Choose 1, 2, or 3.")
-                adventure_length = input("Selection: ").strip()
+                write("Invalid choice! Choose 1, 2, or 3.")
+                adventure_length = (await read_line("Selection: ")).strip()
 
             # Set encounter range and modifiers based on adventure type
-            if adventure_length == "1":
-                max_encounters = random.randint(2, 3)
-                event_chance = 5
-                drop_rate_modifier = 0
-                adventure_section = "short"
-            elif adventure_length == "2":
-                max_encounters = random.randint(3, 6)
-                event_chance = 8
-                drop_rate_modifier = 0.03
-                adventure_section = "adventure"
-            else:  # Dungeon
-                max_encounters = random.randint(6, 10)
-                event_chance = 11
-                drop_rate_modifier = 0.06
-                adventure_section = "dungeon"
+            adventure_section = {"1": "short", "2": "adventure", "3": "dungeon"}[adventure_length]
+            adventure_spec = ADVENTURE_TYPES[adventure_section]
+            world_rng = stream("world")
+            max_encounters = world_rng.randint(*adventure_spec["encounters"])
+            event_chance = adventure_spec["event_chance"]
+            drop_rate_modifier = adventure_spec["drop_rate_modifier"]
 
             # Load appropriate areas based on adventure type
-            lines = load_file("locations.txt")
+            lines = load_content_lines("locations.txt")
             main_areas = []
             sub_areas = []
             current_section = None
@@ -539,24 +459,14 @@ def main():
                         sub_areas.append(line)
 
             if not main_areas or not sub_areas:
-                print("Warning: No areas loaded for this adventure type. Using defaults.")
+                write("Warning: No areas loaded for this adventure type. Using defaults.")
                 main_areas = ["Forest", "Desert", "Mountain"]
                 sub_areas = ["Castle", "Cave", "Village"]
 
-            main_area = random.choice(main_areas)
-            sub_area = random.choice(sub_areas)
+            main_area = world_rng.choice(main_areas)
+            sub_area = world_rng.choice(sub_areas)
             location = f"{main_area} {sub_area}"
-            monsters = load_json("monster.json")["monsters"]
-            encounter_pool = []
-            for m in monsters:
-                if not m["rare"]:
-                    min_monster_level = m["level_range"]["min"]
-                    max_monster_level = m["level_range"]["max"]
-                    if min_monster_level <= player.level + 2 and max_monster_level >= player.level - 2:
-                        encounter_pool.extend([m] * m["spawn_chance"])
-            if not encounter_pool:
-                print("Warning: No suitable monsters found for your level. Using fallback.")
-                encounter_pool = [m for m in monsters if not m["rare"]][:1]
+            encounter_pool = get_encounter_sampler(player.level)
 
             # Initialize adventure variables
             boss_fight = False
@@ -570,57 +480,53 @@ def main():
             initial_gold = player.gold  # Track initial gold to calculate gain correctly
             adventure = True
             
-            print(f"\nYou set out for the {location}! (Planning for {max_encounters} encounters)")
+            write(f"\nYou set out for the {location}! (Planning for {max_encounters} encounters)")
 
             while adventure:
                 # Boss encounter check
-                if encounter_count >= 8 and not boss_fight and random.random() < 0.25:
-                        print(f"\nA powerful foe blocks your path! Fight the boss?")
-                        print("1. Yes | 2. No")
-                        boss_choice = input("Selection: ")
+                if encounter_count >= 8 and not boss_fight and world_rng.random() < 0.25:
+                        write(f"\nA powerful foe blocks your path! Fight the boss?")
+                        write("1. Yes | 2. No")
+                        boss_choice = await read_line("Selection: ")
                         if boss_choice == "1":
                             boss_fight = True
-                            boss_monsters = [m for m in monsters if m["rare"] and m["spawn_chance"] > 0]
-                            boss = random.choice(boss_monsters) if boss_monsters else random.choice([m for m in monsters if not m["rare"]])
-                            result = combat(player, True, boss["name"])
+                            boss = get_boss_sampler().sample(world_rng)
+                            result = await combat(player, True, boss["name"])
                             if player.hp <= 0:
-                                print("\nYou have died!")
-                                if os.path.exists("save.json"):
-                                    os.remove("save.json")
-                                print("Game Over.")
+                                write("\nYou have died!")
+                                await _store_call(login, delete_save, player.name)
+                                write("Game Over.")
                                 return
                             if "Victory" in result:
                                 completed_encounters += 1
-                                update_kill_count(player, result.split("against ")[1])
+                                player.update_kill_count(result.split("against ")[1])
                                 total_xp += player.pending_xp
                                 total_gold += gold_gained
                         adventure = False  # End after boss fight regardless of choice
                         continue
 
                 # Regular encounter
-                if random.randint(1, 100) <= event_chance:
+                if world_rng.randint(1, 100) <= event_chance:
                     encounter_count += 1
                     completed_encounters += 1
-                    new_max = random_event(player, encounter_count, max_encounters)
+                    new_max = await random_event(player, encounter_count, max_encounters)
                     if new_max > max_encounters:
-                        print(f"\nAdventure extended! New maximum encounters: {new_max}", color=Fore.YELLOW)
+                        write(f"\nAdventure extended! New maximum encounters: {new_max}", color=Fore.YELLOW)
                         max_encounters = new_max
-                    if "Treasure Chest" in player.inventory:
-                        treasure_count += player.inventory.count("Treasure Chest")
-                        while "Treasure Chest" in player.inventory:
-                            player.inventory.remove("Treasure Chest")
-                            award_treasure_chest(player)
+                    chests = player.inventory.discard("Treasure Chest")
+                    treasure_count += chests
+                    for _ in range(chests):
+                        award_treasure_chest(player)
                 else:
                     encounter_count += 1
                     combat_count += 1
-                    monster = random.choice(encounter_pool)
-                    result = combat(player, False, monster["name"])
+                    monster = encounter_pool.sample(world_rng)
+                    result = await combat(player, False, monster["name"])
 
                     if player.hp <= 0:
-                        print("\nYou have died!")
-                        if os.path.exists("save.json"):
-                            os.remove("save.json")
-                        print("Game Over.")
+                        write("\nYou have died!")
+                        await _store_call(login, delete_save, player.name)
+                        write("Game Over.")
                         return
 
                     if "Victory" in result:
@@ -645,65 +551,47 @@ def main():
                         
                         # Combine victory messages into a single print
                         victory_text = f"\nVictory! Gained {xp_gained} XP and {gold_gained} gold! (Total: {total_xp} XP, {total_gold} gold)"
-                        print(victory_text, color=Fore.GREEN, animation='type', is_menu=True)
-                        update_kill_count(player, monster_name)
+                        write(victory_text, color=Fore.GREEN, animation='type', is_menu=True)
+                        player.update_kill_count(monster_name)
                         
                         # Handle drops
                         drop_item = None
-                        gear = load_json("gear.json")
-                        consumables = load_json("consumables.json")
-                        valid_drops = []
-
-                        for item in gear:
-                            if (player.level >= item["level_range"]["min"] and
-                                player.level <= item["level_range"]["max"] and
-                                item.get("drop_rate", 0) > 0 and
-                                (not item.get("boss_only", False) or boss_fight)):
-                                modified_drop_rate = item["drop_rate"] * (1 + drop_rate_modifier)
-                                valid_drops.append((item["name"], modified_drop_rate))
-
-                        for item in consumables:
-                            if (player.level >= item["level_range"]["min"] and
-                                player.level <= item["level_range"]["max"] and
-                                item.get("drop_rate", 0) > 0 and
-                                (not item["boss_only"] or boss_fight)):
-                                modified_drop_rate = item["drop_rate"] * (1 + drop_rate_modifier)
-                                valid_drops.append((item["name"], modified_drop_rate))
-
-                        if valid_drops and random.random() < 0.25:
-                            items = [item[0] for item in valid_drops]
-                            weights = [item[1] for item in valid_drops]
-                            drop_item = random.choices(items, weights=weights, k=1)[0]
+                        loot_rng = stream("loot")
+                        drop_table = loot_tables.get(player.level, boss_fight, adventure_section)
+
+                        if drop_table and loot_rng.random() < 0.25:
+                            drop_item = drop_table.sample(loot_rng)
                             gear_drops.append(drop_item)
                             player.inventory.append(drop_item)
-                            print(f"\nYou found a {drop_item}!")
+                            player.update_quest_items(drop_item)
+                            write(f"\nYou found a {drop_item}!")
 
-                        if random.random() < (0.15 * (1 + drop_rate_modifier)) or (boss_fight and random.random() < 0.5):
+                        if loot_rng.random() < (0.15 * (1 + drop_rate_modifier)) or (boss_fight and loot_rng.random() < 0.5):
                             treasure_count += 1
 
                         save_game(player)
                     elif "FleeAdventure" in result:
-                        print(f"\nYou escaped the {location}, ending your adventure with {completed_encounters} victories.")
+                        write(f"\nYou escaped the {location}, ending your adventure with {completed_encounters} victories.")
                         adventure = False
                         break
 
                     # Check if player wants to continue
                     if combat_count > 0 and player.hp < player.max_hp / 2 and adventure:
                         status_text = f"\nYou've fought {combat_count} battles in the {location}. HP: {round(player.hp, 1)}/{player.max_hp}"
-                        print(status_text, color=Fore.YELLOW, animation='fade')
-                        print("Continue adventure? 1 for Yes | 2 for No", color=Fore.CYAN)
-                        choice = input("Selection: ")
+                        write(status_text, color=Fore.YELLOW, animation='fade')
+                        write("Continue adventure? 1 for Yes | 2 for No", color=Fore.CYAN)
+                        choice = await read_line("Selection: ")
                         if choice == "2":
-                            print(f"You decide to return to town with {completed_encounters} victories.",
+                            write(f"You decide to return to town with {completed_encounters} victories.",
                                   color=Fore.YELLOW, animation='fade')
                             adventure = False
                             break
                         elif choice != "1":
-                            print("Invalid choice, continuing adventure.", color=Fore.RED, animation='pulse')
+                            write("Invalid choice, continuing adventure.", color=Fore.RED, animation='pulse')
                             
                 # Check if we should end the adventure
                 if encounter_count >= max_encounters and not (encounter_count >= 8 and not boss_fight):
-                    print(f"\nReached maximum encounters ({max_encounters}). Returning to town.", color=Fore.YELLOW)
+                    write(f"\nReached maximum encounters ({max_encounters}). Returning to town.", color=Fore.YELLOW)
                     adventure = False
                     break
 
@@ -711,77 +599,78 @@ def main():
             end_adventure(player, location, completed_encounters, gear_drops, treasure_count, total_xp, total_gold, tavern)
 
         elif choice == "2":
-            inventory_menu(player)
+            await inventory_menu(player)
 
         elif choice == "3":
             # Show player stats
-            print(f"\n=== {player.name}'s Stats ===")
-            print(f"Level: {player.level}")
-            print(f"XP: {player.exp}/{player.max_exp}")
-            print(f"HP: {round(player.hp, 1)}/{player.max_hp}")
-            print(f"MP: {player.mp}/{player.max_mp}")
-            print(f"Gold: {player.gold}")
-            print("\nAttributes:")
+            write(f"\n=== {player.name}'s Stats ===")
+            write(f"Level: {player.level}")
+            write(f"XP: {player.exp}/{player.max_exp}")
+            write(f"HP: {round(player.hp, 1)}/{player.max_hp}")
+            write(f"MP: {player.mp}/{player.max_mp}")
+            write(f"Gold: {player.gold}")
+            write("\nAttributes:")
             for stat, value in player.stats.items():
-                print(f"{stat}: {value}")
-            input("\nPress Enter to continue...")
+                write(f"{stat}: {value}")
+            await read_line("\nPress Enter to continue...")
 
         elif choice == "4":
-            shop_menu(player)
+            await shop_menu(player)
 
         elif choice == "5":
-            tavern.visit_tavern()
+            await tavern.visit_tavern()
 
         elif choice == "6":
-            guild.guild_menu(player)
+            await guild.guild_menu(player)
 
         elif choice == "7":
-            save_game(player)
-            print("Game saved!")
+            await _store_call(login, save_game, player, immediate=True)
+            write("Game saved!")
 
         elif choice == "8":
-            print("Goodbye!")
+            await _store_call(login, flush_saves)
+            write("Goodbye!")
             break
 
         else:
-            print("Invalid choice!")
+            write("Invalid choice!")
 
 def end_adventure(player, location, completed_encounters, gear_drops, treasure_count, total_xp, total_gold, tavern):
-    print("\n" + "="*50)
-    print("Adventure Summary".center(50))
-    print("="*50)
+    write("\n" + "="*50)
+    write("Adventure Summary".center(50))
+    write("="*50)
     
     # Display encounter summary
-    print(f"Location: {location}")
-    print(f"Total Victories: {completed_encounters}")
+    write(f"Location: {location}")
+    write(f"Total Victories: {completed_encounters}")
     
     # Display gear summary
     gear_summary = f"{len(gear_drops)} piece{'s' if len(gear_drops) != 1 else ''} of gear" if gear_drops else "no gear"
     if gear_drops:
-        print("\nGear found:")
+        write("\nGear found:")
         gear_counts = {}
         for item in gear_drops:
             gear_counts[item] = gear_counts.get(item, 0) + 1
         for item, count in gear_counts.items():
             suffix = f" x{count}" if count > 1 else ""
-            print(f"- {item}{suffix}")
+            write(f"- {item}{suffix}")
     
     # Display treasure summary
     if treasure_count > 0:
-        print(f"\nTreasure Chests found: {treasure_count}")
+        write(f"\nTreasure Chests found: {treasure_count}")
         for _ in range(treasure_count):
             award_treasure_chest(player)
     
     # Display rewards summary
-    print("\nRewards Summary:")
-    print(f"Total gold gained: {total_gold}")
-    print(f"Total XP gained: {total_xp}")
-    print(f"Current XP progress: {player.exp}/{player.max_exp}")
-    print("="*50)
+    write("\nRewards Summary:")
+    write(f"Total gold gained: {total_gold}")
+    write(f"Total XP gained: {total_xp}")
+    write(f"Current XP progress: {player.exp}/{player.max_exp}")
+    write("="*50)
     
     tavern.roll_tavern_npcs()
     # Save at the end of adventure
     save_game(player)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    asyncio.run(main())
\ No newline at end of file
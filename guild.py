@@ -1,53 +1,45 @@
-import json
-from typing import Dict, List, Optional, Union
-from utils import load_json, save_json
+from typing import Dict, List, Optional
+from content import load_content, index
+from renderer import write, read_line
 
 class Guild:
     def __init__(self, player):
         self.player = player
         self.exchange_data = self._load_exchange_data()
         self.key_items = self._load_key_items()
-        self.quests_data = load_json("quest.json")
-        self.lore_data = load_json("lore.json")
+        self.quests_data = load_content("quest.json")
+        self.lore_data = load_content("lore.json")
 
     def _load_exchange_data(self) -> Dict:
-        try:
-            with open('guild_exchange.json', 'r') as f:
-                return json.load(f)
-        except FileNotFoundError:
-            return {"exchange_options": {"adventure_points": {"rates": []}, "crafted_items": {"recipes": []}}}
+        return load_content("guild_exchange.json", default={"exchange_options": {"adventure_points": {"rates": []}, "crafted_items": {"recipes": []}}})
 
     def _load_key_items(self) -> Dict:
-        try:
-            with open('keyitems.json', 'r') as f:
-                return json.load(f)
-        except FileNotFoundError:
-            return {"key_items": []}
+        return load_content("keyitems.json", default={"key_items": []})
 
-    def guild_menu(self, player):
-        print("\n=== Adventurers' Guild ===")
+    async def guild_menu(self, player):
+        write("\n=== Adventurers' Guild ===")
         
         # If player is not in the guild yet
         if not hasattr(player, "guild_member") or not player.guild_member:
-            print("Hello there adventurer. How may I help you?")
-            print("1. Join | 2. Leave")
-            choice = input("Selection: ")
+            write("Hello there adventurer. How may I help you?")
+            write("1. Join | 2. Leave")
+            choice = await read_line("Selection: ")
             
             if choice == "1":
                 if player.level < 3:
-                    print("I'm sorry but you seem to be lacking. We do not have work for you.")
+                    write("I'm sorry but you seem to be lacking. We do not have work for you.")
                     return
                 else:
                     player.guild_member = True
                     player.adventurer_rank = 0
                     player.adventurer_points = 0
                     player.max_adventurer_points = 10
-                    print("Welcome to the Adventurers' Guild! You start at the lowest rank with 0 points.")
+                    write("Welcome to the Adventurers' Guild! You start at the lowest rank with 0 points.")
                     return
             elif choice == "2":
                 return
             else:
-                print("Invalid choice!")
+                write("Invalid choice!")
                 return
         
         # If player is already in the guild
@@ -57,24 +49,24 @@ class Guild:
         active_quests = player.active_quests
         completed_quests = player.completed_quests if hasattr(player, "completed_quests") else []
         
-        print(f"Current Rank: {player.get_rank_name()} Adventurer")
-        print(f"Adventurer Points: {player.adventurer_points}/{player.max_adventurer_points}")
+        write(f"Current Rank: {player.get_rank_name()} Adventurer")
+        write(f"Adventurer Points: {player.adventurer_points}/{player.max_adventurer_points}")
         if player.adventurer_rank < 6:
             next_rank_points = player.get_next_rank_points()
-            print(f"Points needed for next rank: {next_rank_points}")
-        print("\n1. Accept Quest | 2. Turn In Quest | 3. Exchange Items | 0. Return")
-        choice = input("Selection: ")
+            write(f"Points needed for next rank: {next_rank_points}")
+        write("\n1. Accept Quest | 2. Turn In Quest | 3. Exchange Items | 0. Return")
+        choice = await read_line("Selection: ")
 
         if choice == "1":
-            self._handle_quest_acceptance(player, quests, lore, active_quests, completed_quests)
+            await self._handle_quest_acceptance(player, quests, lore, active_quests, completed_quests)
         elif choice == "2":
-            self.turn_in_quest(player)
+            await self.turn_in_quest(player)
         elif choice == "3":
-            self.exchange_menu(player)
+            await self.exchange_menu(player)
 
-    def _handle_quest_acceptance(self, player, quests, lore, active_quests, completed_quests):
+    async def _handle_quest_acceptance(self, player, quests, lore, active_quests, completed_quests):
         if len(active_quests) >= 5:
-            print("You've reached the maximum of 5 active quests.")
+            write("You've reached the maximum of 5 active quests.")
             return
         
         available_quests = [
@@ -85,14 +77,14 @@ class Guild:
             and q["quest_name"] not in completed_quests
         ]
         if not available_quests:
-            print("No new quests available at your current rank.")
+            write("No new quests available at your current rank.")
         else:
-            print("\nAvailable Quests:")
+            write("\nAvailable Quests:")
             for i, quest in enumerate(available_quests, 1):
-                print(f"{i}. {quest['quest_name']} (Level {quest['quest_level']})")
-                print(f"   {quest['quest_description']}")
-                print(f"   Reward: {quest['quest_reward']} | Points: {quest['adventure_points']}")
-            quest_choice = input("Select a quest to accept (or 0 to return): ")
+                write(f"{i}. {quest['quest_name']} (Level {quest['quest_level']})")
+                write(f"   {quest['quest_description']}")
+                write(f"   Reward: {quest['quest_reward']} | Points: {quest['adventure_points']}")
+            quest_choice = await read_line("Select a quest to accept (or 0 to return): ")
             if quest_choice == "0":
                 return
             try:
@@ -119,35 +111,34 @@ class Guild:
                             stage_progress["target_npc"] = stage["target_npc"]
                         quest_object["stages"].append(stage_progress)
                     
-                    active_quests.append(quest_object)
-                    player.active_quests = active_quests
-                    print(f"Accepted quest: {selected_quest['quest_name']}")
+                    player.accept_quest(quest_object)
+                    write(f"Accepted quest: {selected_quest['quest_name']}")
                     
-                    lore_entry = next((l for l in lore if l["quest_name"] == selected_quest["quest_name"]), None)
+                    lore_entry = index.lore(selected_quest["quest_name"])
                     if lore_entry:
-                        lore_choice = input("Would you like to read the lore? (y/n): ").lower()
+                        lore_choice = (await read_line("Would you like to read the lore? (y/n): ")).lower()
                         if lore_choice == "y":
-                            print(f"\nLore for '{selected_quest['quest_name']}':")
-                            print(lore_entry["lore_text"])
+                            write(f"\nLore for '{selected_quest['quest_name']}':")
+                            write(lore_entry["lore_text"])
                 else:
-                    print(f"Invalid selection. Choose between 1 and {len(available_quests)}.")
+                    write(f"Invalid selection. Choose between 1 and {len(available_quests)}.")
             except ValueError:
-                print("Invalid input. Please enter a number.")
+                write("Invalid input. Please enter a number.")
 
-    def turn_in_quest(self, player):
+    async def turn_in_quest(self, player):
         if not player.active_quests:
-            print("You have no active quests to turn in.")
+            write("You have no active quests to turn in.")
             return
 
-        print("\nActive Quests:")
+        write("\nActive Quests:")
         for i, quest in enumerate(player.active_quests, 1):
-            quest_data = next((q for q in self.quests_data["quests"] if q["quest_name"] == quest["quest_name"]), None)
+            quest_data = index.quest(quest["quest_name"])
             if quest_data:
-                print(f"{i}. {quest['quest_name']}")
-                print(f"   {quest_data['quest_description']}")
-                print(f"   Reward: {quest_data['quest_reward']} | Points: {quest_data['adventure_points']}")
+                write(f"{i}. {quest['quest_name']}")
+                write(f"   {quest_data['quest_description']}")
+                write(f"   Reward: {quest_data['quest_reward']} | Points: {quest_data['adventure_points']}")
 
-        quest_choice = input("\nSelect a quest to turn in (or 0 to return): ")
+        quest_choice = await read_line("\nSelect a quest to turn in (or 0 to return): ")
         if quest_choice == "0":
             return
 
@@ -155,7 +146,7 @@ class Guild:
             quest_index = int(quest_choice) - 1
             if 0 <= quest_index < len(player.active_quests):
                 selected_quest = player.active_quests[quest_index]
-                quest_data = next((q for q in self.quests_data["quests"] if q["quest_name"] == selected_quest["quest_name"]), None)
+                quest_data = index.quest(selected_quest["quest_name"])
                 
                 if quest_data:
                     # Check if quest is completed
@@ -163,18 +154,18 @@ class Guild:
                         # Award rewards
                         self._award_quest_rewards(player, quest_data)
                         # Remove quest from active quests
-                        player.active_quests.pop(quest_index)
+                        player.finish_quest(selected_quest)
                         # Add to completed quests
                         if not hasattr(player, "completed_quests"):
                             player.completed_quests = []
                         player.completed_quests.append(quest_data["quest_name"])
-                        print(f"Quest completed: {quest_data['quest_name']}")
+                        write(f"Quest completed: {quest_data['quest_name']}")
                     else:
-                        print("You haven't completed this quest yet.")
+                        write("You haven't completed this quest yet.")
             else:
-                print(f"Invalid selection. Choose between 1 and {len(player.active_quests)}.")
+                write(f"Invalid selection. Choose between 1 and {len(player.active_quests)}.")
         except ValueError:
-            print("Invalid input. Please enter a number.")
+            write("Invalid input. Please enter a number.")
 
     def _check_quest_completion(self, player, quest, quest_data):
         for i, stage in enumerate(quest_data["stages"]):
@@ -211,30 +202,30 @@ class Guild:
             else:
                 player.inventory[gear_name] += 1
 
-    def exchange_menu(self, player):
-        print("\n=== Guild Exchange ===")
-        print("1. Exchange for Adventure Points")
-        print("2. Craft Special Items")
-        print("0. Return")
-        choice = input("Selection: ")
+    async def exchange_menu(self, player):
+        write("\n=== Guild Exchange ===")
+        write("1. Exchange for Adventure Points")
+        write("2. Craft Special Items")
+        write("0. Return")
+        choice = await read_line("Selection: ")
 
         if choice == "1":
-            self._handle_points_exchange(player)
+            await self._handle_points_exchange(player)
         elif choice == "2":
-            self._handle_crafting(player)
+            await self._handle_crafting(player)
         elif choice == "0":
             return
         else:
-            print("Invalid choice!")
+            write("Invalid choice!")
 
-    def _handle_points_exchange(self, player):
-        print("\nAvailable Items for Exchange:")
+    async def _handle_points_exchange(self, player):
+        write("\nAvailable Items for Exchange:")
         rates = self.exchange_data["exchange_options"]["adventure_points"]["rates"]
         for i, rate in enumerate(rates, 1):
-            print(f"{i}. {rate['item']} - {rate['points']} points")
-            print(f"   You have: {player.inventory.get(rate['item'], 0)}")
+            write(f"{i}. {rate['item']} - {rate['points']} points")
+            write(f"   You have: {player.inventory.get(rate['item'], 0)}")
         
-        item_choice = input("\nSelect an item to exchange (or 0 to return): ")
+        item_choice = await read_line("\nSelect an item to exchange (or 0 to return): ")
         if item_choice == "0":
             return
 
@@ -243,14 +234,14 @@ class Guild:
             if 0 <= item_index < len(rates):
                 selected_rate = rates[item_index]
                 item_name = selected_rate["item"]
-                quantity = int(input(f"How many {item_name} would you like to exchange? "))
+                quantity = int(await read_line(f"How many {item_name} would you like to exchange? "))
                 
                 if quantity <= 0:
-                    print("Invalid quantity!")
+                    write("Invalid quantity!")
                     return
                 
                 if player.inventory.get(item_name, 0) < quantity:
-                    print("You don't have enough items!")
+                    write("You don't have enough items!")
                     return
                 
                 points = selected_rate["points"] * quantity
@@ -260,23 +251,23 @@ class Guild:
                 if player.adventurer_points > player.max_adventurer_points:
                     player.adventurer_points = player.max_adventurer_points
                 
-                print(f"Exchanged {quantity} {item_name} for {points} adventure points!")
+                write(f"Exchanged {quantity} {item_name} for {points} adventure points!")
             else:
-                print(f"Invalid selection. Choose between 1 and {len(rates)}.")
+                write(f"Invalid selection. Choose between 1 and {len(rates)}.")
         except ValueError:
-            print("Invalid input. Please enter a number.")
+            write("Invalid input. Please enter a number.")
 
-    def _handle_crafting(self, player):
-        print("\nAvailable Recipes:")
+    async def _handle_crafting(self, player):
+        write("\nAvailable Recipes:")
         recipes = self.exchange_data["exchange_options"]["crafted_items"]["recipes"]
         for i, recipe in enumerate(recipes, 1):
-            print(f"{i}. {recipe['name']}")
-            print(f"   {recipe['description']}")
-            print("   Requirements:")
+            write(f"{i}. {recipe['name']}")
+            write(f"   {recipe['description']}")
+            write("   Requirements:")
             for req in recipe["requirements"]:
-                print(f"   - {req['quantity']}x {req['item']} (You have: {player.inventory.get(req['item'], 0)})")
+                write(f"   - {req['quantity']}x {req['item']} (You have: {player.inventory.get(req['item'], 0)})")
         
-        recipe_choice = input("\nSelect a recipe to craft (or 0 to return): ")
+        recipe_choice = await read_line("\nSelect a recipe to craft (or 0 to return): ")
         if recipe_choice == "0":
             return
 
@@ -293,13 +284,13 @@ class Guild:
                             player.inventory[crafted_item["name"]] = crafted_item["quantity"]
                         else:
                             player.inventory[crafted_item["name"]] += crafted_item["quantity"]
-                        print(f"Successfully crafted {crafted_item['name']}!")
+                        write(f"Successfully crafted {crafted_item['name']}!")
                 else:
-                    print("You don't have enough materials!")
+                    write("You don't have enough materials!")
             else:
-                print(f"Invalid selection. Choose between 1 and {len(recipes)}.")
+                write(f"Invalid selection. Choose between 1 and {len(recipes)}.")
         except ValueError:
-            print("Invalid input. Please enter a number.")
+            write("Invalid input. Please enter a number.")
 
     def get_exchange_options(self) -> Dict:
         """Returns all available exchange options."""
@@ -354,11 +345,5 @@ class Guild:
 
     def get_item_drop_info(self, item_name: str) -> Optional[Dict]:
         """Get information about where an item can be dropped from."""
-        for item in self.key_items["key_items"]:
-            if item["name"] == item_name:
-                return {
-                    "drop_from": item["drop_from"],
-                    "drop_chance": item["drop_chance"],
-                    "quest": item["quest"]
-                }
-        return None 
\ No newline at end of file
+        info = index.key_item_sources(item_name)
+        return dict(info) if info else None 
\ No newline at end of file
@@ -0,0 +1,124 @@
+"""The player's inventory: a counted multiset of item names.
+
+Items are kept as {name: count} in the order each name was first added,
+so adding, removing and counting an item is O(1) however many the
+character carries. It still reads like the old list of names where the
+game relies on that: iterating yields each name once per copy,
+len() is the number of copies, and append/extend/remove/count behave as
+they did on the list. The guild's {name: count} style (get, [name],
+[name] = n) works on the same object.
+
+Saves store the counts; Inventory() also accepts the old list saves.
+"""
+
+
+class Inventory:
+    def __init__(self, items=None):
+        self._counts = {}
+        self._total = 0
+        self._sorted = None  # Cached sorted() / sorted_names(), dropped on change
+        if isinstance(items, (dict, Inventory)):
+            for name, count in items.items():
+                self.add(name, count)
+        elif items:
+            self.extend(items)
+
+    def _changed(self):
+        self._sorted = None
+
+    def add(self, name, count=1):
+        if count <= 0:
+            return
+        self._counts[name] = self._counts.get(name, 0) + count
+        self._total += count
+        self._changed()
+
+    def remove(self, name, count=1):
+        """Take count copies of name out; ValueError (like list.remove) if there aren't that many."""
+        have = self._counts.get(name, 0)
+        if have < count or count <= 0:
+            raise ValueError(f"{name!r} x{count} not in inventory")
+        if have == count:
+            del self._counts[name]
+        else:
+            self._counts[name] = have - count
+        self._total -= count
+        self._changed()
+
+    def discard(self, name, count=None):
+        """Remove up to count copies (all of them if None); returns how many went."""
+        have = self._counts.get(name, 0)
+        count = have if count is None else min(count, have)
+        if count > 0:
+            self.remove(name, count)
+        return count
+
+    def append(self, name):
+        self.add(name)
+
+    def extend(self, names):
+        for name in names:
+            self.add(name)
+
+    def count(self, name):
+        return self._counts.get(name, 0)
+
+    def get(self, name, default=0):
+        return self._counts.get(name, default)
+
+    def names(self):
+        """Distinct item names, in the order they were first added."""
+        return list(self._counts)
+
+    def items(self):
+        return self._counts.items()
+
+    def sorted(self):
+        """Every copy, alphabetically (the combat item picker's order); cached until the next change."""
+        return self._sorted_views()[0]
+
+    def sorted_names(self):
+        return self._sorted_views()[1]
+
+    def _sorted_views(self):
+        if self._sorted is None:
+            names = sorted(self._counts)
+            copies = [name for name in names for _ in range(self._counts[name])]
+            self._sorted = (copies, names)
+        return self._sorted
+
+    def copy(self):
+        return Inventory(self)
+
+    def to_save(self):
+        """{name: count} for the save file."""
+        return dict(self._counts)
+
+    def __getitem__(self, name):
+        return self._counts.get(name, 0)
+
+    def __setitem__(self, name, count):
+        have = self._counts.get(name, 0)
+        if count > have:
+            self.add(name, count - have)
+        elif count < have:
+            self.remove(name, have - max(count, 0))
+
+    def __contains__(self, name):
+        return name in self._counts
+
+    def __iter__(self):
+        for name, count in list(self._counts.items()):
+            for _ in range(count):
+                yield name
+
+    def __len__(self):
+        return self._total
+
+    def __eq__(self, other):
+        if isinstance(other, Inventory):
+            return self._counts == other._counts
+        return NotImplemented
+
+    def __repr__(self):
+        return f"Inventory({self._counts!r})"
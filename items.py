@@ -1,5 +1,6 @@
-import time
-from utils import load_json, parse_stats 
+from content import index
+from effects import EffectTimers
+from renderer import write, pause
 
 def parse_consumable(item_line):
     parts = item_line.split()
@@ -12,11 +13,11 @@ def parse_consumable(item_line):
         bracket.pop()
         is_rare = True
     if len(bracket) != 7:
-        print(f"Warning: Invalid consumable format: {item_line}")
+        write(f"Warning: Invalid consumable format: {item_line}")
         return None
     level_part, effect_type, value, stat, duration, drop_rate, gold = bracket
     if not level_part.startswith("L:") or not drop_rate.endswith("%"):
-        print(f"Warning: Invalid level range or drop rate: {item_line}")
+        write(f"Warning: Invalid level range or drop rate: {item_line}")
         return None
     try:
         min_level, max_level = map(int, level_part[2:].split("-"))
@@ -25,16 +26,16 @@ def parse_consumable(item_line):
         drop_rate = float(drop_rate[:-1]) / 100
         gold = int(gold)
         if effect_type not in ["HP", "MP", "Buff", "Offense"]:
-            print(f"Warning: Invalid effect type {effect_type} in {item_line}")
+            write(f"Warning: Invalid effect type {effect_type} in {item_line}")
             return None
         if effect_type == "Buff" and stat not in ["S", "A", "I", "W", "L"]:
-            print(f"Warning: Invalid stat {stat} for Buff in {item_line}")
+            write(f"Warning: Invalid stat {stat} for Buff in {item_line}")
             return None
         if effect_type in ["HP", "MP"] and stat != "none":
-            print(f"Warning: HP/MP items should use 'none' for stat, got {stat} in {item_line}")
+            write(f"Warning: HP/MP items should use 'none' for stat, got {stat} in {item_line}")
             # Still allow it to proceed, treating unexpected stat as 'none'
         if effect_type == "Offense" and stat not in ["Poison", "none"]:
-            print(f"Warning: Invalid stat {stat} for Offense in {item_line}")
+            write(f"Warning: Invalid stat {stat} for Offense in {item_line}")
             return None
         return {
             "name": name,
@@ -48,125 +49,107 @@ def parse_consumable(item_line):
             "is_rare": is_rare
         }
     except (ValueError, IndexError):
-        print(f"Warning: Could not parse consumable: {item_line}")
+        write(f"Warning: Could not parse consumable: {item_line}")
         return None
 
-def use_item(player, item_name, monster_stats=None):
-    consumables = load_json("consumables.json")
-    gear = load_json("gear.json")
+def consumable_value(consumable):
+    """HP/MP/stat/damage a consumable gives, scaled by its level block."""
+    level_block = ((consumable["level_range"]["min"] - 1) // 10) + 1
+    return consumable["value"] * level_block
 
-    if not hasattr(player, "active_effects"):
-        player.active_effects = {}
-    if monster_stats and "effects" not in monster_stats:
-        monster_stats["effects"] = {}
+# Timed consumables in player.active_effects; combat ticks them with (player, say)
+def _restore_tick(item_name, player, say):
+    consumable = index.consumable(item_name)
+    amount = consumable_value(consumable) / consumable["duration"]
+    if consumable["type"] == "HP":
+        player.hp = min(player.hp + amount, player.max_hp)
+    else:
+        player.mp = min(player.mp + amount, player.max_mp)
+    say(f"{item_name} restores {round(amount, 1)} {consumable['type']}.")
 
-    for consumable in consumables:
-        if consumable["name"] == item_name:
-            if player.level < consumable["level_range"]["min"] or player.level > consumable["level_range"]["max"]:
-                print(f"{item_name} is not suitable for your level ({player.level})!")
-                time.sleep(0.5)
-                return False
+def _buff_ended(item_name, player, say):
+    consumable = index.consumable(item_name)
+    player.stats[consumable["stat"]] -= consumable_value(consumable)
+    say(f"{item_name} wears off.")
 
-            level_block = ((consumable["level_range"]["min"] - 1) // 10) + 1
-            scale = level_block
-            effect_value = consumable["value"] * scale
+def use_item(player, item_name, monster_stats=None, out=None):
+    # out collects the messages instead of writing them (headless combat), without pauses
+    say = out or write
+    rest = (lambda: None) if out else (lambda: pause(0.5))
+    if monster_stats and "effects" not in monster_stats:
+        monster_stats["effects"] = EffectTimers()
 
-            if consumable["type"] == "HP":
-                if consumable["duration"] > 0:
-                    player.active_effects[item_name] = consumable["duration"]
-                    print(f"{item_name} will restore {effect_value} HP over {consumable['duration']} turns.")
-                else:
-                    player.hp = min(player.hp + effect_value, player.max_hp)
-                    print(f"{item_name} restores {effect_value} HP!")
-            elif consumable["type"] == "MP":
-                if consumable["duration"] > 0:
-                    player.active_effects[item_name] = consumable["duration"]
-                    print(f"{item_name} will restore {effect_value} MP over {consumable['duration']} turns.")
-                else:
-                    player.mp = min(player.mp + effect_value, player.max_mp)
-                    print(f"{item_name} restores {effect_value} MP!")
-            elif consumable["type"] == "Buff":
-                if consumable["duration"] > 0:
-                    player.active_effects[item_name] = consumable["duration"]
-                    player.stats[consumable["stat"]] += effect_value
-                    print(f"{item_name} boosts {consumable['stat']} by {effect_value} for {consumable['duration']} turns!")
-                else:
-                    print(f"{item_name} has no duration; Buff requires turns!")
-                    time.sleep(0.5)
-                    return False
-            elif consumable["type"] == "Offense":
-                if not monster_stats:
-                    print(f"{item_name} requires a target monster!")
-                    time.sleep(0.5)
-                    return False
-                if consumable["duration"] > 0:
-                    monster_stats["effects"][item_name] = consumable["duration"]
-                    print(f"{item_name} applies {effect_value} damage per turn to the monster for {consumable['duration']} turns!")
-                else:
-                    monster_stats["hp"] -= effect_value
-                    print(f"{item_name} deals {effect_value} damage to the monster!")
+    consumable = index.consumable(item_name)
+    if consumable:
+        if player.level < consumable["level_range"]["min"] or player.level > consumable["level_range"]["max"]:
+            say(f"{item_name} is not suitable for your level ({player.level})!")
+            rest()
+            return False
 
-            player.inventory.remove(item_name)
-            time.sleep(0.5)
-            return True
+        effect_value = consumable_value(consumable)
 
-    for g in gear:
-        if g["name"] == item_name:
-            slot = g["slot"]
-            if player.level < g["level_range"]["min"] or player.level > g["level_range"]["max"]:
-                print(f"{item_name} is not suitable for your level ({player.level})!")
-                time.sleep(0.5)
+        if consumable["type"] == "HP":
+            if consumable["duration"] > 0:
+                player.active_effects.start(item_name, consumable["duration"], on_tick=_restore_tick)
+                say(f"{item_name} will restore {effect_value} HP over {consumable['duration']} turns.")
+            else:
+                player.hp = min(player.hp + effect_value, player.max_hp)
+                say(f"{item_name} restores {effect_value} HP!")
+        elif consumable["type"] == "MP":
+            if consumable["duration"] > 0:
+                player.active_effects.start(item_name, consumable["duration"], on_tick=_restore_tick)
+                say(f"{item_name} will restore {effect_value} MP over {consumable['duration']} turns.")
+            else:
+                player.mp = min(player.mp + effect_value, player.max_mp)
+                say(f"{item_name} restores {effect_value} MP!")
+        elif consumable["type"] == "Buff":
+            if consumable["duration"] > 0:
+                if item_name not in player.active_effects:  # Another dose only extends it
+                    player.stats[consumable["stat"]] += effect_value
+                player.active_effects.start(item_name, consumable["duration"], on_expire=_buff_ended)
+                say(f"{item_name} boosts {consumable['stat']} by {effect_value} for {consumable['duration']} turns!")
+            else:
+                say(f"{item_name} has no duration; Buff requires turns!")
+                rest()
                 return False
-            if player.equipment[slot]:
-                old_item = player.equipment[slot][0]
-                for stat, val in player.equipment[slot][1].items():
-                    player.stats[stat] -= val
-                player.inventory.append(old_item)
-            player.equipment[slot] = (item_name, g["stats"], g["modifier"], g["armor_value"])
-            for stat, val in g["stats"].items():
-                player.stats[stat] += val
-            player.inventory.remove(item_name)
-            player.hp = min(player.hp + 2 * player.stats["S"], player.max_hp)
-            player.mp = min(player.mp + 2 * player.stats["W"], player.max_mp)
-            print(f"Equipped {item_name} to {slot}!")
-            time.sleep(0.5)
-            return True
+        elif consumable["type"] == "Offense":
+            if not monster_stats:
+                say(f"{item_name} requires a target monster!")
+                rest()
+                return False
+            if consumable["duration"] > 0:
+                monster_stats["effects"].start(item_name, consumable["duration"])
+                say(f"{item_name} applies {effect_value} damage per turn to the monster for {consumable['duration']} turns!")
+            else:
+                monster_stats["hp"] -= effect_value
+                say(f"{item_name} deals {effect_value} damage to the monster!")
 
-    print(f"Item {item_name} not found!")
-    time.sleep(0.5)
-    return False
+        player.inventory.remove(item_name)
+        rest()
+        return True
 
-    for g in gear:
-        parts = g.split()
-        if parts[0] == item:
-            matched = True
-            bracket = parts[-1][1:-1].split()
-            if bracket[-1] == "[R]":
-                bracket.pop()
-            level_part, slot, stats_str, damage, drop_rate, gold = bracket
-            min_level, max_level = map(int, level_part[2:].split("-"))
-            if player.level < min_level or player.level > max_level:
-                print(f"{item} is not suitable for your level ({player.level})!")
-                time.sleep(0.5)
-                return False
-            stats = parse_stats(stats_str, is_consumable=False)
-            if player.equipment[slot]:
-                old_item = player.equipment[slot][0]
-                for stat, val in player.equipment[slot][1].items():
-                    player.stats[stat] -= val
-                player.inventory.append(old_item)
-            player.equipment[slot] = (item, stats)
-            for stat, val in stats.items():
-                player.stats[stat] += val
-            player.inventory.remove(item)
-            player.hp = min(player.hp + 2 * player.stats["S"], player.max_hp)
-            player.mp = min(player.mp + 2 * player.stats["W"], player.max_mp)
-            print(f"Equipped {item} to {slot}!")
-            time.sleep(0.5)
-            return True
+    g = index.gear(item_name)
+    if g:
+        slot = g["slot"]
+        if player.level < g["level_range"]["min"] or player.level > g["level_range"]["max"]:
+            say(f"{item_name} is not suitable for your level ({player.level})!")
+            rest()
+            return False
+        if player.equipment[slot]:
+            old_item = player.equipment[slot][0]
+            for stat, val in player.equipment[slot][1].items():
+                player.stats[stat] -= val
+            player.inventory.append(old_item)
+        player.equipment[slot] = (item_name, g["stats"], g["modifier"], g["armor_value"])
+        for stat, val in g["stats"].items():
+            player.stats[stat] += val
+        player.inventory.remove(item_name)
+        player.hp = min(player.hp + 2 * player.stats["S"], player.max_hp)
+        player.mp = min(player.mp + 2 * player.stats["W"], player.max_mp)
+        say(f"Equipped {item_name} to {slot}!")
+        rest()
+        return True
 
-    # This block should be indented under the function
-    if not matched:
-        print(f"Item {item} not found!")
-        time.sleep(0.5)
-        return False
\ No newline at end of file
+    say(f"Item {item_name} not found!")
+    rest()
+    return False
@@ -0,0 +1,121 @@
+"""Append-only journal of save changes.
+
+Between full snapshots, each save only appends the fields that changed
+(and inventory adds/removes) as one JSON line per record. Every record
+carries an increasing sequence number; the snapshot remembers the last
+sequence it includes, so replay skips anything already folded in even if
+the game died between writing the snapshot and truncating the journal.
+"""
+import os
+import json
+from collections import Counter
+
+# Records appended before the next save rewrites the full snapshot
+COMPACT_EVERY = 200
+
+
+def diff_snapshots(old, new):
+    """Records that turn save dict old into new (seq numbers not yet set)."""
+    records = []
+    for field, value in new.items():
+        if field in old and old[field] == value:
+            continue
+        if field == "inventory" and isinstance(old.get(field), (list, dict)):
+            # {name: count}, or a list of names in older saves
+            before, after = Counter(old[field]), Counter(value)
+            for item, count in (before - after).items():
+                records.append({"op": "inv_remove", "item": item, "count": count})
+            for item, count in (after - before).items():
+                records.append({"op": "inv_add", "item": item, "count": count})
+        else:
+            records.append({"op": "set", "field": field, "value": value})
+    for field in old:
+        if field not in new:
+            records.append({"op": "del", "field": field})
+    return records
+
+
+def apply_record(save_data, record):
+    op = record["op"]
+    if op == "set":
+        save_data[record["field"]] = record["value"]
+    elif op == "del":
+        save_data.pop(record["field"], None)
+    elif op == "inv_add":
+        inventory = save_data.setdefault("inventory", {})
+        inventory[record["item"]] = inventory.get(record["item"], 0) + record["count"]
+    elif op == "inv_remove":
+        inventory = save_data.get("inventory", {})
+        left = inventory.get(record["item"], 0) - record["count"]
+        if left > 0:
+            inventory[record["item"]] = left
+        else:
+            inventory.pop(record["item"], None)
+
+
+def replay(snapshot, records):
+    """Apply the records newer than the snapshot; returns (save_data, applied)."""
+    save_data = dict(snapshot)
+    base_seq = save_data.pop("journal_seq", 0)
+    if "inventory" in save_data:
+        save_data["inventory"] = dict(Counter(save_data["inventory"]))  # Counts, whatever the snapshot held
+    applied = 0
+    for record in records:
+        if record["seq"] > base_seq:
+            apply_record(save_data, record)
+            applied += 1
+    return save_data, applied
+
+
+def read_records(path):
+    """Return (records, valid_bytes). Stops at the first torn or corrupt line."""
+    records = []
+    valid = 0
+    if not os.path.exists(path):
+        return records, valid
+    with open(path, "rb") as f:
+        for line in f:
+            if not line.endswith(b"\n"):
+                break  # Torn final write
+            try:
+                record = json.loads(line)
+            except ValueError:
+                break
+            records.append(record)
+            valid += len(line)
+    return records, valid
+
+
+class Journal:
+    def __init__(self, path):
+        self.path = path
+        self.records = 0  # Records since the last snapshot
+        self.seq = 0
+        existing, valid = read_records(path)
+        if existing:
+            self.seq = existing[-1]["seq"]
+            self.records = len(existing)
+        if os.path.exists(path) and os.path.getsize(path) > valid:
+            # Cut off a torn tail so new appends start on a clean line
+            with open(path, "r+b") as f:
+                f.truncate(valid)
+
+    def append(self, records):
+        if not records:
+            return
+        lines = []
+        for record in records:
+            self.seq += 1
+            record["seq"] = self.seq
+            lines.append(json.dumps(record, separators=(",", ":")))
+        with open(self.path, "a") as f:
+            f.write("\n".join(lines) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self.records += len(records)
+
+    def truncate(self):
+        """Forget all records; call after a snapshot holding self.seq is on disk."""
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        self.records = 0
@@ -0,0 +1,80 @@
+import random
+from bisect import bisect_right
+from itertools import accumulate
+from content import load_content
+
+# Adventure types from the game menu: encounter range, % chance of a
+# random event per encounter and drop rate bonus
+ADVENTURE_TYPES = {
+    "short": {"encounters": (2, 3), "event_chance": 5, "drop_rate_modifier": 0},
+    "adventure": {"encounters": (3, 6), "event_chance": 8, "drop_rate_modifier": 0.03},
+    "dungeon": {"encounters": (6, 10), "event_chance": 11, "drop_rate_modifier": 0.06},
+}
+
+DROP_RATE_MODIFIERS = {name: spec["drop_rate_modifier"] for name, spec in ADVENTURE_TYPES.items()}
+
+
+class LootTable:
+    """A precompiled weighted drop table sampled with bisect over cumulative weights."""
+
+    __slots__ = ("names", "cum_weights", "total")
+
+    def __init__(self, entries):
+        self.names = [name for name, _ in entries]
+        self.cum_weights = list(accumulate(weight for _, weight in entries))
+        self.total = self.cum_weights[-1] if self.cum_weights else 0
+
+    def __len__(self):
+        return len(self.names)
+
+    def sample(self, rng=random):
+        """Pick one item name; same draw as random.choices(names, weights, k=1)."""
+        if not self.names:
+            return None
+        return self.names[bisect_right(self.cum_weights, rng.random() * self.total, 0, len(self.names) - 1)]
+
+
+class LootTables:
+    """Victory drop tables keyed by (player level, boss fight, adventure type).
+
+    Tables are compiled on first use from gear.json and consumables.json and
+    dropped only when the content registry reloads either file.
+    """
+
+    def __init__(self):
+        self._sources = None
+        self._tables = {}
+
+    def _check_sources(self):
+        sources = (load_content("gear.json"), load_content("consumables.json"))
+        if self._sources is None or any(a is not b for a, b in zip(sources, self._sources)):
+            self._sources = sources
+            self._tables = {}
+        return sources
+
+    def _compile(self, sources, level, boss_fight, adventure_type):
+        modifier = DROP_RATE_MODIFIERS.get(adventure_type, 0)
+        entries = []
+        for items in sources:
+            for item in items:
+                if (item["level_range"]["min"] <= level <= item["level_range"]["max"] and
+                    item.get("drop_rate", 0) > 0 and
+                    (not item.get("boss_only", False) or boss_fight)):
+                    entries.append((item["name"], item["drop_rate"] * (1 + modifier)))
+        return LootTable(entries)
+
+    def get(self, level, boss_fight=False, adventure_type="short"):
+        sources = self._check_sources()
+        key = (level, bool(boss_fight), adventure_type)
+        table = self._tables.get(key)
+        if table is None:
+            table = self._tables[key] = self._compile(sources, level, boss_fight, adventure_type)
+        return table
+
+    def clear(self):
+        self._sources = None
+        self._tables = {}
+
+
+# Shared drop tables for the adventure loop and simulations
+loot_tables = LootTables()
@@ -1,15 +1,25 @@
-import json
-import sys
 import os
-from utils import load_json, save_json, get_base_path
+import copy
+import threading
+from utils import get_base_path
+from content import index
+from cooldowns import Cooldowns
+from effects import EffectTimers
+from quest_index import QuestIndex
+from inventory import Inventory
+from derived import DerivedStats, TrackedDict, base_max_hp, base_max_mp, level_hp_gain, level_mp_gain
+from saves import SaveManager
+from storage import FileStore, SqliteStore
+from renderer import write, read_line
 class Player:
     def __init__(self, name, class_type):
 #        print("Initializing Player...")
+        self.derived = DerivedStats(self)  # Armor, dodge, ... cached until stats or equipment change
         self.name = name
         self.level = 1
         self.exp = 0
         self.max_exp = 25  # Changed from 100 to 25 to match our new XP scaling
-        self.inventory = []
+        self.inventory = Inventory()
         self.equipment = {
             "head": None, "chest": None, "pants": None, "boots": None,
             "gloves": None, "main_hand": None, "off_hand": None, "neck": None, "ring": None
@@ -22,11 +32,13 @@ class Player:
         self.shop_stock = {}
         self.tavern_buff = None
         self.rage_turns = 0
-        self.event_cooldowns = {}
-        self.event_timers = {}
+        self.event_cooldowns = Cooldowns()  # Events that can't be rolled yet, counted in event rolls
+        self.triggered_events = []  # One-time events this character has seen
         self.skills = []
         self.skill_effects = {}
+        self.active_effects = EffectTimers()  # Timed consumables; tick on each combat turn
         self.active_quests = []
+        self.quest_index = QuestIndex()  # Kill/collect targets of active_quests
         self.completed_quests = []
         self.tavern_npcs = []
         self.has_room = False
@@ -45,15 +57,14 @@ class Player:
         elif class_type == "3":  # Rogue
             self.stats = {"S": 1, "A": 5, "I": 1, "W": 2, "L": 3}
 
-        self.max_hp = 10 + 2 * self.stats["S"]
+        self.max_hp = base_max_hp(self.stats)
         self.hp = self.max_hp
-        self.max_mp = 3 * self.stats["W"] if class_type == "2" else 2 * self.stats["W"]
+        self.max_mp = base_max_mp(self.stats, class_type)
         self.mp = self.max_mp
 #        print(f"Base stats: {self.stats}, HP: {self.hp}, MP: {self.mp}")
 
     def load_starting_data(self):
         # print("Entering load_starting_data...")
-        gear = load_json("gear.json")
         # print(f"Loaded gear.json: {len(gear)} items")
         starting_gear = {
             "1": ["Worn Armor", "Aged Sword", "Patch Pants", "Rugged Boots"],
@@ -62,7 +73,7 @@ class Player:
         }
         for item_name in starting_gear.get(self.class_type, []):
             # print(f"Looking for {item_name}...")
-            item = next((g for g in gear if g["name"] == item_name), None)
+            item = index.gear(item_name)
             if item:
                 slot = item["slot"]
                 stats = item.get("stats", {})
@@ -76,18 +87,14 @@ class Player:
             # else:
             #     print(f"Warning: Starting gear '{item_name}' not found in gear.json!")
 
-        self.max_hp = 10 + 2 * self.stats["S"]
+        self.max_hp = base_max_hp(self.stats)
         self.hp = self.max_hp
-        self.max_mp = 3 * self.stats["W"] if self.class_type == "2" else 2 * self.stats["W"]
+        self.max_mp = base_max_mp(self.stats, self.class_type)
         self.mp = self.max_mp
 #        print(f"Updated HP: {self.hp}/{self.max_hp}, MP: {self.mp}/{self.max_mp}")
 
-        skills_data = load_json("skills.json")
-        skills = skills_data.get("skills", [])
-       # print(f"Loaded skills.json: {len(skills)} skills")
-        for skill in skills:
-            if (skill.get("class_type") == self.class_type and 
-                skill.get("level_req") == 1 and 
+        for skill in index.skills_for_class(self.class_type):
+            if (skill.get("level_req") == 1 and 
                 skill.get("name") not in self.skills and 
                 len(self.skills) < 15):
                 self.skills.append(skill["name"])
@@ -96,49 +103,85 @@ class Player:
        # print(f"Final skills: {self.skills}")
        # print(f"XP after load: exp={self.exp}, pending_xp={self.pending_xp}")
 
+    def accept_quest(self, quest):
+        """Add a quest progress dict to active_quests and index its targets."""
+        self.active_quests.append(quest)
+        self.quest_index.add(quest)
+
+    def finish_quest(self, quest):
+        """Drop a quest from active_quests (turned in or abandoned)."""
+        self.active_quests.remove(quest)
+        self.quest_index.remove(quest)
+
     def update_kill_count(self, monster_name):
-        quests = load_json("quest.json").get("quests", [])
-        for quest in self.active_quests:
-            quest_data = next((q for q in quests if q["quest_name"] == quest["quest_name"]), None)
+        for quest, i in self.quest_index.kills(monster_name):
+            quest_data = index.quest(quest["quest_name"])
             if quest_data:
-                for i, stage in enumerate(quest["stages"]):
-                    if (stage["type"] == "kill" and 
-                        stage.get("target_monster") == monster_name):
-                        stage["kill_count"] = stage.get("kill_count", 0) + 1
-                        required = quest_data["stages"][i]["kill_count_required"]
-                        print(f"Progress: {quest['quest_name']} - {monster_name} {stage['kill_count']}/{required}")
+                stage = quest["stages"][i]
+                stage["kill_count"] = stage.get("kill_count", 0) + 1
+                required = quest_data["stages"][i]["kill_count_required"]
+                write(f"Progress: {quest['quest_name']} - {monster_name} {stage['kill_count']}/{required}")
 
     def update_quest_items(self, item_name):
-        quests = load_json("quest.json").get("quests", [])
-        for quest in self.active_quests:
-            quest_data = next((q for q in quests if q["quest_name"] == quest["quest_name"]), None)
+        for quest, i in self.quest_index.pickups(item_name):
+            quest_data = index.quest(quest["quest_name"])
             if quest_data:
-                for i, stage in enumerate(quest["stages"]):
-                    if stage["type"] == "collect" and stage.get("target_item") == item_name:
-                        stage["item_count"] = min(
-                            self.inventory.count(item_name),
-                            quest_data["stages"][i]["item_count_required"]
-                        )
-                        required = quest_data["stages"][i]["item_count_required"]
-                        print(f"Progress: {quest['quest_name']} - {item_name} {stage['item_count']}/{required}")
-                        break
+                stage = quest["stages"][i]
+                stage["item_count"] = min(
+                    self.inventory.count(item_name),
+                    quest_data["stages"][i]["item_count_required"]
+                )
+                required = quest_data["stages"][i]["item_count_required"]
+                write(f"Progress: {quest['quest_name']} - {item_name} {stage['item_count']}/{required}")
+
+    # stats and equipment are TrackedDicts: any write, in place or by
+    # reassigning, drops the cached derived values
+    @property
+    def stats(self):
+        return self._stats
+
+    @stats.setter
+    def stats(self, value):
+        self._stats = TrackedDict(value, self.derived.clear)
+        self.derived.clear()
+
+    @property
+    def equipment(self):
+        return self._equipment
+
+    @equipment.setter
+    def equipment(self, value):
+        self._equipment = TrackedDict(value, self.derived.clear)
+        self.derived.clear()
 
     def get_total_armor_value(self):
-        total_av = 0
-        for slot, item in self.equipment.items():
-            if item:
-                _, _, scaling_stat, base_av = item
-                scaling_bonus = self.stats[scaling_stat] * 0.1
-                total_av += base_av + scaling_bonus
-        return min(total_av, 100)
+        return self.derived.get("armor")
+
+    def dodge_chance(self):
+        """Base chance to dodge a monster's attack (before skill bonuses)."""
+        return self.derived.get("dodge")
+
+    def crit_chance(self):
+        return self.derived.get("crit")
 
-    def apply_xp(self):
+    def initiative(self):
+        return self.derived.get("initiative")
+
+    def weapon_damage_range(self):
+        """(min, max) damage of the equipped weapon, or None without one."""
+        damage = self.derived.get("weapon_range")
+        if damage is None or "Rage" not in self.skill_effects:
+            return damage
+        bonus = self.derived.get("rage_bonus")
+        return (damage[0] + bonus, damage[1] + bonus)
+
+    async def apply_xp(self):
         # Add pending XP to current XP regardless of level
         self.exp += self.pending_xp
             
         # Only try to level up if we're not at max level
         while self.exp >= self.max_exp and self.level < 25:
-            self.level_up()
+            await self.level_up()
             
         # Clear pending XP after applying it
         self.pending_xp = 0
@@ -148,7 +191,7 @@ class Player:
 
     def apply_adventurer_points(self, points):
         if self.adventurer_points >= self.max_adventurer_points:
-            print("\nYou have reached the maximum adventurer rank!")
+            write("\nYou have reached the maximum adventurer rank!")
             return self.adventurer_points
             
         self.adventurer_points = min(self.adventurer_points + points, self.max_adventurer_points)
@@ -163,7 +206,7 @@ class Player:
         if self.adventurer_rank < 6:  # Max rank is 6 (Emerald)
             self.adventurer_rank += 1
             rank_names = ["Silver", "Gold", "Crystal", "Sapphire", "Ruby", "Emerald"]
-            print(f"\nCongratulations! You have achieved the rank of {rank_names[self.adventurer_rank-1]} Adventurer!")
+            write(f"\nCongratulations! You have achieved the rank of {rank_names[self.adventurer_rank-1]} Adventurer!")
             return True
         return False
 
@@ -176,8 +219,13 @@ class Player:
             return self.rank_thresholds[self.adventurer_rank] - self.adventurer_points
         return 0
 
-    def level_up(self):
-        """Handle a single level-up with scaled HP/MP increases."""
+    async def level_up(self, allocate=None):
+        """Handle a single level-up with scaled HP/MP increases.
+
+        allocate(player) spends the stat points instead of asking the player
+        (simulations), and then nothing here awaits; by default the player
+        is prompted.
+        """
         old_max_hp = self.max_hp
         old_max_mp = self.max_mp
 
@@ -185,53 +233,85 @@ class Player:
         self.exp -= self.max_exp  # Only subtract XP if leveling via apply_xp
         self.max_exp = int(25 * (2.5 ** (self.level - 1)))  # Start at 25 XP, scale by 2.5x per level
         self.stat_points += 1
-        print(f"{self.name} leveled up to {self.level}! You have {self.stat_points} stat points to allocate.")
+        write(f"{self.name} leveled up to {self.level}! You have {self.stat_points} stat points to allocate.")
 
         # Check for new skills
-        skills_data = load_json("skills.json").get("skills", [])
-        for skill in skills_data:
-            if (skill["class_type"] == self.class_type and 
-                skill["level_req"] <= self.level and 
+        for skill in index.skills_for_class(self.class_type):
+            if (skill["level_req"] <= self.level and 
                 skill["name"] not in self.skills and 
                 len(self.skills) < 15):
                 self.skills.append(skill["name"])
-                print(f"You've unlocked the {skill['name']} skill!")
+                write(f"You've unlocked the {skill['name']} skill!")
 
         # Allocate stat points
         if self.stat_points > 0:
-            self.allocate_stat()
+            if allocate:
+                allocate(self)
+            else:
+                await self.allocate_stat()
 
         # Apply scaled HP/MP increases AFTER stat allocation
-        self.max_hp += 2 + (2 * self.stats["S"])  # Base 2 + 2 per Strength
-        self.max_mp += 1 + (2 * self.stats["W"])  # Base 1 + 2 per Wisdom
+        self.max_hp += level_hp_gain(self.stats)
+        self.max_mp += level_mp_gain(self.stats)
         self.hp = self.max_hp
         self.mp = self.max_mp
 
         # Show increase
         hp_increase = self.max_hp - old_max_hp
         mp_increase = self.max_mp - old_max_mp
-        print(f"HP increased by {hp_increase} to {self.hp}/{self.max_hp}")
-        print(f"MP increased by {mp_increase} to {self.mp}/{self.max_mp}")
+        write(f"HP increased by {hp_increase} to {self.hp}/{self.max_hp}")
+        write(f"MP increased by {mp_increase} to {self.mp}/{self.max_mp}")
 
-    def allocate_stat(self):
+    async def allocate_stat(self):
         while self.stat_points > 0:
-            print(f"\nStat Points Available: {self.stat_points}")
-            print(f"Current Stats: S:{self.stats['S']} A:{self.stats['A']} I:{self.stats['I']} W:{self.stats['W']} L:{self.stats['L']}")
-            print("1. Strength (S) | 2. Agility (A) | 3. Intelligence (I) | 4. Willpower (W) | 5. Luck (L) | 6. Done")
-            choice = input("Select stat to increase: ")
+            write(f"\nStat Points Available: {self.stat_points}")
+            write(f"Current Stats: S:{self.stats['S']} A:{self.stats['A']} I:{self.stats['I']} W:{self.stats['W']} L:{self.stats['L']}")
+            write("1. Strength (S) | 2. Agility (A) | 3. Intelligence (I) | 4. Willpower (W) | 5. Luck (L) | 6. Done")
+            choice = await read_line("Select stat to increase: ")
             stat_map = {"1": "S", "2": "A", "3": "I", "4": "W", "5": "L"}
             if choice in stat_map:
                 self.stats[stat_map[choice]] += 1
                 self.stat_points -= 1
-                print(f"{stat_map[choice]} increased to {self.stats[stat_map[choice]]}!")
+                write(f"{stat_map[choice]} increased to {self.stats[stat_map[choice]]}!")
             elif choice == "6":
                 break
             else:
-                print("Invalid choice!")
+                write("Invalid choice!")
+
+def get_save_path():
+    return os.path.join(get_base_path(), "save.json")
+
+# "file" (save.json, the default) or "sqlite" (saves.db, many characters)
+SAVE_STORE = os.environ.get("SNOWCALLER_SAVE_STORE", "file")
+
+_store = None
+_save_manager = None
+
+def get_store():
+    global _store
+    if _store is None:
+        if SAVE_STORE == "sqlite":
+            _store = SqliteStore(os.path.join(get_base_path(), "saves.db"))
+        else:
+            _store = FileStore(get_save_path())
+    return _store
+
+def set_store(store):
+    """Plug in a different save store; call before the first save or load."""
+    global _store, _save_manager
+    if _save_manager is not None:
+        _save_manager.close()
+    _store = store
+    _save_manager = None
 
-def save_game(player):
-    base_path = get_base_path()  # Use utils.get_base_path()
-    save_path = os.path.join(base_path, "save.json")
+def get_save_manager():
+    global _save_manager
+    if _save_manager is None:
+        _save_manager = SaveManager(get_store())
+    return _save_manager
+
+def get_save_data(player):
+    """Snapshot of the player's saved state, safe to hand to another thread."""
     save_data = {
         "name": player.name,
         "level": player.level,
@@ -242,7 +322,7 @@ def save_game(player):
         "max_hp": player.max_hp,
         "mp": player.mp,
         "max_mp": player.max_mp,
-        "inventory": player.inventory,
+        "inventory": player.inventory.to_save(),
         "equipment": {
             slot: (item[0], item[1], item[2], item[3]) if item else None
             for slot, item in player.equipment.items()
@@ -260,61 +340,110 @@ def save_game(player):
         "active_quests": player.active_quests,
         "completed_quests": player.completed_quests,
         "tavern_npcs": player.tavern_npcs,
-        "event_cooldowns": player.event_cooldowns,
+        "event_cooldowns": player.event_cooldowns.remaining(),
+        "triggered_events": player.triggered_events,
         "has_room": player.has_room,
         "adventurer_rank": player.adventurer_rank,
         "adventurer_points": player.adventurer_points,
         "max_adventurer_points": player.max_adventurer_points,
         "guild_member": getattr(player, "guild_member", False)  # Add guild membership status
     }
-    try:
-        with open(save_path, 'w') as f:
-            json.dump(save_data, f, indent=4)
-#        print("Game saved successfully as save.json.")
-    except Exception as e:
-        print(f"Failed to save game: {e}")
+    return copy.deepcopy(save_data)
+
+def save_game(player, immediate=False):
+    """Queue a save; the write happens in the background shortly after.
+
+    Pass immediate=True to block until the save is on disk (manual saves).
+    """
+    manager = get_save_manager()
+    manager.request(get_save_data(player))
+    if immediate:
+        manager.flush()
+
+def flush_saves():
+    """Write any queued save now (quit, death, before exiting)."""
+    if _save_manager is not None:
+        _save_manager.flush()
+
+def delete_save(name=None):
+    """Drop queued saves and delete the character's save (character death)."""
+    get_save_manager().discard(name)
+    get_store().delete(name)
+
+def has_save(name=None):
+    return get_store().exists(name)
+
+# Characters open in a server session: name -> the session (console) playing it
+_open_characters = {}
+_open_lock = threading.Lock()
 
-def load_game():
-    base_path = get_base_path()  # Use utils.get_base_path()
-    save_path = os.path.join(base_path, "save.json")
-    if not os.path.exists(save_path):
-        return None
+def claim_character(name, session):
+    """Mark name as played by session; False if another session already has it open."""
+    with _open_lock:
+        holder = _open_characters.setdefault(name, session)
+        return holder is session
+
+def release_characters(session):
+    """Free every character session had open (the connection closed)."""
+    with _open_lock:
+        for name in [name for name, holder in _open_characters.items() if holder is session]:
+            del _open_characters[name]
+
+def set_password(name, password):
+    get_store().set_password(name, password)
+
+def check_password(name, password):
+    return get_store().check_password(name, password)
+
+def list_characters():
+    flush_saves()
+    return get_store().list_characters()
+
+def player_from_save_data(save_data):
+    player = Player(save_data["name"], save_data["class_type"])
+    player.level = save_data["level"]
+    player.exp = save_data["exp"]
+    player.max_exp = save_data["max_exp"]
+    player.stats = save_data["stats"]
+    player.hp = save_data["hp"]
+    player.max_hp = save_data["max_hp"]
+    player.mp = save_data["mp"]
+    player.max_mp = save_data["max_mp"]
+    player.inventory = Inventory(save_data["inventory"])  # {name: count}, or a list in older saves
+    player.equipment = {
+        slot: (data[0], data[1], data[2], data[3]) if data else None
+        for slot, data in save_data["equipment"].items()
+    }
+    player.active_enemy_effect = save_data["active_enemy_effect"]
+    player.pending_xp = save_data["pending_xp"]
+    player.stat_points = save_data["stat_points"]
+    player.gold = save_data["gold"]
+    player.shop_stock = save_data["shop_stock"]
+    player.tavern_buff = save_data["tavern_buff"]
+    player.rage_turns = save_data["rage_turns"]
+    player.skills = save_data["skills"]
+    player.skill_effects = save_data["skill_effects"]
+    player.active_quests = save_data.get("active_quests", [])
+    player.quest_index = QuestIndex(player.active_quests)
+    player.completed_quests = save_data.get("completed_quests", [])
+    player.tavern_npcs = save_data.get("tavern_npcs", [])
+    player.event_cooldowns = Cooldowns(save_data.get("event_cooldowns", {}))
+    player.triggered_events = save_data.get("triggered_events", [])
+    player.has_room = save_data.get("has_room", False)
+    player.adventurer_rank = save_data["adventurer_rank"]
+    player.adventurer_points = save_data["adventurer_points"]
+    player.max_adventurer_points = save_data["max_adventurer_points"]
+    player.guild_member = save_data.get("guild_member", False)  # Load guild membership status
+    return player
+
+def load_game(name=None):
+    """Load a character by name (None: the save file / most recent character)."""
+    flush_saves()
     try:
-        with open(save_path, 'r') as f:
-            save_data = json.load(f)
-        player = Player(save_data["name"], save_data["class_type"])
-        player.level = save_data["level"]
-        player.exp = save_data["exp"]
-        player.max_exp = save_data["max_exp"]
-        player.stats = save_data["stats"]
-        player.hp = save_data["hp"]
-        player.max_hp = save_data["max_hp"]
-        player.mp = save_data["mp"]
-        player.max_mp = save_data["max_mp"]
-        player.inventory = save_data["inventory"]
-        player.equipment = {
-            slot: (data[0], data[1], data[2], data[3]) if data else None
-            for slot, data in save_data["equipment"].items()
-        }
-        player.active_enemy_effect = save_data["active_enemy_effect"]
-        player.pending_xp = save_data["pending_xp"]
-        player.stat_points = save_data["stat_points"]
-        player.gold = save_data["gold"]
-        player.shop_stock = save_data["shop_stock"]
-        player.tavern_buff = save_data["tavern_buff"]
-        player.rage_turns = save_data["rage_turns"]
-        player.skills = save_data["skills"]
-        player.skill_effects = save_data["skill_effects"]
-        player.active_quests = save_data.get("active_quests", [])
-        player.completed_quests = save_data.get("completed_quests", [])
-        player.tavern_npcs = save_data.get("tavern_npcs", [])
-        player.event_cooldowns = save_data.get("event_cooldowns", {})
-        player.has_room = save_data.get("has_room", False)
-        player.adventurer_rank = save_data["adventurer_rank"]
-        player.adventurer_points = save_data["adventurer_points"]
-        player.max_adventurer_points = save_data["max_adventurer_points"]
-        player.guild_member = save_data.get("guild_member", False)  # Load guild membership status
-        return player
+        save_data = get_store().load(name)
+        if save_data is None:
+            return None
+        return player_from_save_data(save_data)
     except Exception as e:
-        print(f"Error loading save: {e}")
+        write(f"Error loading save: {e}")
         return None
\ No newline at end of file
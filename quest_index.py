@@ -0,0 +1,41 @@
+"""Reverse index from quest targets to the active quest stages they advance.
+
+Player keeps one in step with active_quests (accept_quest / finish_quest),
+so a kill or an item pickup visits only the stages that count it instead
+of every stage of every active quest.
+"""
+
+
+class QuestIndex:
+    def __init__(self, active_quests=()):
+        self.monsters = {}  # monster name -> [(quest, stage index)] for kill stages
+        self.items = {}  # item name -> [(quest, stage index)] for collect stages
+        for quest in active_quests:
+            self.add(quest)
+
+    def add(self, quest):
+        """Index a quest's progress dict (an entry of player.active_quests)."""
+        for i, stage in enumerate(quest["stages"]):
+            if stage["type"] == "kill" and stage.get("target_monster"):
+                self.monsters.setdefault(stage["target_monster"], []).append((quest, i))
+            elif stage["type"] == "collect" and stage.get("target_item"):
+                entries = self.items.setdefault(stage["target_item"], [])
+                if not any(q is quest for q, _ in entries):  # One stage per item per quest
+                    entries.append((quest, i))
+
+    def remove(self, quest):
+        for table, key in ((self.monsters, "target_monster"), (self.items, "target_item")):
+            for stage in quest["stages"]:
+                target = stage.get(key)
+                entries = table.get(target)
+                if entries is None:
+                    continue
+                entries[:] = [entry for entry in entries if entry[0] is not quest]
+                if not entries:
+                    del table[target]
+
+    def kills(self, monster_name):
+        return self.monsters.get(monster_name, ())
+
+    def pickups(self, item_name):
+        return self.items.get(item_name, ())
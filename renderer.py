@@ -0,0 +1,241 @@
+"""Terminal output for the game.
+
+All game text goes through write() and every prompt through read_line(),
+so output can be buffered and sent in one go per "frame" (right before
+the game waits for input) instead of one character at a time.
+
+Modes:
+    fast       whole lines, buffered, flushed once per frame, no sleeps
+    cinematic  the typing/fade/pulse effects, each capped by a time budget
+    silent     output is dropped (simulation workers)
+
+Set SNOWCALLER_RENDER=fast|cinematic; otherwise cinematic is used on a
+terminal and fast when output is redirected (headless runs, servers).
+
+read_line() is a coroutine so a menu can wait on a socket without holding
+a thread. The module functions act on the current context's renderer:
+the shared terminal one, or the console a session installed with use()
+(see console.py for scripted and network consoles).
+"""
+import os
+import sys
+import time
+import shutil
+import atexit
+import inspect
+import textwrap
+import threading
+from contextvars import ContextVar
+from colorama import Fore, Style
+
+MODES = ("fast", "cinematic", "silent")
+
+# Typing speed per character (seconds)
+MENU_DELAY = 0.0005  # Very fast for menus
+TEXT_DELAY = 0.001   # Fast for normal text
+
+# Most a single line may spend typing, and a fade/pulse/scroll effect animating
+LINE_BUDGET = 0.25
+EFFECT_BUDGET = 1.0
+# Typed text is written in chunks, one chunk per frame, instead of per character
+FRAME_INTERVAL = 0.01
+
+WRAP_WIDTH = 80
+# Fast mode flushes early if this many writes pile up without a prompt
+MAX_BUFFERED = 256
+
+
+def default_mode():
+    mode = os.environ.get("SNOWCALLER_RENDER")
+    if mode in MODES:
+        return mode
+    return "cinematic" if sys.stdout.isatty() else "fast"
+
+
+def format_text(text, color=Fore.WHITE, style=Style.NORMAL, width=WRAP_WIDTH):
+    """Apply color and style, wrapping long lines (newlines are kept)."""
+    lines = [textwrap.fill(line, width=width) if len(line) > width else line
+             for line in text.split("\n")]
+    wrapped = "\n".join(lines)
+    return f"{style}{color}{wrapped}{Style.RESET_ALL}"
+
+
+class Renderer:
+    def __init__(self, mode=None, stream=None):
+        self.mode = mode or default_mode()
+        self.stream = stream  # None: whatever sys.stdout is at write time
+        self.input = None  # Answers read_line instead of input() (see set_input)
+        self.lines = 0
+        self.frames = 0
+        self._buffer = []
+        self._lock = threading.RLock()
+
+    def _out(self):
+        return self.stream or sys.stdout
+
+    def _flush_locked(self):
+        if self._buffer:
+            out = self._out()
+            out.write("".join(self._buffer))
+            self._buffer = []
+            out.flush()
+
+    def flush(self):
+        """Send everything buffered to the terminal (one write, one flush)."""
+        with self._lock:
+            self._flush_locked()
+
+    def write(self, *args, color=Fore.WHITE, style=Style.NORMAL, animation="type", is_menu=False,
+              sep=" ", end="\n", flush=False, raw=False):
+        """raw: the text is already formatted (pre-rendered art); it isn't colored or wrapped again."""
+        if self.mode == "silent":
+            return
+        text = sep.join(str(arg) for arg in args)
+        formatted = text if raw else format_text(text, color, style)
+        with self._lock:
+            self.lines += 1
+            if self.mode == "fast" or not animation:
+                self._buffer.append(formatted + end)
+                if flush or len(self._buffer) >= MAX_BUFFERED:
+                    self._flush_locked()
+                return
+            self._flush_locked()
+            if animation == "fade":
+                self._fade(formatted)
+            elif animation == "pulse":
+                self._pulse(formatted)
+            elif animation == "scroll":
+                self._scroll(formatted)
+            else:
+                self._type(formatted, MENU_DELAY if is_menu else TEXT_DELAY)
+            out = self._out()
+            out.write(end)
+            out.flush()
+
+    def columns(self):
+        """The terminal's width; WRAP_WIDTH when it can't be told (scripted or network consoles)."""
+        if self.stream is not None:
+            return WRAP_WIDTH
+        return shutil.get_terminal_size((WRAP_WIDTH, 24)).columns
+
+    def write_menu(self, options, start=1, **kwargs):
+        """Write numbered options, one per line ("1. Attack")."""
+        if not options:
+            return
+        self.write("\n".join(f"{i}. {option}" for i, option in enumerate(options, start)), is_menu=True, **kwargs)
+
+    def _type(self, text, delay):
+        out = self._out()
+        total = min(len(text) * delay, LINE_BUDGET)
+        frames = max(1, int(total / FRAME_INTERVAL))
+        step = -(-len(text) // frames) or 1
+        for i in range(0, len(text), step):
+            out.write(text[i:i + step])
+            out.flush()
+            time.sleep(total / frames)
+
+    def _fade(self, text, steps=10):
+        out = self._out()
+        delay = min(0.05, EFFECT_BUDGET / steps)
+        for i in range(steps):
+            alpha = i / steps
+            out.write(f"\033[38;2;255;255;255;{int(alpha * 255)}m{text}\033[0m\r")
+            out.flush()
+            time.sleep(delay)
+        out.write(text)
+
+    def _pulse(self, text, cycles=3):
+        out = self._out()
+        delay = min(0.1, EFFECT_BUDGET / (cycles * 20))
+        for _ in range(cycles):
+            for i in list(range(10)) + list(range(10, 0, -1)):
+                brightness = int(255 * (i / 10))
+                out.write(f"\033[38;2;{brightness};{brightness};{brightness}m{text}\033[0m\r")
+                out.flush()
+                time.sleep(delay)
+        out.write(text)
+
+    def _scroll(self, text, width=WRAP_WIDTH):
+        out = self._out()
+        if len(text) > width:
+            steps = len(text) - width + 1
+            delay = min(0.05, EFFECT_BUDGET / steps)
+            for i in range(steps):
+                out.write(f"\r{text[i:i + width]}")
+                out.flush()
+                time.sleep(delay)
+            out.write("\r")
+        out.write(text)
+
+    def read_input(self, prompt):
+        """Get one answer; consoles override this. May return an awaitable."""
+        return (self.input or input)(prompt)
+
+    async def read_line(self, prompt=""):
+        """Flush the frame, then wait for a line of input."""
+        with self._lock:
+            self._flush_locked()
+            self.frames += 1
+        answer = self.read_input(prompt)
+        if inspect.isawaitable(answer):  # Network sessions read asynchronously
+            answer = await answer
+        return answer
+
+    def pause(self, seconds):
+        """Dramatic pause between messages; skipped entirely in fast mode."""
+        if self.mode != "cinematic":
+            return
+        self.flush()
+        time.sleep(seconds)
+
+
+# Shared renderer for the game's output
+renderer = Renderer()
+atexit.register(renderer.flush)
+current = ContextVar("renderer", default=renderer)
+
+
+def use(session_renderer):
+    """Send this context's (task's) output and prompts through session_renderer."""
+    current.set(session_renderer)
+
+
+def write(*args, **kwargs):
+    current.get().write(*args, **kwargs)
+
+
+def write_menu(options, start=1, **kwargs):
+    current.get().write_menu(options, start, **kwargs)
+
+
+async def read_line(prompt=""):
+    return await current.get().read_line(prompt)
+
+
+def pause(seconds):
+    current.get().pause(seconds)
+
+
+def columns():
+    return current.get().columns()
+
+
+def flush():
+    current.get().flush()
+
+
+def set_mode(mode):
+    if mode not in MODES:
+        raise ValueError(f"Unknown render mode: {mode}")
+    target = current.get()
+    with target._lock:
+        target._flush_locked()
+        target.mode = mode
+
+
+def set_input(func=None):
+    """Answer read_line() with func(prompt) instead of input(); None restores input().
+
+    func may be a coroutine function.
+    """
+    current.get().input = func
@@ -0,0 +1,246 @@
+"""Record a play session and replay it at full speed.
+
+A recording (JSON lines) holds the session seed (see rngs), the saves the
+session started from, every line typed at a read_line() prompt and the
+saves it ended with. Replaying restores the saves into a throwaway store,
+reseeds the RNG streams, feeds the answers back with the renderer silent
+and checks the final saves match. That makes recorded sessions both a
+regression check and a benchmark of the real menus:
+
+    python replay.py record session.snowrec
+    python replay.py play session.snowrec --profile --repeat 5
+"""
+import os
+import sys
+import json
+import time
+import asyncio
+import pstats
+import cProfile
+import argparse
+import tempfile
+
+import rngs
+import renderer
+import player as player_module
+from console import ScriptedConsole, ScriptExhausted
+from player import get_store, set_store, flush_saves
+from storage import FileStore, SqliteStore
+
+FORMAT_VERSION = 1
+
+# Menu entry points reported (cumulative time) after a profiled replay
+SUBSYSTEMS = [
+    ("game", "game.py", "main"),
+    ("adventure combat", "combat.py", "combat"),
+    ("events", "events.py", "random_event"),
+    ("shop", "shop.py", "shop_menu"),
+    ("tavern", "tavern.py", "tavern_menu"),
+    ("guild", "guild.py", "guild_menu"),
+    ("saving", "player.py", "save_game"),
+]
+
+
+class ReplayMismatch(Exception):
+    """The replayed session ended somewhere other than the recorded one."""
+
+    def __init__(self, differences):
+        super().__init__("; ".join(differences[:5]) + (f" (+{len(differences) - 5} more)" if len(differences) > 5 else ""))
+        self.differences = differences
+
+
+def _store_kind(store):
+    return "sqlite" if isinstance(store, SqliteStore) else "file"
+
+
+def snapshot_store(store):
+    """{name: save dict} for every character in the store, JSON-normalised."""
+    saves = {}
+    for character in store.list_characters():
+        save_data = store.load(character["name"])
+        if save_data is not None:
+            save_data.pop("journal_seq", None)
+            saves[character["name"]] = save_data
+    return json.loads(json.dumps(saves))
+
+
+def _run_game(console=None):
+    import game
+    asyncio.run(game.main(console, check_updates=False))  # Never reach for the network mid-recording
+
+
+def record(path, seed=None):
+    """Play an interactive session on the terminal, writing it to path."""
+    session_seed = rngs.seed(seed)
+    store = get_store()
+    flush_saves()
+    ended = "quit"
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(json.dumps({"type": "header", "version": FORMAT_VERSION, "seed": session_seed,
+                            "store": _store_kind(store), "saves": snapshot_store(store)}) + "\n")
+
+        def answer(prompt):
+            text = input(prompt)
+            f.write(json.dumps({"type": "input", "text": text}) + "\n")
+            return text
+
+        renderer.set_input(answer)
+        try:
+            _run_game()
+        except (EOFError, KeyboardInterrupt):
+            ended = "interrupted"
+        finally:
+            renderer.set_input(None)
+            flush_saves()
+            f.write(json.dumps({"type": "final", "ended": ended, "saves": snapshot_store(store)}) + "\n")
+    return path
+
+
+def load_recording(path):
+    header, inputs, final = None, [], None
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            entry = json.loads(line)
+            if entry["type"] == "header":
+                header = entry
+            elif entry["type"] == "input":
+                inputs.append(entry["text"])
+            elif entry["type"] == "final":
+                final = entry
+    if header is None or header.get("version") != FORMAT_VERSION:
+        raise ValueError(f"{path} is not a version {FORMAT_VERSION} recording")
+    if final is None:
+        raise ValueError(f"{path} is incomplete (no final state)")
+    return {"header": header, "inputs": inputs, "final": final}
+
+
+def _differences(recorded, replayed):
+    differences = []
+    for name in sorted(set(recorded) | set(replayed)):
+        if name not in replayed:
+            differences.append(f"{name}: missing after replay")
+        elif name not in recorded:
+            differences.append(f"{name}: not in the recording")
+        else:
+            old, new = recorded[name], replayed[name]
+            for key in sorted(set(old) | set(new)):
+                if old.get(key) != new.get(key):
+                    differences.append(f"{name}.{key}: recorded {old.get(key)!r}, replayed {new.get(key)!r}")
+    return differences
+
+
+def replay(recording, profiler=None):
+    """Replay a loaded recording; returns the elapsed seconds.
+
+    Raises ReplayMismatch if the final saves (or the number of answers
+    consumed) differ from the recording.
+    """
+    header, final = recording["header"], recording["final"]
+    console = ScriptedConsole(recording["inputs"], mode="silent")
+    old_store = player_module._store
+    with tempfile.TemporaryDirectory() as tmp:
+        if header["store"] == "sqlite":
+            store = SqliteStore(os.path.join(tmp, "saves.db"))
+        else:
+            store = FileStore(os.path.join(tmp, "save.json"))
+        if header["saves"]:
+            store.write_batch(header["saves"])
+        set_store(store)
+        rngs.seed(header["seed"])
+        ran_out = False
+        start = time.perf_counter()
+        try:
+            if profiler:
+                profiler.enable()
+            try:
+                _run_game(console)
+            except ScriptExhausted:
+                ran_out = True
+            finally:
+                if profiler:
+                    profiler.disable()
+            flush_saves()
+            elapsed = time.perf_counter() - start
+            replayed = snapshot_store(store)
+        finally:
+            set_store(old_store)
+            store.close()
+
+    differences = _differences(final["saves"], replayed)
+    if ran_out and final["ended"] != "interrupted":
+        differences.insert(0, f"the game asked for more than the {len(recording['inputs'])} recorded answers")
+    elif console.answered < len(recording["inputs"]):
+        differences.insert(0, f"the game finished after {console.answered} of {len(recording['inputs'])} answers")
+    if differences:
+        raise ReplayMismatch(differences)
+    return elapsed
+
+
+def subsystem_report(profiler, top=12):
+    """Print cumulative time per menu entry point and self time per module."""
+    stats = pstats.Stats(profiler).stats
+    here = os.path.dirname(os.path.abspath(__file__))
+    total = sum(tt for _, _, tt, _, _ in stats.values()) or 1e-9
+
+    print(f"{'subsystem':<20}{'calls':>8}{'cumulative s':>14}")
+    for label, filename, func in SUBSYSTEMS:
+        calls = cumulative = 0
+        for (path, _, name), (_, nc, _, ct, _) in stats.items():
+            if name == func and os.path.basename(path) == filename:
+                calls += nc
+                cumulative += ct
+        print(f"{label:<20}{calls:>8}{cumulative:>14.4f}")
+
+    modules = {}
+    for (path, _, _), (_, nc, tt, _, _) in stats.items():
+        if path == "~":
+            module = "(builtins)"
+        elif os.path.dirname(os.path.abspath(path)) == here:
+            module = os.path.splitext(os.path.basename(path))[0]
+        else:
+            module = "(library)"
+        calls, self_time = modules.get(module, (0, 0.0))
+        modules[module] = (calls + nc, self_time + tt)
+    print(f"\n{'module':<20}{'calls':>10}{'self s':>10}{'share':>8}")
+    for module, (calls, self_time) in sorted(modules.items(), key=lambda m: -m[1][1])[:top]:
+        print(f"{module:<20}{calls:>10}{self_time:>10.4f}{100 * self_time / total:>7.1f}%")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Record and replay play sessions.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    rec = commands.add_parser("record", help="play on the terminal and save the session")
+    rec.add_argument("path")
+    rec.add_argument("--seed", help="session seed (default: random)")
+    play = commands.add_parser("play", help="replay sessions and check their final state")
+    play.add_argument("paths", nargs="+")
+    play.add_argument("--repeat", type=int, default=1, help="replays per recording (timings use the best)")
+    play.add_argument("--profile", action="store_true", help="print a per-subsystem timing report")
+    args = parser.parse_args(argv)
+
+    if args.command == "record":
+        record(args.path, args.seed)
+        print(f"Recorded to {args.path}")
+        return 0
+
+    profiler = cProfile.Profile() if args.profile else None
+    failures = 0
+    for path in args.paths:
+        recording = load_recording(path)
+        try:
+            best = min(replay(recording, profiler) for _ in range(args.repeat))
+        except ReplayMismatch as e:
+            failures += 1
+            print(f"FAIL {path}:")
+            for difference in e.differences:
+                print(f"  {difference}")
+            continue
+        print(f"ok   {path}: {len(recording['inputs'])} answers in {best * 1000:.1f} ms")
+    if profiler:
+        print()
+        subsystem_report(profiler)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
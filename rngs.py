@@ -0,0 +1,75 @@
+"""Named random streams derived from one session seed.
+
+Each subsystem draws from its own stream (stream("combat"), stream("loot"),
+...), so extra rolls in one don't shift the others and a session replays
+exactly from its seed. A stream's seed is a hash of the session seed and
+the stream name, which keeps streams uncorrelated across names and across
+sessions/processes with different seeds.
+
+The session seed comes from SNOWCALLER_SEED when set, otherwise from
+os.urandom; call seed() to start over with a known one. A server gives
+each session its own RngService with use().
+"""
+import os
+import random
+import hashlib
+from contextvars import ContextVar
+
+STREAMS = ("combat", "loot", "events", "npc", "world")
+
+
+def derive_seed(session_seed, name):
+    """64-bit seed for one stream, stable across runs and Python versions."""
+    digest = hashlib.sha256(f"{session_seed}:{name}".encode()).digest()
+    return int.from_bytes(digest[:8], "big")
+
+
+class RngService:
+    """Lazily created random.Random instances, one per stream name."""
+
+    def __init__(self, session_seed=None):
+        self.reseed(session_seed)
+
+    def reseed(self, session_seed=None):
+        if session_seed is None:
+            session_seed = int.from_bytes(os.urandom(8), "big")
+        self.seed = session_seed
+        self._streams = {}
+
+    def stream(self, name):
+        rng = self._streams.get(name)
+        if rng is None:
+            rng = self._streams[name] = random.Random(derive_seed(self.seed, name))
+        return rng
+
+    def getstate(self):
+        return {name: rng.getstate() for name, rng in self._streams.items()}
+
+    def setstate(self, state):
+        for name, rng_state in state.items():
+            self.stream(name).setstate(rng_state)
+
+
+_service = RngService(os.environ.get("SNOWCALLER_SEED"))
+_current = ContextVar("rng_service", default=_service)
+
+
+def use(service):
+    """Draw this context's (task's) streams from service."""
+    _current.set(service)
+
+
+def stream(name):
+    """The random.Random for a subsystem; look it up at use, as seed() replaces it."""
+    return _current.get().stream(name)
+
+
+def seed(session_seed=None):
+    """Restart every stream from session_seed (a fresh random one if None)."""
+    service = _current.get()
+    service.reseed(session_seed)
+    return service.seed
+
+
+def session_seed():
+    return _current.get().seed
@@ -0,0 +1,82 @@
+import random
+from content import load_content
+
+
+class AliasSampler:
+    """Weighted random choice in O(1) per draw (Vose's alias method).
+
+    Building the tables is O(n); after that each sample costs one random
+    number no matter how many entries there are or how large the weights are.
+    """
+
+    __slots__ = ("items", "_prob", "_alias")
+
+    def __init__(self, items, weights):
+        items = list(items)
+        weights = [float(w) for w in weights]
+        if len(items) != len(weights):
+            raise ValueError("items and weights must be the same length")
+        total = sum(weights)
+        if not items or total <= 0:
+            raise ValueError("AliasSampler needs at least one positive weight")
+
+        n = len(items)
+        scaled = [w * n / total for w in weights]
+        prob = [0.0] * n
+        alias = list(range(n))
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s = small.pop()
+            l = large.pop()
+            prob[s] = scaled[s]
+            alias[s] = l
+            scaled[l] = (scaled[l] + scaled[s]) - 1.0
+            if scaled[l] < 1.0:
+                small.append(l)
+            else:
+                large.append(l)
+        # Whatever is left is 1.0 up to rounding error
+        for i in large + small:
+            prob[i] = 1.0
+
+        self.items = items
+        self._prob = prob
+        self._alias = alias
+
+    def __len__(self):
+        return len(self.items)
+
+    def sample(self, rng=random):
+        u = rng.random() * len(self.items)
+        i = int(u)
+        if i >= len(self.items):  # Guard against u landing exactly on n
+            i -= 1
+        return self.items[i] if (u - i) < self._prob[i] else self.items[self._alias[i]]
+
+    def sample_many(self, k, rng=random):
+        return [self.sample(rng) for _ in range(k)]
+
+
+class SamplerCache:
+    """Alias samplers built from one content file, cached per key.
+
+    builder(data, key) returns (items, weights); an empty result caches None.
+    The cache is dropped whenever the content registry reloads the file.
+    """
+
+    def __init__(self, filename, builder):
+        self.filename = filename
+        self._builder = builder
+        self._data = None
+        self._samplers = {}
+
+    def get(self, key=None):
+        data = load_content(self.filename)
+        if data is not self._data:
+            self._data = data
+            self._samplers = {}
+        if key not in self._samplers:
+            items, weights = self._builder(data, key)
+            self._samplers[key] = AliasSampler(items, weights) if items and sum(weights) > 0 else None
+        return self._samplers[key]
@@ -0,0 +1,309 @@
+"""Compact binary save format.
+
+Layout: MAGIC, a format version byte and a flags byte, followed by the
+(optionally zlib-compressed) payload. The payload starts with a table of
+every distinct string in the save (item names, quest names, ...), each
+stored once and referenced by index afterwards, then the values of the
+schema's fields in order. Counts, lengths and integers are varints.
+
+Since version 2 the string table is one blob decoded in a single call, and
+dicts of ints (stats, inventory counts) have their own tag so runs of
+one-byte ids and values are read with a slice instead of per-byte loops.
+Loading is still slower than the C json parser; the format trades that
+for saves around a quarter of the size.
+
+Fields not in the schema are kept in a trailing "extra" dict so newer
+saves don't lose data when read by this version.
+"""
+import json
+import struct
+import zlib
+
+MAGIC = b"SNOWSAVE"
+FORMAT_VERSION = 2
+FLAG_ZLIB = 0x01
+
+# Top-level save fields in encoding order, per format version. Versions
+# only append fields, so older saves still decode with their own list.
+SCHEMAS = {
+    1: [
+        "name", "level", "exp", "max_exp", "stats", "hp", "max_hp", "mp", "max_mp",
+        "inventory", "equipment", "active_enemy_effect", "class_type", "pending_xp",
+        "stat_points", "gold", "shop_stock", "tavern_buff", "rage_turns", "skills",
+        "skill_effects", "active_quests", "completed_quests", "tavern_npcs",
+        "event_cooldowns", "has_room", "adventurer_rank", "adventurer_points",
+        "max_adventurer_points", "guild_member",
+    ],
+}
+SCHEMAS[2] = SCHEMAS[1] + ["triggered_events"]
+
+_NONE, _FALSE, _TRUE, _INT, _FLOAT, _STR, _LIST, _DICT, _MISSING, _STR_LIST, _INT_DICT = range(11)
+_DOUBLE = struct.Struct("<d")
+# Joins the version 2 string table: 0xFF never appears in UTF-8, and the
+# blob is decoded with surrogateescape, which turns that byte into this
+_TABLE_SEP = b"\xff"
+_TABLE_SEP_CHAR = _TABLE_SEP.decode("utf-8", "surrogateescape")
+
+
+class SaveFormatError(ValueError):
+    pass
+
+
+def _write_varint(out, value):
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _zigzag(value):
+    return (value << 1) if value >= 0 else ((-value << 1) - 1)
+
+
+def _read_varint(data, pos):
+    result = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return result, pos
+        shift += 7
+
+
+class _Encoder:
+    def __init__(self):
+        self.strings = {}
+        self.body = bytearray()
+
+    def intern(self, text):
+        idx = self.strings.get(text)
+        if idx is None:
+            idx = self.strings[text] = len(self.strings)
+        return idx
+
+    def value(self, value):
+        out = self.body
+        if value is None:
+            out.append(_NONE)
+        elif value is True:
+            out.append(_TRUE)
+        elif value is False:
+            out.append(_FALSE)
+        elif isinstance(value, int):
+            out.append(_INT)
+            _write_varint(out, _zigzag(value))
+        elif isinstance(value, float):
+            out.append(_FLOAT)
+            out += _DOUBLE.pack(value)
+        elif isinstance(value, str):
+            out.append(_STR)
+            _write_varint(out, self.intern(value))
+        elif isinstance(value, (list, tuple)) and value and all(type(item) is str for item in value):
+            # Inventories and quest lists: just the string ids, no per-item tags
+            out.append(_STR_LIST)
+            _write_varint(out, len(value))
+            for item in value:
+                _write_varint(out, self.intern(item))
+        elif isinstance(value, (list, tuple)):
+            out.append(_LIST)
+            _write_varint(out, len(value))
+            for item in value:
+                self.value(item)
+        elif isinstance(value, dict) and value and all(type(item) is int for item in value.values()):
+            # Stats and inventory counts: key ids and values alternate, no per-item tags
+            out.append(_INT_DICT)
+            _write_varint(out, len(value))
+            for key, item in value.items():
+                _write_varint(out, self.intern(str(key)))
+                _write_varint(out, _zigzag(item))
+        elif isinstance(value, dict):
+            out.append(_DICT)
+            _write_varint(out, len(value))
+            for key, item in value.items():
+                _write_varint(out, self.intern(str(key)))
+                self.value(item)
+        else:
+            raise SaveFormatError(f"Can't encode {type(value).__name__} in a save")
+
+
+class _Decoder:
+    def __init__(self, data, version):
+        self.data = data
+        self.pos = 0
+        count = self.varint()
+        if version >= 2:
+            length = self.varint()
+            blob = data[self.pos:self.pos + length]
+            self.pos += length
+            self.strings = blob.decode("utf-8", "surrogateescape").split(_TABLE_SEP_CHAR) if count else []
+            if len(self.strings) != count:
+                raise SaveFormatError("Corrupt string table")
+            return
+        self.strings = []
+        for _ in range(count):
+            length = self.varint()
+            self.strings.append(data[self.pos:self.pos + length].decode("utf-8"))
+            self.pos += length
+
+    def varint(self):
+        byte = self.data[self.pos]
+        if byte < 0x80:  # Almost every count and string id fits in one byte
+            self.pos += 1
+            return byte
+        value, self.pos = _read_varint(self.data, self.pos)
+        return value
+
+    def run(self, count):
+        """The next count varints as bytes if they are all one byte long, else None."""
+        run = self.data[self.pos:self.pos + count]
+        if len(run) == count and (not run or max(run) < 0x80):
+            self.pos += count
+            return run
+        return None
+
+    def value(self):
+        tag = self.data[self.pos]
+        self.pos += 1
+        if tag == _STR:
+            return self.strings[self.varint()]
+        if tag == _NONE or tag == _MISSING:
+            return None
+        if tag == _FALSE:
+            return False
+        if tag == _TRUE:
+            return True
+        if tag == _INT:
+            raw = self.varint()
+            return (raw >> 1) if not raw & 1 else -((raw + 1) >> 1)
+        if tag == _FLOAT:
+            (value,) = _DOUBLE.unpack_from(self.data, self.pos)
+            self.pos += _DOUBLE.size
+            return value
+        if tag == _STR_LIST:
+            strings = self.strings
+            count = self.varint()
+            ids = self.run(count)
+            if ids is not None:
+                return [strings[i] for i in ids]
+            return [strings[self.varint()] for _ in range(count)]
+        if tag == _INT_DICT:
+            strings = self.strings
+            count = self.varint()
+            pairs = self.run(2 * count)
+            if pairs is not None:
+                return {strings[key]: (raw >> 1) ^ -(raw & 1) for key, raw in zip(pairs[::2], pairs[1::2])}
+            result = {}
+            for _ in range(count):
+                key = strings[self.varint()]
+                raw = self.varint()
+                result[key] = (raw >> 1) ^ -(raw & 1)
+            return result
+        if tag == _LIST:
+            count = self.varint()
+            return [self.value() for _ in range(count)]
+        if tag == _DICT:
+            result = {}
+            for _ in range(self.varint()):
+                key = self.strings[self.varint()]
+                result[key] = self.value()
+            return result
+        raise SaveFormatError(f"Unknown value tag {tag} at offset {self.pos - 1}")
+
+
+def encode_save(save_data, compress=True):
+    """Encode a save dict (as built by player.get_save_data) to bytes."""
+    enc = _Encoder()
+    schema = SCHEMAS[FORMAT_VERSION]
+    for field in schema:
+        if field in save_data:
+            enc.value(save_data[field])
+        else:
+            enc.body.append(_MISSING)
+    enc.value({k: v for k, v in save_data.items() if k not in schema})
+
+    payload = bytearray()
+    _write_varint(payload, len(enc.strings))
+    table = _TABLE_SEP.join(text.encode("utf-8") for text in enc.strings)  # dicts keep insertion order == index order
+    _write_varint(payload, len(table))
+    payload += table
+    payload += enc.body
+
+    flags = 0
+    if compress:
+        payload = zlib.compress(bytes(payload), 6)
+        flags |= FLAG_ZLIB
+    return MAGIC + bytes([FORMAT_VERSION, flags]) + bytes(payload)
+
+
+def decode_save(data):
+    """Decode bytes produced by encode_save back into a save dict."""
+    if not is_binary_save(data):
+        raise SaveFormatError("Not a binary save")
+    version, flags = data[len(MAGIC)], data[len(MAGIC) + 1]
+    schema = SCHEMAS.get(version)
+    if schema is None:
+        raise SaveFormatError(f"Unsupported save format version {version}")
+    payload = data[len(MAGIC) + 2:]
+    if flags & FLAG_ZLIB:
+        payload = zlib.decompress(payload)
+
+    dec = _Decoder(payload, version)
+    save_data = {}
+    for field in schema:
+        if dec.data[dec.pos] == _MISSING:
+            dec.pos += 1
+            continue
+        save_data[field] = dec.value()
+    save_data.update(dec.value())
+    return save_data
+
+
+def is_binary_save(data):
+    return data[:len(MAGIC)] == MAGIC
+
+
+def load_save_bytes(data):
+    """Decode a save file's contents, binary or legacy JSON."""
+    if is_binary_save(data):
+        return decode_save(data)
+    return json.loads(data.decode("utf-8"))
+
+
+def benchmark(rounds=200):
+    """Compare size and speed of the binary codec against the JSON save."""
+    import time
+    from player import Player, get_save_data
+    from inventory import Inventory
+
+    player = Player("Benchmark", "1")
+    player.load_starting_data()
+    names = ["Minor Health Potion", "Gold Coin", "Wolf Fang", "Dragon Scale", "Iron Sword", "Lockpick"]
+    player.inventory = Inventory(names[i % len(names)] for i in range(600))
+    player.active_quests = [{"quest_name": f"Quest {i}", "stages": [{"type": "kill", "target_monster": "Goblin",
+                                                                     "kill_count": i, "item_count": 0}]}
+                            for i in range(5)]
+    player.completed_quests = [f"Old Quest {i}" for i in range(40)]
+    save_data = get_save_data(player)
+
+    codecs = {
+        "json (indent=4)": (lambda d: json.dumps(d, indent=4).encode("utf-8"), load_save_bytes),
+        "binary": (lambda d: encode_save(d, compress=False), load_save_bytes),
+        "binary+zlib": (encode_save, load_save_bytes),
+    }
+    print(f"{'format':<18}{'bytes':>10}{'save ms':>10}{'load ms':>10}")
+    for label, (encode, decode) in codecs.items():
+        start = time.perf_counter()
+        for _ in range(rounds):
+            raw = encode(save_data)
+        save_ms = (time.perf_counter() - start) * 1000 / rounds
+        start = time.perf_counter()
+        for _ in range(rounds):
+            decode(raw)
+        load_ms = (time.perf_counter() - start) * 1000 / rounds
+        print(f"{label:<18}{len(raw):>10}{save_ms:>10.3f}{load_ms:>10.3f}")
+
+
+if __name__ == "__main__":
+    benchmark()
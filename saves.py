@@ -0,0 +1,169 @@
+import os
+import json
+import time
+import atexit
+import threading
+from savecodec import encode_save
+from renderer import write
+
+# Seconds to wait after the first save request before writing, so the
+# several saves triggered by one fight collapse into a single write
+SAVE_DELAY = 1.0
+
+# "json" (readable, the default) or "binary" (savecodec, zlib-compressed).
+# Loading auto-detects either format, so switching is always safe.
+SAVE_FORMAT = os.environ.get("SNOWCALLER_SAVE_FORMAT", "json")
+
+
+def encode_snapshot(snapshot, save_format=None):
+    if (save_format or SAVE_FORMAT) == "binary":
+        return encode_save(snapshot)
+    return json.dumps(snapshot, indent=4)
+
+
+def write_atomic(path, data):
+    """Write data (str or bytes) to path via a temp file + rename."""
+    tmp_path = path + ".tmp"
+    mode = "wb" if isinstance(data, bytes) else "w"
+    with open(tmp_path, mode) as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class SaveManager:
+    """Debounced write-behind saving on a background writer thread.
+
+    request() only stores a snapshot; the writer thread hands the newest
+    snapshot per character to the store once SAVE_DELAY has passed since
+    the first pending request, so one batch can cover many characters.
+    Snapshots equal to what was last written are skipped. flush() writes
+    anything pending right away; compact() (registered to run at exit)
+    also lets the store fold its journal into a full snapshot. close()
+    compacts and takes the manager off the exit list, for when the game
+    switches to another store.
+    """
+
+    def __init__(self, store, delay=SAVE_DELAY):
+        self.store = store
+        self.delay = delay
+        self.requests = 0
+        self.writes = 0
+        self.batches = 0
+        self.skipped = 0
+        self._pending = {}  # character name -> newest snapshot
+        self._deadline = None
+        self._writing = False
+        self._compacting = False
+        self._flush_now = False
+        self._last_written = {}
+        self._cond = threading.Condition()
+        self._thread = None
+        atexit.register(self.compact)
+
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="save-writer", daemon=True)
+            self._thread.start()
+
+    def request(self, snapshot):
+        """Queue a snapshot (a dict the caller no longer mutates) for writing."""
+        with self._cond:
+            if not self._pending:
+                self._deadline = time.monotonic() + self.delay
+            self._pending[snapshot.get("name")] = snapshot
+            self.requests += 1
+            self._ensure_thread()
+            self._cond.notify_all()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while True:
+                    if self._pending and not self._compacting:
+                        remaining = self._deadline - time.monotonic()
+                        if self._flush_now or remaining <= 0:
+                            break
+                        self._cond.wait(remaining)
+                    else:
+                        self._cond.wait()
+                batch = self._pending
+                self._pending = {}
+                self._writing = True
+            try:
+                self._write(batch)
+            finally:
+                with self._cond:
+                    self._writing = False
+                    if not self._pending:
+                        self._flush_now = False
+                    self._cond.notify_all()
+
+    def _write(self, batch):
+        changed = {}
+        with self._cond:  # discard() may drop entries from _last_written meanwhile
+            for name, snapshot in batch.items():
+                if snapshot == self._last_written.get(name):
+                    self.skipped += 1
+                else:
+                    changed[name] = snapshot
+        if not changed:
+            return
+        try:
+            self.store.write_batch(changed)
+            with self._cond:
+                self._last_written.update(changed)
+                self.writes += len(changed)
+                self.batches += 1
+        except Exception as e:
+            write(f"Failed to save game: {e}")
+
+    def flush(self):
+        """Write any pending snapshots now and wait until they are stored."""
+        with self._cond:
+            if not self._pending and not self._writing:
+                return
+            self._flush_now = True
+            self._ensure_thread()
+            self._cond.notify_all()
+            while self._pending or self._writing:
+                self._cond.wait()
+
+    def compact(self):
+        """Flush, then let the store compact itself (clean exit)."""
+        self.flush()
+        with self._cond:
+            while self._writing:
+                self._cond.wait()
+            self._compacting = True  # Keep the writer thread off the store meanwhile
+        try:
+            self.store.compact()
+        except Exception as e:
+            write(f"Failed to compact saves: {e}")
+        finally:
+            with self._cond:
+                self._compacting = False
+                self._cond.notify_all()
+
+    def close(self):
+        """Compact and stop compacting at exit; the manager isn't used afterwards."""
+        atexit.unregister(self.compact)
+        self.compact()
+
+    def discard(self, name=None):
+        """Drop pending snapshots (one character's, or all) and wait for an in-flight write."""
+        with self._cond:
+            if name is None:
+                self._pending = {}
+                self._last_written = {}
+            else:
+                self._pending.pop(name, None)
+                self._last_written.pop(name, None)
+            while self._writing:
+                self._cond.wait()
+
+    def stats(self):
+        with self._cond:
+            return {"store": type(self.store).__name__, "requests": self.requests, "writes": self.writes,
+                    "batches": self.batches, "skipped": self.skipped, "pending": len(self._pending)}
@@ -0,0 +1,92 @@
+"""Host many game sessions over TCP.
+
+Each connection runs game.main as an asyncio task with its own
+NetworkConsole and RNG streams; the menus await read_line(), so a session
+waiting for its player costs no CPU and no thread. Any telnet client or `nc` can connect; telnet option
+negotiation is ignored. Saves go to a shared SQLite store, one row per
+character. Players log into their characters with the password chosen at
+creation, and a character can only be open in one session at a time.
+The debug commands (set.gold, start.event, ...) are always off.
+
+    python server.py --port 4000
+    telnet localhost 4000
+"""
+import os
+import sys
+import asyncio
+import argparse
+import traceback
+
+import rngs
+from console import NetworkConsole
+from player import set_store, flush_saves, release_characters
+from storage import SqliteStore
+from utils import get_base_path
+
+class GameServer:
+    def __init__(self, max_sessions=500, idle_timeout=1800):
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self.sessions = set()
+
+    async def handle(self, reader, writer):
+        if len(self.sessions) >= self.max_sessions:
+            writer.write(b"The server is full, try again later.\r\n")
+        else:
+            console = NetworkConsole(reader, writer, self.idle_timeout)
+            self.sessions.add(console)
+            try:
+                await self.run_session(console)
+            finally:
+                self.sessions.discard(console)
+        try:
+            await writer.drain()
+            writer.close()
+            await writer.wait_closed()
+        except ConnectionError:
+            pass
+
+    async def run_session(self, console):
+        import game
+        rngs.use(rngs.RngService())  # Only affects this connection's task
+        try:
+            await game.main(console=console, check_updates=False, login=True, commands_enabled=False)
+        except (EOFError, ConnectionError):
+            pass  # Disconnected, idle, or sent an overlong line
+        except Exception:
+            traceback.print_exc()
+            console.write("\nThe session hit an error and has to close. Your last save is kept.")
+        finally:
+            release_characters(console)
+        console.flush()
+
+    async def serve(self, host, port):
+        server = await asyncio.start_server(self.handle, host, port, limit=4096)
+        addresses = ", ".join(str(sock.getsockname()) for sock in server.sockets)
+        print(f"Snowcaller server listening on {addresses}")
+        async with server:
+            await server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve Snowcaller sessions over TCP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=4000)
+    parser.add_argument("--db", default=os.path.join(get_base_path(), "saves.db"), help="SQLite save database")
+    parser.add_argument("--max-sessions", type=int, default=500)
+    parser.add_argument("--idle-timeout", type=float, default=1800, help="seconds before an idle session is closed")
+    args = parser.parse_args(argv)
+
+    set_store(SqliteStore(args.db))
+    server = GameServer(args.max_sessions, args.idle_timeout)
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        flush_saves()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,282 @@
+"""Monte Carlo balance simulator.
+
+Plays complete adventures (the Short Trip / Adventure / Dungeon loop from
+game.main) headlessly on combat_engine, for each class and level band,
+spread over a process pool. Every batch gets its own seed derived from
+--seed, so a run is reproducible whatever the worker count.
+
+The simulated player always fights (bosses included), drinks a healing
+potion when low, casts its strongest affordable damage skill, and heads
+back to town when HP drops below --retreat. Random events are counted
+but not played, since they are interactive.
+
+    python simulate.py -n 5000 --levels 1-5,6-10 --type dungeon
+"""
+import os
+import sys
+import time
+import argparse
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+import combat_engine as engine
+from content import registry, index
+from loot import loot_tables, ADVENTURE_TYPES
+from player import Player
+from rngs import RngService
+import renderer
+
+CLASS_NAMES = {"1": "Warrior", "2": "Mage", "3": "Rogue"}
+# Stat each class puts its level-up points into
+MAIN_STAT = {"1": "S", "2": "I", "3": "A"}
+
+
+def _init_worker():
+    renderer.set_mode("silent")
+    registry.revalidate = False  # Content doesn't change during a run
+
+
+def _allocate(player):
+    player.stats[MAIN_STAT.get(player.class_type, "S")] += player.stat_points
+    player.stat_points = 0
+
+
+def _level_up(player):
+    # With an allocate callback Player.level_up never awaits, so run it without a loop
+    try:
+        player.level_up(allocate=_allocate).send(None)
+    except StopIteration:
+        return
+    raise RuntimeError("Player.level_up waited for input")
+
+
+def make_player(class_type, level):
+    player = Player(f"Sim{class_type}", class_type)
+    player.load_starting_data()
+    while player.level < level:
+        player.exp = player.max_exp
+        _level_up(player)
+    return player
+
+
+def _skill_damage(skill):
+    effects = skill["effects"] if "effects" in skill else [
+        {"type": skill.get("effect"), "base_dmg": skill.get("base_dmg", 0)}]
+    return sum(e["base_dmg"] for e in effects if e["type"] in ("direct_damage", "damage_over_time"))
+
+
+_skill_plans = {}
+
+
+def _skill_plan(skills):
+    """Damaging skills as (mp_cost, name), strongest first; cached per skill list."""
+    key = tuple(skills)
+    plan = _skill_plans.get(key)
+    if plan is None:
+        ranked = []
+        for name in skills:
+            skill = index.skill(name)
+            if skill and _skill_damage(skill) > 0:
+                ranked.append((_skill_damage(skill), skill["mp_cost"], name))
+        ranked.sort(key=lambda r: -r[0])  # Stable: ties keep skill order
+        plan = _skill_plans[key] = [(mp_cost, name) for _, mp_cost, name in ranked]
+    return plan
+
+
+def _choose_action(state, player, heal_below=0.35):
+    """Return (action, argument) for the simulated player's turn."""
+    if player.hp < player.max_hp * heal_below:
+        for item in player.inventory.names():
+            consumable = index.consumable(item)
+            if (consumable and consumable["type"] == "HP" and consumable["duration"] == 0 and
+                    consumable["level_range"]["min"] <= player.level <= consumable["level_range"]["max"]):
+                return engine.use_item, item
+    if not state.player_status.get("curse", 0) > 0:
+        for mp_cost, name in _skill_plan(player.skills):
+            if mp_cost <= player.mp:
+                return engine.use_skill, name
+    return engine.attack, None
+
+
+def fight(player, rng, boss_fight=False, monster_name=None, max_rounds=500):
+    state, _ = engine.start_combat(player, boss_fight, monster_name, rng=rng)
+    rounds = 0
+    while not state.over and rounds < max_rounds:
+        action, arg = _choose_action(state, player)
+        if arg is None:
+            action(state, player)
+        else:
+            action(state, player, arg)
+        rounds += 1
+    while state.result == "victory" and player.exp >= player.max_exp and player.level < 25:
+        _level_up(player)
+    return state
+
+
+def run_adventure(player, adventure_type, streams, stats, retreat=0.3):
+    """One adventure, mirroring the encounter loop in game.main (and its RNG streams)."""
+    rng, loot_rng, combat_rng = streams.stream("world"), streams.stream("loot"), streams.stream("combat")
+    spec = ADVENTURE_TYPES[adventure_type]
+    max_encounters = rng.randint(*spec["encounters"])
+    encounter_pool = engine.get_encounter_sampler(player.level)
+    boss_fight = False
+    encounter_count = 0
+    stats["adventures"] += 1
+
+    while True:
+        if encounter_count >= 8 and not boss_fight and rng.random() < 0.25:
+            boss_fight = True
+            boss = engine.get_boss_sampler().sample(rng)
+            state = fight(player, combat_rng, True, boss["name"])
+            stats["boss_fights"] += 1
+            if state.result == "defeat":
+                stats["deaths"] += 1
+                return
+            if state.result == "victory":
+                stats["boss_wins"] += 1
+                stats["xp"] += state.xp
+                stats["gold"] += state.gold
+            return
+
+        encounter_count += 1
+        if rng.randint(1, 100) <= spec["event_chance"]:
+            stats["events"] += 1
+        else:
+            monster = encounter_pool.sample(rng)
+            state = fight(player, combat_rng, False, monster["name"])
+            stats["fights"] += 1
+            if state.result == "defeat":
+                stats["deaths"] += 1
+                return
+            if state.result == "victory":
+                stats["wins"] += 1
+                stats["xp"] += state.xp
+                stats["gold"] += state.gold
+                drop_table = loot_tables.get(player.level, boss_fight, adventure_type)
+                if drop_table and loot_rng.random() < 0.25:
+                    drop = drop_table.sample(loot_rng)
+                    player.inventory.append(drop)
+                    stats["drops"][drop] += 1
+                if loot_rng.random() < 0.15 * (1 + spec["drop_rate_modifier"]):
+                    stats["treasure"] += 1
+            if player.hp < player.max_hp * retreat:
+                stats["retreats"] += 1
+                return
+
+        if encounter_count >= max_encounters and not (encounter_count >= 8 and not boss_fight):
+            return
+
+
+def _new_stats():
+    stats = Counter()
+    stats["drops"] = Counter()
+    return stats
+
+
+def run_batch(task):
+    """Worker entry point: run task["count"] adventures, return summed stats."""
+    streams = RngService(task["seed"])
+    stats = _new_stats()
+    lo, hi = task["levels"]
+    for _ in range(task["count"]):
+        player = make_player(task["class_type"], streams.stream("world").randint(lo, hi))
+        run_adventure(player, task["adventure_type"], streams, stats, task["retreat"])
+    return task["key"], stats
+
+
+def _parse_levels(text):
+    bands = []
+    for part in text.split(","):
+        lo, _, hi = part.partition("-")
+        bands.append((int(lo), int(hi or lo)))
+    return bands
+
+
+def build_tasks(adventures, classes, bands, types, seed, chunk, retreat):
+    tasks = []
+    for class_type in classes:
+        for band in bands:
+            for adventure_type in types:
+                key = (class_type, band, adventure_type)
+                for start in range(0, adventures, chunk):
+                    tasks.append({
+                        "key": key, "class_type": class_type, "levels": band,
+                        "adventure_type": adventure_type, "count": min(chunk, adventures - start),
+                        "retreat": retreat,
+                        # Every task's RNG streams are hashed from this, so tasks are independent
+                        "seed": f"{seed}:{class_type}:{band[0]}-{band[1]}:{adventure_type}:{start}",
+                    })
+    return tasks
+
+
+def run(tasks, workers):
+    results = {}
+    if workers <= 1:
+        _init_worker()
+        outputs = map(run_batch, tasks)
+    else:
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker)
+        outputs = executor.map(run_batch, tasks, chunksize=max(1, len(tasks) // (workers * 4)))
+    for key, stats in outputs:
+        total = results.setdefault(key, _new_stats())
+        drops = stats.pop("drops")
+        total["drops"].update(drops)
+        total.update(stats)
+    if workers > 1:
+        executor.shutdown()
+    return results
+
+
+def report(results, top=10):
+    header = f"{'class':<8}{'levels':<8}{'type':<10}{'runs':>7}{'deaths':>8}{'death%':>8}{'fights':>8}" \
+             f"{'win%':>7}{'xp/enc':>8}{'gold/enc':>9}{'boss w/f':>10}{'retreat':>8}"
+    print(header)
+    print("-" * len(header))
+    all_drops = Counter()
+    for (class_type, band, adventure_type), s in sorted(results.items()):
+        fights = s["fights"] + s["boss_fights"]
+        encounters = fights + s["events"]
+        wins = s["wins"] + s["boss_wins"]
+        boss = f"{s['boss_wins']}/{s['boss_fights']}"
+        print(f"{CLASS_NAMES.get(class_type, class_type):<8}{f'{band[0]}-{band[1]}':<8}{adventure_type:<10}"
+              f"{s['adventures']:>7}{s['deaths']:>8}{100 * s['deaths'] / max(1, s['adventures']):>7.1f}%"
+              f"{fights:>8}{100 * wins / max(1, fights):>6.1f}%"
+              f"{s['xp'] / max(1, encounters):>8.1f}{s['gold'] / max(1, encounters):>9.1f}"
+              f"{boss:>10}"
+              f"{s['retreats']:>8}")
+        all_drops.update(s["drops"])
+    total_drops = sum(all_drops.values())
+    if total_drops:
+        print(f"\nTop drops ({total_drops} total):")
+        for name, count in all_drops.most_common(top):
+            print(f"  {name:<30}{count:>8}{100 * count / total_drops:>8.2f}%")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulate adventures to check game balance.")
+    parser.add_argument("-n", "--adventures", type=int, default=1000,
+                        help="adventures per class/level band/adventure type (default 1000)")
+    parser.add_argument("--classes", default="1,2,3", help="class types to run (1=Warrior, 2=Mage, 3=Rogue)")
+    parser.add_argument("--levels", default="1-5,6-10,11-15,16-20", help="starting level bands, e.g. 1-5,6-10")
+    parser.add_argument("--type", default="all", choices=["all"] + list(ADVENTURE_TYPES),
+                        help="adventure type (default: all)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--seed", default="1")
+    parser.add_argument("--chunk", type=int, default=250, help="adventures per worker task")
+    parser.add_argument("--retreat", type=float, default=0.3, help="return to town below this HP fraction")
+    parser.add_argument("--top", type=int, default=10, help="how many drops to list")
+    args = parser.parse_args(argv)
+
+    types = list(ADVENTURE_TYPES) if args.type == "all" else [args.type]
+    tasks = build_tasks(args.adventures, args.classes.split(","), _parse_levels(args.levels), types,
+                        args.seed, args.chunk, args.retreat)
+    start = time.perf_counter()
+    results = run(tasks, args.workers)
+    elapsed = time.perf_counter() - start
+    report(results, args.top)
+    runs = sum(s["adventures"] for s in results.values())
+    print(f"\n{runs} adventures in {elapsed:.2f}s ({runs / elapsed:.0f}/s, {args.workers} workers)")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
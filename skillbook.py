@@ -0,0 +1,117 @@
+"""skills.json compiled into Skill and SkillEffect objects.
+
+Each skill is parsed once, whichever of the two formats it uses (a single
+"effect" or a list of "effects"), and combat_engine dispatches on
+SkillEffect.type through tables instead of re-reading the raw dicts every
+turn. Skill books (a monster's or a class's skills, in skills.json order)
+are built once per monster/class. Everything is rebuilt when the content
+registry reloads skills.json.
+"""
+from content import load_content
+
+# Share of the effect's stat added to base_dmg when a skill is cast
+SCALING = {
+    "damage_bonus": 0.5,
+    "direct_damage": 1.0,
+    "heal": 0.5,
+    "heal_over_time": 0.5,
+    "damage_over_time": 0.2,
+    "armor_bonus": 0.5,
+    "dodge_bonus": 0.5,
+}
+
+
+class SkillEffect:
+    __slots__ = ("type", "base_dmg", "stat", "duration", "scaling")
+
+    def __init__(self, type, base_dmg=0, stat="none", duration=0):
+        self.type = type
+        self.base_dmg = base_dmg
+        self.stat = stat
+        self.duration = duration
+        self.scaling = SCALING.get(type)  # None: doesn't scale when cast
+
+    def scaled(self, stats, factor, whole=True):
+        """base_dmg plus factor x the effect's stat (truncated unless whole=False)."""
+        if self.stat == "none":
+            return self.base_dmg
+        bonus = stats[self.stat] * factor
+        return self.base_dmg + (int(bonus) if whole else bonus)
+
+    def __repr__(self):
+        return f"SkillEffect({self.type!r}, {self.base_dmg!r}, {self.stat!r}, {self.duration!r})"
+
+
+class Skill:
+    __slots__ = ("name", "class_type", "level_req", "mp_cost", "effects")
+
+    def __init__(self, record):
+        self.name = record["name"]
+        self.class_type = record.get("class_type")
+        self.level_req = record.get("level_req", 1)
+        self.mp_cost = record.get("mp_cost", 0)
+        if "effects" in record:
+            self.effects = tuple(SkillEffect(e["type"], e.get("base_dmg", 0), e.get("stat", "none"), e.get("duration", 0))
+                                 for e in record["effects"])
+        else:
+            self.effects = (SkillEffect(record.get("effect", "direct_damage"), record.get("base_dmg", 0),
+                                        record.get("stat", "none"), record.get("duration", 0)),)
+
+    @property
+    def effect(self):
+        """The first (for monster skills, only) effect."""
+        return self.effects[0]
+
+    def find(self, effect_type):
+        return next((e for e in self.effects if e.type == effect_type), None)
+
+    def __repr__(self):
+        return f"Skill({self.name!r}, {self.class_type!r})"
+
+
+class SkillBook:
+    """Compiled skills by name and by class, plus cached per-monster books."""
+
+    def __init__(self, filename="skills.json"):
+        self.filename = filename
+        self._data = None
+
+    def _compiled(self):
+        data = load_content(self.filename)
+        if data is not self._data:
+            records = data.get("skills", []) if isinstance(data, dict) else []
+            skills = [Skill(record) for record in records]
+            by_name, by_class_name, by_class = {}, {}, {}
+            for skill in skills:
+                by_name.setdefault(skill.name, skill)
+                by_class_name.setdefault((skill.class_type, skill.name), skill)
+                by_class.setdefault(skill.class_type, []).append(skill)
+            self._by_name = by_name
+            self._by_class_name = by_class_name
+            self._by_class = {class_type: tuple(book) for class_type, book in by_class.items()}
+            self._monster_books = {}
+            self._data = data
+        return self
+
+    def skill(self, name, class_type=None):
+        book = self._compiled()
+        if class_type is None:
+            return book._by_name.get(name)
+        return book._by_class_name.get((class_type, name))
+
+    def for_class(self, class_type):
+        """A class's ("1"-"3" or "monster") skills in skills.json order."""
+        return self._compiled()._by_class.get(class_type, ())
+
+    def for_monster(self, skill_names):
+        """The monster skills named in a monster's "skills" list, in skills.json order."""
+        book = self._compiled()
+        key = tuple(skill_names or ())
+        skills = book._monster_books.get(key)
+        if skills is None:
+            skills = book._monster_books[key] = tuple(s for s in book.for_class("monster") if s.name in key)
+        return skills
+
+
+# Shared book used by the combat engine
+skillbook = SkillBook()
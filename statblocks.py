@@ -0,0 +1,76 @@
+"""Monster stat blocks, precomputed per (monster, level, boss).
+
+A fight used to rebuild the monster's numbers from its monster.json record
+every time: the level scale, MP, the damage range with the boss multiplier,
+and dodge and initiative from its stats. A StatBlock holds those once per
+(name, level, boss flag), so starting a fight picks a block and rolls HP.
+Blocks are dropped whenever the content registry reloads a file.
+"""
+from content import index, registry
+
+
+class StatBlock:
+    """A monster's combat numbers at one level; treat as read-only."""
+
+    __slots__ = ("name", "level", "is_boss", "level_scale", "hp_min", "hp_max", "max_mp",
+                 "min_dmg", "max_dmg", "armor", "dodge", "initiative", "source")
+
+    def __init__(self, monster, level, boss_fight=False):
+        stats = monster["stats"]
+        self.source = monster
+        self.level = level
+        self.is_boss = monster["rare"] or boss_fight
+        self.level_scale = level_scale = 1 + (level - 1) * 0.1 if monster["rare"] else 1 + (level - 1) * 0.05
+        self.hp_min = monster["hp_range"]["min"]
+        self.hp_max = monster["hp_range"]["max"]
+        self.max_mp = 2 * stats["W"] * level_scale
+        self.min_dmg = monster["damage_range"]["min"] * level_scale
+        self.max_dmg = monster["damage_range"]["max"] * level_scale
+        if self.is_boss:
+            self.min_dmg *= 1.2
+            self.max_dmg *= 1.2
+            self.name = "Boss " + monster["name"] if not monster["rare"] else monster["name"]
+        else:
+            self.name = monster["name"]
+        self.armor = monster["armor_value"]
+        self.dodge = stats["A"] * 0.02
+        self.initiative = (stats["A"] * 0.5 + stats["L"] * 0.5) / 100
+
+    def roll_hp(self, rng):
+        hp = rng.uniform(self.hp_min, self.hp_max) * self.level_scale
+        return hp * 1.5 if self.is_boss else hp
+
+    def __repr__(self):
+        return f"StatBlock({self.name!r}, level={self.level})"
+
+
+class StatBlocks:
+    """Cached StatBlocks for the monsters in monster.json."""
+
+    def __init__(self):
+        self._blocks = {}
+        self._content_version = registry.version
+
+    def block(self, monster, level, boss_fight=False):
+        """The block for a monster record (or a copy of one) at level.
+
+        Records that don't match monster.json (edited copies, test monsters)
+        get a fresh block that isn't cached.
+        """
+        key = (monster["name"], level, bool(boss_fight))
+        if self._content_version == registry.version:
+            block = self._blocks.get(key)
+            if block is not None and (block.source is monster or block.source == monster):
+                return block
+        record = index.monster(monster["name"])  # May load or reload monster.json
+        if self._content_version != registry.version:
+            self._blocks = {}
+            self._content_version = registry.version
+        if record is None or record != monster:
+            return StatBlock(monster, level, boss_fight)
+        block = self._blocks[key] = StatBlock(record, level, boss_fight)
+        return block
+
+
+# Shared cache used by the combat engine
+stat_blocks = StatBlocks()
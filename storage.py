@@ -0,0 +1,196 @@
+"""Save storage backends.
+
+A store persists save dicts (see player.get_save_data) keyed by character
+name. SaveManager hands it batches from its writer thread; load/delete
+and listing are called from the game thread.
+
+FileStore is the original single-character save.json (+ journal) and is
+the default. SqliteStore keeps one row per character in a WAL-mode
+SQLite database for hosting many players from one process, plus a salted
+password hash per character so server players can only load their own.
+"""
+import os
+import copy
+import hmac
+import time
+import hashlib
+import sqlite3
+import threading
+from saves import write_atomic, encode_snapshot
+from savecodec import encode_save, load_save_bytes
+from journal import Journal, COMPACT_EVERY, diff_snapshots, read_records, replay
+
+
+class FileStore:
+    """One character in save.json, with changes journaled between snapshots."""
+
+    def __init__(self, path, save_format=None, use_journal=True):
+        self.path = path
+        self.save_format = save_format
+        self.journal = Journal(journal_path(path)) if use_journal else None
+        self.snapshots = 0
+        self._base = None  # Save dict the snapshot + journal currently add up to
+
+    def _read_raw(self):
+        with open(self.path, "rb") as f:
+            return load_save_bytes(f.read())
+
+    def _write_snapshot(self, snapshot):
+        data = snapshot
+        if self.journal is not None:
+            data = dict(snapshot, journal_seq=self.journal.seq)
+        write_atomic(self.path, encode_snapshot(data, self.save_format))
+        if self.journal is not None:
+            self.journal.truncate()
+        self.snapshots += 1
+
+    def write_batch(self, snapshots):
+        # Only one character fits in save.json; the newest request wins
+        snapshot = list(snapshots.values())[-1]
+        journal = self.journal
+        if journal is None or self._base is None or journal.records >= COMPACT_EVERY:
+            self._write_snapshot(snapshot)
+        else:
+            journal.append(diff_snapshots(self._base, snapshot))
+        self._base = snapshot
+
+    def compact(self):
+        """Fold the journal into a fresh snapshot (clean exit)."""
+        if self.journal is not None and self.journal.records and self._base is not None:
+            self._write_snapshot(self._base)
+
+    def load(self, name=None):
+        if not os.path.exists(self.path):
+            return None
+        save_data = self._read_raw()
+        if self.journal is not None:
+            # The journal is gone after a compaction; keep numbering past what the snapshot holds
+            self.journal.seq = max(self.journal.seq, save_data.get("journal_seq", 0))
+            # Changes saved after the last full snapshot live in the journal
+            records, _ = read_records(self.journal.path)
+            save_data, applied = replay(save_data, records)
+            self.journal.records = applied
+        else:
+            save_data.pop("journal_seq", None)
+        if name is not None and save_data.get("name") != name:
+            return None
+        self._base = copy.deepcopy(save_data)  # The caller may mutate save_data
+        return save_data
+
+    def delete(self, name=None):
+        if self.journal is not None:
+            self.journal.truncate()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        self._base = None
+
+    def exists(self, name=None):
+        if not os.path.exists(self.path):
+            return False
+        return name is None or self._read_raw().get("name") == name
+
+    def list_characters(self):
+        if not os.path.exists(self.path):
+            return []
+        save_data = self._read_raw()
+        return [{"name": save_data.get("name"), "class_type": save_data.get("class_type"),
+                 "level": save_data.get("level")}]
+
+    def close(self):
+        pass
+
+
+def journal_path(save_path):
+    return os.path.splitext(save_path)[0] + ".journal"
+
+
+def hash_password(password, salt):
+    return hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, 100_000)
+
+
+class SqliteStore:
+    """Many characters in one SQLite database, one row per character name."""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        # Used from both the game thread and the save writer thread
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS characters ("
+            " name TEXT PRIMARY KEY,"
+            " class_type TEXT,"
+            " level INTEGER,"
+            " updated REAL,"
+            " data BLOB NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS characters_updated ON characters (updated)")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS accounts ("
+            " name TEXT PRIMARY KEY,"
+            " salt BLOB NOT NULL,"
+            " hash BLOB NOT NULL)"
+        )
+        self._conn.commit()
+
+    def write_batch(self, snapshots):
+        """Write every pending character in a single transaction."""
+        now = time.time()
+        rows = [(name, snap.get("class_type"), snap.get("level"), now, encode_save(snap))
+                for name, snap in snapshots.items()]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO characters (name, class_type, level, updated, data) VALUES (?, ?, ?, ?, ?)",
+                rows)
+
+    def compact(self):
+        with self._lock:
+            self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def load(self, name=None):
+        """Load a character by name, or the most recently saved one."""
+        with self._lock:
+            if name is None:
+                row = self._conn.execute("SELECT data FROM characters ORDER BY updated DESC LIMIT 1").fetchone()
+            else:
+                row = self._conn.execute("SELECT data FROM characters WHERE name = ?", (name,)).fetchone()
+        return load_save_bytes(bytes(row[0])) if row else None
+
+    def delete(self, name=None):
+        if name is None:
+            return
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM characters WHERE name = ?", (name,))
+            self._conn.execute("DELETE FROM accounts WHERE name = ?", (name,))
+
+    def set_password(self, name, password):
+        salt = os.urandom(16)
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO accounts (name, salt, hash) VALUES (?, ?, ?)",
+                               (name, salt, hash_password(password, salt)))
+
+    def check_password(self, name, password):
+        """True if name has a password and this is it (characters without one can't be logged into)."""
+        with self._lock:
+            row = self._conn.execute("SELECT salt, hash FROM accounts WHERE name = ?", (name,)).fetchone()
+        return row is not None and hmac.compare_digest(hash_password(password, bytes(row[0])), bytes(row[1]))
+
+    def exists(self, name=None):
+        with self._lock:
+            if name is None:
+                row = self._conn.execute("SELECT 1 FROM characters LIMIT 1").fetchone()
+            else:
+                row = self._conn.execute("SELECT 1 FROM characters WHERE name = ?", (name,)).fetchone()
+        return row is not None
+
+    def list_characters(self):
+        """Name, class and level of every character, for character select."""
+        with self._lock:
+            rows = self._conn.execute("SELECT name, class_type, level FROM characters ORDER BY name").fetchall()
+        return [{"name": name, "class_type": class_type, "level": level} for name, class_type, level in rows]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
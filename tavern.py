@@ -1,10 +1,11 @@
-import random
 import time
-import json
 import os
-from utils import load_json
+from utils import get_resource_path
+from content import load_content, content_exists, index
 from player import save_game  # Import to save after room purchase
 from colorama import init, Fore, Back, Style
+from renderer import write, write_menu, read_line
+from rngs import stream
 
 # Initialize colorama
 init()
@@ -37,26 +38,26 @@ def print_colored_text(text_data):
         if "text" in text_data and "text_color" in text_data:
             color = text_data["text_color"].lower()
             color_code = COLOR_MAP.get(color, WHITE)
-            print(f"{color_code}{text_data['text']}{RESET}")
+            write(f"{color_code}{text_data['text']}{RESET}")
         # Handle response with response_color
         elif "response" in text_data and "response_color" in text_data:
             color = text_data["response_color"].lower()
             color_code = COLOR_MAP.get(color, WHITE)
-            print(f"{color_code}{text_data['response']}{RESET}")
+            write(f"{color_code}{text_data['response']}{RESET}")
         # Handle flavor text
         elif "text" in text_data and "text_color" in text_data:
             color = text_data["text_color"].lower()
             color_code = COLOR_MAP.get(color, WHITE)
-            print(f"{color_code}{text_data['text']}{RESET}")
+            write(f"{color_code}{text_data['text']}{RESET}")
         # Fallback for simple text with color
         elif "text" in text_data and "color" in text_data:
             color = text_data["color"].lower()
             color_code = COLOR_MAP.get(color, WHITE)
-            print(f"{color_code}{text_data['text']}{RESET}")
+            write(f"{color_code}{text_data['text']}{RESET}")
         else:
-            print(text_data)
+            write(text_data)
     else:
-        print(text_data)
+        write(text_data)
 
 class ReturnToMainMenu(Exception):
     pass
@@ -70,13 +71,12 @@ class Tavern:
             self.player.tavern_npcs = []
         # Load special NPCs from NPC folder
         self.npc_data = {}
-        npc_folder = "NPC"
+        npc_folder = get_resource_path("NPC")
         if os.path.exists(npc_folder):
             for filename in os.listdir(npc_folder):
                 if filename.endswith(".json"):
-                    with open(os.path.join(npc_folder, filename), "r") as f:
-                        npc = json.load(f)
-        self.npc_spawn_data = load_json("npcs.json")
+                    npc = load_content(filename, subfolder="NPC")
+        self.npc_spawn_data = load_content("npcs.json")
         
     def roll_tavern_npcs(self):  # New line: Define method to roll NPCs from npc.json
         """Roll for NPCs from npc.json, preserving existing special NPCs not in npc.json."""
@@ -90,7 +90,7 @@ class Tavern:
         for npc in self.npc_spawn_data:  # New line
             level_range = npc["level_range"]  # New line
             if level_range["min"] <= player_level <= level_range["max"]:  # New line
-                if random.randint(1, 100) <= npc["spawn_chance"]:  # New line
+                if stream("npc").randint(1, 100) <= npc["spawn_chance"]:  # New line
                     # Check if this NPC is already in tavern_npcs (unlikely but possible)
                     if not any(n["name"] == npc["name"] for n in self.player.tavern_npcs):  # New line
                         self.player.tavern_npcs.append({  # New line
@@ -99,44 +99,43 @@ class Tavern:
                             "bond": 0  # New line: Reset bond for npc.json NPCs
                         })  # New line
 
-    def visit_tavern(self):
+    async def visit_tavern(self):
         while True:
-            print("\nWelcome to the Tavern!")
-            print(f"Gold: {self.player.gold}")
-            print("1. Visit the Bar | 2. Rest | 3. Buy a Room | 4. Interact with Special NPC | 5. Leave")
-            choice = input("Selection: ")
+            write("\nWelcome to the Tavern!")
+            write(f"Gold: {self.player.gold}")
+            write("1. Visit the Bar | 2. Rest | 3. Buy a Room | 4. Interact with Special NPC | 5. Leave")
+            choice = await read_line("Selection: ")
 
             try:
                 if choice == "1":
-                    self.visit_bar()
+                    await self.visit_bar()
                 elif choice == "2":
-                    self.rest()
+                    await self.rest()
                 elif choice == "3":
                     self.buy_room()
                 elif choice == "4":
-                    self.interact_special_npc()
+                    await self.interact_special_npc()
                 elif choice == "5":
-                    print("You leave the tavern.")
+                    write("You leave the tavern.")
                     break
                 else:
-                    print("Invalid choice!")
+                    write("Invalid choice!")
             except ReturnToMainMenu:
                 return  # Return to main menu
 
-    def visit_bar(self):
-        print("\nYou approach the bar, buzzing with chatter.")
+    async def visit_bar(self):
+        write("\nYou approach the bar, buzzing with chatter.")
         available_npcs = self.standard_npcs + [npc["name"] for npc in self.player.tavern_npcs]
         
         if not available_npcs:
-            print("No one is here to talk to!")
+            write("No one is here to talk to!")
             return
         
-        print("Who would you like to talk to?")
-        for i, npc in enumerate(available_npcs[:9], 1):
-            print(f"{i}. {npc}")
-        print("0. Back")
+        write("Who would you like to talk to?")
+        write_menu(available_npcs[:9])
+        write("0. Back")
         
-        choice = input("Selection: ")
+        choice = await read_line("Selection: ")
         try:
             choice_num = int(choice)
             if choice_num == 0:
@@ -144,62 +143,59 @@ class Tavern:
             elif 1 <= choice_num <= len(available_npcs[:9]):
                 npc = available_npcs[choice_num - 1]
                 if npc in self.standard_npcs:
-                    self.handle_standard_npc(npc)
+                    await self.handle_standard_npc(npc)
                 else:
-                    self.handle_special_npc(npc)
+                    await self.handle_special_npc(npc)
             else:
-                print(f"Invalid selection! Choose a number between 0 and {len(available_npcs[:9])}")
+                write(f"Invalid selection! Choose a number between 0 and {len(available_npcs[:9])}")
         except ValueError:
-            print("Invalid input! Please enter a number between 0 and", len(available_npcs[:9]))
+            write("Invalid input! Please enter a number between 0 and", len(available_npcs[:9]))
 
-    def handle_standard_npc(self, npc):
-        quests = load_json("quest.json")["quests"]
+    async def handle_standard_npc(self, npc):
         dialogue = {
             "Barkeep": "Need a drink or a job?",
             "Old Storyteller": "Heard rumors of a beast beneath the ice...",
             "Drunk Mercenary": "Lost my blade to some wolves!"
         }
-        print(f"{npc}: {dialogue.get(npc, 'Hey there!')}")
-        if npc == "Old Storyteller" and "Beast Rumors" in [q["quest_name"] for q in quests]:
-            self.offer_quest("Beast Rumors")
-        elif npc == "Drunk Mercenary" and "Wolf Blade" in [q["quest_name"] for q in quests]:
-            self.offer_quest("Wolf Blade")
-
-    def offer_quest(self, quest_name):
-        quest = next(q for q in load_json("quest.json")["quests"] if q["quest_name"] == quest_name)
-        print(f"\nQuest: {quest['quest_name']} - {quest['quest_description']}")
-        if input("Accept? (y/n): ").lower() == "y":
-            self.player.active_quests.append({
+        write(f"{npc}: {dialogue.get(npc, 'Hey there!')}")
+        if npc == "Old Storyteller" and index.quest("Beast Rumors"):
+            await self.offer_quest("Beast Rumors")
+        elif npc == "Drunk Mercenary" and index.quest("Wolf Blade"):
+            await self.offer_quest("Wolf Blade")
+
+    async def offer_quest(self, quest_name):
+        quest = index.quest(quest_name)
+        write(f"\nQuest: {quest['quest_name']} - {quest['quest_description']}")
+        if (await read_line("Accept? (y/n): ")).lower() == "y":
+            self.player.accept_quest({
                 "quest_name": quest["quest_name"],
                 "stages": [{"type": s["type"], "target_monster": s.get("target_monster"), "kill_count": 0} 
                            if s["type"] in ["kill", "boss"] else {"type": s["type"], "target_item": s["target_item"], "item_count": 0} 
                            for s in quest["stages"]]
             })
-            print("Quest accepted!")
+            write("Quest accepted!")
 
-    def handle_special_npc(self, npc):
+    async def handle_special_npc(self, npc):
         npc_name = npc["name"]
         bond = npc.get("bond", 0)
         
         # Load NPC dialogue from NPC folder
         npc_file = os.path.join("NPC", f"{npc_name}.json")
         dialogue_options = []
-        if os.path.exists(npc_file):
-            with open(npc_file, 'r') as f:
-                npc_data = json.load(f)
+        if content_exists(f"{npc_name}.json", subfolder="NPC"):
+            npc_data = load_content(f"{npc_name}.json", subfolder="NPC")
             dialogue_options = npc_data.get("dialogue", [])
         else:
             # Fallback: Try a known filename mapping
             name_to_file = {
                 "Elara, the Fox": "elarathefox.json"
             }
-            fallback_file = os.path.join("NPC", name_to_file.get(npc_name, f"{npc_name}.json"))
-            if os.path.exists(fallback_file):
-                with open(fallback_file, 'r') as f:
-                    npc_data = json.load(f)
+            fallback_file = name_to_file.get(npc_name, f"{npc_name}.json")
+            if content_exists(fallback_file, subfolder="NPC"):
+                npc_data = load_content(fallback_file, subfolder="NPC")
                 dialogue_options = npc_data.get("dialogue", [])
             else:
-                print(f"Warning: No dialogue file found for {npc_name} at {npc_file}")
+                write(f"Warning: No dialogue file found for {npc_name} at {npc_file}")
                 npc_data = {}  # Define npc_data to avoid UnboundLocalError
 
         # Determine quest stage
@@ -239,10 +235,10 @@ class Tavern:
             dialogue = invitation_dialogue["invitation"]
 
         if not dialogue:
-            print(f"{npc_name}: I have nothing to say right now.")
+            write(f"{npc_name}: I have nothing to say right now.")
             return
 
-        print(f"{npc_name}: ", end="")
+        write(f"{npc_name}: ", end="")
         print_colored_text(dialogue["text"])
 
         # Menu options
@@ -254,36 +250,34 @@ class Tavern:
         elif show_romance:
             options = ["1. Ask about Quest", "2. Turn in Quest", "3. Talk", "4. Romance"]
 
-        print(" | ".join(options))
-        choice = input("Selection: ")
+        write(" | ".join(options))
+        choice = await read_line("Selection: ")
 
         if choice == "1":
             if show_room_option:
                 replies = dialogue["replies"]
-                for i, reply in enumerate(replies, 1):
-                    print(f"{i}. {reply['text']}")
-                reply_choice = int(input("Select reply: ")) - 1
+                write_menu([reply["text"] for reply in replies])
+                reply_choice = int(await read_line("Select reply: ")) - 1
                 if 0 <= reply_choice < len(replies):
                     selected_reply = replies[reply_choice]
-                    print(f"{npc_name}: ", end="")
+                    write(f"{npc_name}: ", end="")
                     print_colored_text(selected_reply["response"])
                     npc["bond"] = bond + selected_reply["bond_change"]
                     if reply_choice == 0:  # Accept room
                         npc["room"] = True
-                    print(f"Bond with {npc_name} is now {npc['bond']}")
+                    write(f"Bond with {npc_name} is now {npc['bond']}")
             elif show_invitation:
                 replies = dialogue["replies"]
-                for i, reply in enumerate(replies, 1):
-                    print(f"{i}. {reply['text']}")
-                reply_choice = int(input("Select reply: ")) - 1
+                write_menu([reply["text"] for reply in replies])
+                reply_choice = int(await read_line("Select reply: ")) - 1
                 if 0 <= reply_choice < len(replies):
                     selected_reply = replies[reply_choice]
-                    print(f"{npc_name}: ", end="")
+                    write(f"{npc_name}: ", end="")
                     print_colored_text(selected_reply["response"])
                     npc["bond"] = bond + selected_reply["bond_change"]
                     if reply_choice == 0:  # Accept invitation
                         npc["living_with_player"] = True
-                    print(f"Bond with {npc_name} is now {npc['bond']}")
+                    write(f"Bond with {npc_name} is now {npc['bond']}")
             elif current_quest and current_quest not in completed_quests and current_quest not in active_quests:
                 if stage == "quest_start" and "replies" in dialogue:
                     while True:  # Loop until accept or deny
@@ -299,58 +293,56 @@ class Tavern:
                                 available_flavor.append(next_flavor)
                         
                         # Display options: 1. Accept, 2. Deny, 3. Flavor (if available)
-                        for i, reply in enumerate(replies, 1):
-                            print(f"{i}. {reply['text']}")
+                        write_menu([reply["text"] for reply in replies])
                         if available_flavor:
-                            print(f"3. {available_flavor[0]['text']}")
+                            write(f"3. {available_flavor[0]['text']}")
                         
-                        reply_choice = int(input("Select reply: ")) - 1
+                        reply_choice = int(await read_line("Select reply: ")) - 1
                         if reply_choice == 0:  # Accept quest
                             selected_reply = replies[0]
-                            print(f"{npc_name}: ", end="")
+                            write(f"{npc_name}: ", end="")
                             print_colored_text(selected_reply["response"])
                             npc["bond"] = bond + selected_reply["bond_change"]
-                            quests = load_json("quest.json")["quests"]
-                            quest_data = next((q for q in quests if q["quest_name"] == current_quest), None)
+                            quest_data = index.quest(current_quest)
                             if quest_data:
                                 new_quest = {"quest_name": current_quest, "stages": [{"type": s["type"], "target_monster": s.get("target_monster"), "kill_count_required": s.get("kill_count_required", 0), "kill_count": 0, "target_item": s.get("target_item"), "item_count_required": s.get("item_count_required", 0), "item_count": 0} for s in quest_data["stages"]]}
-                                self.player.active_quests.append(new_quest)
+                                self.player.accept_quest(new_quest)
                                 npc["quest_accepted"] = True
                                 dialogue = next((s for s in stages if s["stage"] == "quest_accepted"), None)
                                 if dialogue:
-                                    print(f"{npc_name}: ", end="")
+                                    write(f"{npc_name}: ", end="")
                                     print_colored_text(dialogue["text"])
                             save_game(self.player)
                             break
                         elif reply_choice == 1:  # Deny quest
                             selected_reply = replies[1]
-                            print(f"{npc_name}: ", end="")
+                            write(f"{npc_name}: ", end="")
                             print_colored_text(selected_reply["response"])
                             npc["bond"] = bond + selected_reply["bond_change"]
                             npc["quest_denied"] = True
                             dialogue = next((s for s in stages if s["stage"] == "quest_denied"), None)
                             if dialogue:
-                                print(f"{npc_name}: ", end="")
+                                write(f"{npc_name}: ", end="")
                                 print_colored_text(dialogue["text"])
                             save_game(self.player)
                             break
                         elif reply_choice == 2 and available_flavor:  # Flavor option
                             selected_flavor = available_flavor[0]
-                            print(f"{npc_name}: ", end="")
+                            write(f"{npc_name}: ", end="")
                             print_colored_text(selected_flavor["response"])
                             npc["bond"] = bond + selected_flavor["bond_change"]
                             npc["flavor_count"] = npc["flavor_count"] + 1
                             save_game(self.player)
                             if npc["flavor_count"] < len(flavor_options):
-                                print("\nChoose again:")
+                                write("\nChoose again:")
                             else:
-                                print("\nNo more questions to ask. Please decide:")
+                                write("\nNo more questions to ask. Please decide:")
                         else:
-                            print("Invalid choice, try again.")
+                            write("Invalid choice, try again.")
                 else:
-                    print(f"{npc_name}: No new quests available right now.")
+                    write(f"{npc_name}: No new quests available right now.")
             else:
-                print(f"{npc_name}: No new quests available right now.")
+                write(f"{npc_name}: No new quests available right now.")
         elif choice == "2":
             if current_quest and current_quest in active_quests:
                 self.turn_in_quest(current_quest)
@@ -362,18 +354,17 @@ class Tavern:
                         stage = "quest_complete"
                     dialogue = next((s for s in stages if s["stage"] == stage), None)
                     if dialogue:
-                        print(f"{npc_name}: ", end="")
+                        write(f"{npc_name}: ", end="")
                         print_colored_text(dialogue["text"])
                 # Handle next quest
-                quests = load_json("quest.json")["quests"]
-                quest_data = next((q for q in quests if q["quest_name"] == current_quest), None)
+                quest_data = index.quest(current_quest)
                 if quest_data and quest_data.get("next_quest"):
                     npc["quest"] = quest_data["next_quest"]
                     npc["quest_accepted"] = False
                     npc["quest_denied"] = False
                 save_game(self.player)
             else:
-                print(f"{npc_name}: No active quest to turn in.")
+                write(f"{npc_name}: No active quest to turn in.")
                 talk_section = next((d for d in dialogue_options if "talk" in d), None)
                 if talk_section:
                     talk_options = talk_section["talk"]
@@ -390,20 +381,20 @@ class Tavern:
                             available_options.append(highest_replace)
                         elif any(opt["option"] == base_opt for opt in talk_options):
                             available_options.append(next(opt for opt in talk_options if opt["option"] == base_opt))
-                    print("Talk Options (0 to back):")
+                    write("Talk Options (0 to back):")
                     for i, opt in enumerate(available_options, 1):
-                        print(f"{i}. {opt['text']}")
+                        write(f"{i}. {opt['text']}")
                         for flavor in opt.get("flavor_text", []):
-                            print("   - ", end="")
+                            write("   - ", end="")
                             print_colored_text(flavor)
-                    print("0. Back")
-                    reply_choice = int(input("Select option: ")) - 1
+                    write("0. Back")
+                    reply_choice = int(await read_line("Select option: ")) - 1
                     if 0 <= reply_choice < len(available_options):
                         selected_opt = available_options[reply_choice]
-                        print(f"{npc_name}: ", end="")
+                        write(f"{npc_name}: ", end="")
                         print_colored_text(selected_opt["response"])
                         npc["bond"] = bond + selected_opt["bond_change"]
-                        print(f"Bond with {npc_name} is now {npc['bond']}")
+                        write(f"Bond with {npc_name} is now {npc['bond']}")
 
         elif choice == "3":
             talk_section = next((d for d in dialogue_options if "talk" in d), None)
@@ -422,20 +413,20 @@ class Tavern:
                         available_options.append(highest_replace)
                     elif any(opt["option"] == base_opt for opt in talk_options):
                         available_options.append(next(opt for opt in talk_options if opt["option"] == base_opt))
-                print("Talk Options (0 to back):")
+                write("Talk Options (0 to back):")
                 for i, opt in enumerate(available_options, 1):
-                    print(f"{i}. {opt['text']}")
+                    write(f"{i}. {opt['text']}")
                     for flavor in opt.get("flavor_text", []):
-                        print("   - ", end="")
+                        write("   - ", end="")
                         print_colored_text(flavor)
-                print("0. Back")
-                reply_choice = int(input("Select option: ")) - 1
+                write("0. Back")
+                reply_choice = int(await read_line("Select option: ")) - 1
                 if 0 <= reply_choice < len(available_options):
                     selected_opt = available_options[reply_choice]
-                    print(f"{npc_name}: ", end="")
+                    write(f"{npc_name}: ", end="")
                     print_colored_text(selected_opt["response"])
                     npc["bond"] = bond + selected_opt["bond_change"]
-                    print(f"Bond with {npc_name} is now {npc['bond']}")
+                    write(f"Bond with {npc_name} is now {npc['bond']}")
 
         elif choice == "4" and show_romance:
             romance_section = next((d for d in dialogue_options if "romance" in d), None)
@@ -449,59 +440,57 @@ class Tavern:
                         # Only add if no higher replacement exists
                         if not any(o["option"].startswith(base_opt + "-") and o.get("bond_check", -1) > bond_check and bond >= o.get("bond_check", -1) for o in romance_options):
                             available_options.append(opt)
-                print("Romance Options (0 to back):")
+                write("Romance Options (0 to back):")
                 for i, opt in enumerate(available_options, 1):
-                    print(f"{i}. {opt['text']}")
+                    write(f"{i}. {opt['text']}")
                     for flavor in opt.get("flavor_text", []):
-                        print("   - ", end="")
+                        write("   - ", end="")
                         print_colored_text(flavor)
-                print("0. Back")
-                reply_choice = int(input("Select option: ")) - 1
+                write("0. Back")
+                reply_choice = int(await read_line("Select option: ")) - 1
                 if 0 <= reply_choice < len(available_options):
                     selected_opt = available_options[reply_choice]
-                    print(f"{npc_name}: ", end="")
+                    write(f"{npc_name}: ", end="")
                     print_colored_text(selected_opt["response"])
                     npc["bond"] = bond + selected_opt["bond_change"]
-                    print(f"Bond with {npc_name} is now {npc['bond']}")
+                    write(f"Bond with {npc_name} is now {npc['bond']}")
             elif current_quest and current_quest not in completed_quests and current_quest not in active_quests:
-                quests = load_json("quest.json")["quests"]
-                quest_data = next((q for q in quests if q["quest_name"] == current_quest), None)
+                quest_data = index.quest(current_quest)
                 if quest_data:
-                    print(f"{npc_name}: ", end="")
+                    write(f"{npc_name}: ", end="")
                     print_colored_text(quest_data["quest_description"])
-                    accept = input("Accept quest? (y/n): ").lower()
+                    accept = (await read_line("Accept quest? (y/n): ")).lower()
                     if accept == "y":
                         new_quest = {"quest_name": current_quest, "stages": [{"type": s["type"], "target_monster": s.get("target_monster"), "kill_count_required": s.get("kill_count_required", 0), "kill_count": 0, "target_item": s.get("target_item"), "item_count_required": s.get("item_count_required", 0), "item_count": 0} for s in quest_data["stages"]]}
-                        self.player.active_quests.append(new_quest)
+                        self.player.accept_quest(new_quest)
                         npc["quest_accepted"] = True
                         dialogue = next((s for s in stages if s["stage"] == "quest_accepted"), None)
                         if dialogue:
-                            print(f"{npc_name}: ", end="")
+                            write(f"{npc_name}: ", end="")
                             print_colored_text(dialogue["text"])
                     else:
                         npc["quest_denied"] = True
                         dialogue = next((s for s in stages if s["stage"] == "quest_denied"), None)
                         if dialogue:
-                            print(f"{npc_name}: ", end="")
+                            write(f"{npc_name}: ", end="")
                             print_colored_text(dialogue["text"])
             else:
-                print(f"{npc_name}: No new quests available right now.")
+                write(f"{npc_name}: No new quests available right now.")
 
-    def offer_quest(self, quest_name):
-        quests = load_json("quest.json")["quests"]
-        quest = next((q for q in quests if q["quest_name"] == quest_name), None)
+    async def offer_quest(self, quest_name):
+        quest = index.quest(quest_name)
         if not quest:
-            print(f"Quest '{quest_name}' not found in quest.json!")
+            write(f"Quest '{quest_name}' not found in quest.json!")
             return
         if quest["quest_name"] in [q["quest_name"] for q in self.player.active_quests]:
-            print("You already have this quest!")
+            write("You already have this quest!")
             return
         if quest["quest_name"] in [q["quest_name"] if isinstance(q, dict) else q for q in self.player.completed_quests]:
-            print("You've already completed this quest!")
+            write("You've already completed this quest!")
             return
-        print(f"\nQuest: {quest['quest_name']} - {quest['quest_description']}")
-        if input("Accept? (y/n): ").lower() == "y":
-            self.player.active_quests.append({
+        write(f"\nQuest: {quest['quest_name']} - {quest['quest_description']}")
+        if (await read_line("Accept? (y/n): ")).lower() == "y":
+            self.player.accept_quest({
                 "quest_name": quest["quest_name"],
                 "stages": [
                    {
@@ -517,19 +506,18 @@ class Tavern:
                     } for s in quest["stages"]
                 ]
             })
-            print("Quest accepted!")
+            write("Quest accepted!")
             save_game(self.player)
 
     def turn_in_quest(self, quest_name):
         if not quest_name:
-            print("No quest to turn in!")
+            write("No quest to turn in!")
             return
-        quests = load_json("quest.json")["quests"]
         for quest in self.player.active_quests[:]:
             if quest["quest_name"] == quest_name:
-                quest_data = next((q for q in quests if q["quest_name"] == quest_name), None)
+                quest_data = index.quest(quest_name)
                 if not quest_data:
-                    print(f"Quest '{quest_name}' not found in quest.json!")
+                    write(f"Quest '{quest_name}' not found in quest.json!")
                     return
                 all_stages_complete = True
                 for i, stage in enumerate(quest["stages"]):
@@ -550,9 +538,9 @@ class Tavern:
                     self.player.gold += gold_amount
                     if len(reward) > 1:
                         self.player.inventory.append(reward[1])
-                    print(f"Quest '{quest_name}' completed! Reward: {quest_data['quest_reward']}")
+                    write(f"Quest '{quest_name}' completed! Reward: {quest_data['quest_reward']}")
                     self.player.completed_quests.append({"quest_name": quest_name})  # Consistent dict format
-                    self.player.active_quests.remove(quest)
+                    self.player.finish_quest(quest)
                     save_game(self.player)  # Persist state
                     # Update NPC quest chain
                     for npc_name, npc in self.npc_data.items():
@@ -560,36 +548,35 @@ class Tavern:
                             if quest_data.get("next_quest"):
                                 npc["quest"] = None
                                 npc["next_quest"] = quest_data["next_quest"]
-                                print(f"{npc_name} has a new task for you: {npc['next_quest']}")
+                                write(f"{npc_name} has a new task for you: {npc['next_quest']}")
                             else:
                                 npc["next_quest"] = None
-                                print(f"{npc_name} has no further quests for now.")
+                                write(f"{npc_name} has no further quests for now.")
                 else:
-                    print("Quest not yet complete!")
-                    print("Progress:")
+                    write("Quest not yet complete!")
+                    write("Progress:")
                     for i, stage in enumerate(quest["stages"]):
                         if stage["type"] in ["kill", "boss"]:
-                            print(f" - {stage['target_monster']}: {stage['kill_count']}/{quest_data['stages'][i]['kill_count_required']}")
+                            write(f" - {stage['target_monster']}: {stage['kill_count']}/{quest_data['stages'][i]['kill_count_required']}")
                         elif stage["type"] == "collect":
-                            print(f" - {stage['target_item']}: {stage.get('item_count', 0)}/{quest_data['stages'][i]['item_count_required']}")
+                            write(f" - {stage['target_item']}: {stage.get('item_count', 0)}/{quest_data['stages'][i]['item_count_required']}")
                 break
 
-    def talk_personally(self, npc_name, npc_data, replies):
-        print(f"\n{npc_name} awaits your reply:")
-        for i, reply in enumerate(replies, 1):
-            print(f"{i}. {reply['text']}")
-        choice = input("Selection: ")
+    async def talk_personally(self, npc_name, npc_data, replies):
+        write(f"\n{npc_name} awaits your reply:")
+        write_menu([reply["text"] for reply in replies])
+        choice = await read_line("Selection: ")
         try:
             idx = int(choice) - 1
             if 0 <= idx < len(replies):
                 reply = replies[idx]
-                print(f"{npc_name}: {reply['response']}")
+                write(f"{npc_name}: {reply['response']}")
                 npc_data["bond"] = npc_data.get("bond", 0) + reply["bond_change"]
-                print(f"(Bond with {npc_name}: {npc_data['bond']})")
+                write(f"(Bond with {npc_name}: {npc_data['bond']})")
             else:
-                print("Invalid choice!")
+                write("Invalid choice!")
         except ValueError:
-            print("Invalid input!")
+            write("Invalid input!")
 
     def invite_to_room(self, npc_data, room_condition):
         if "bond" not in npc_data:
@@ -599,65 +586,62 @@ class Tavern:
         
         if bond_met and quest_met and not npc_data["room"]:
             npc_data["room"] = True
-            print(f"{npc_data['name']} agrees happily. 'I'd love to stay with you!'")
+            write(f"{npc_data['name']} agrees happily. 'I'd love to stay with you!'")
         elif npc_data["room"]:
-            print(f"{npc_data['name']} is already living in your room!")
+            write(f"{npc_data['name']} is already living in your room!")
         elif not bond_met:
-            print(f"{npc_data['name']} hesitates. 'I don't feel close enough to you yet.'")
+            write(f"{npc_data['name']} hesitates. 'I don't feel close enough to you yet.'")
         elif not quest_met:
-            print(f"{npc_data['name']} says, 'How nice it would be to stay the night with you once our work is done.'")
+            write(f"{npc_data['name']} says, 'How nice it would be to stay the night with you once our work is done.'")
 
-    def rest(self):
+    async def rest(self):
         if self.player.has_room:
             # Get all NPCs living with the player
             living_npcs = [npc for npc in self.player.tavern_npcs if npc.get("living_with_player", False)]
             
             if living_npcs:
-                print("\nYou rest in your room with:")
-                for i, npc in enumerate(living_npcs, 1):
-                    print(f"{i}. {npc['name']}")
-                print("0. Rest Alone")
+                write("\nYou rest in your room with:")
+                write_menu([npc["name"] for npc in living_npcs])
+                write("0. Rest Alone")
                 
-                choice = input("\nSelect an NPC to interact with (or 0 to rest alone): ")
+                choice = await read_line("\nSelect an NPC to interact with (or 0 to rest alone): ")
                 try:
                     choice_num = int(choice)
                     if choice_num == 0:
-                        print("You rest in your own room for free.")
+                        write("You rest in your own room for free.")
                         self.player.hp = self.player.max_hp
                         self.player.mp = self.player.max_mp
                     elif 1 <= choice_num <= len(living_npcs):
                         selected_npc = living_npcs[choice_num - 1]
-                        print(f"\nWhat would you like to do with {selected_npc['name']}?")
-                        print("1. Conversation")
-                        print("2. Romance")
-                        print("3. Rest Together")
-                        print("0. Back")
+                        write(f"\nWhat would you like to do with {selected_npc['name']}?")
+                        write("1. Conversation")
+                        write("2. Romance")
+                        write("3. Rest Together")
+                        write("0. Back")
                         
-                        interaction = input("Selection: ")
+                        interaction = await read_line("Selection: ")
                         if interaction == "1":
                             # Load and handle conversation dialogue
-                            npc_file = os.path.join("NPC", f"{selected_npc['name']}.json")
-                            if os.path.exists(npc_file):
-                                with open(npc_file, 'r') as f:
-                                    npc_data = json.load(f)
+                            npc_file = f"{selected_npc['name']}.json"
+                            if content_exists(npc_file, subfolder="NPC"):
+                                npc_data = load_content(npc_file, subfolder="NPC")
                                 talk_section = next((d for d in npc_data.get("dialogue", []) if "talk" in d), None)
                                 if talk_section:
-                                    self.handle_talk_options(selected_npc, talk_section["talk"])
+                                    await self.handle_talk_options(selected_npc, talk_section["talk"])
                             else:
-                                print(f"{selected_npc['name']} seems to be lost in thought.")
+                                write(f"{selected_npc['name']} seems to be lost in thought.")
                         elif interaction == "2":
                             # Load and handle romance dialogue
-                            npc_file = os.path.join("NPC", f"{selected_npc['name']}.json")
-                            if os.path.exists(npc_file):
-                                with open(npc_file, 'r') as f:
-                                    npc_data = json.load(f)
+                            npc_file = f"{selected_npc['name']}.json"
+                            if content_exists(npc_file, subfolder="NPC"):
+                                npc_data = load_content(npc_file, subfolder="NPC")
                                 romance_section = next((d for d in npc_data.get("dialogue", []) if "romance" in d), None)
                                 if romance_section:
-                                    self.handle_romance_options(selected_npc, romance_section["romance"])
+                                    await self.handle_romance_options(selected_npc, romance_section["romance"])
                             else:
-                                print(f"{selected_npc['name']} smiles warmly at you.")
+                                write(f"{selected_npc['name']} smiles warmly at you.")
                         elif interaction == "3":
-                            print(f"\nYou rest with {selected_npc['name']}, sharing stories and warmth.")
+                            write(f"\nYou rest with {selected_npc['name']}, sharing stories and warmth.")
                             # Apply temporary buff (10% increase for 1 hour)
                             self.player.hp = self.player.max_hp * 1.1
                             self.player.mp = self.player.max_mp * 1.1
@@ -672,35 +656,35 @@ class Tavern:
                                 'hp_multiplier': 1.1,
                                 'mp_multiplier': 1.1
                             })
-                            print(f"You feel {selected_npc['name']}'s warmth, increasing your HP and MP by 10% for 1 hour.")
+                            write(f"You feel {selected_npc['name']}'s warmth, increasing your HP and MP by 10% for 1 hour.")
                     else:
-                        print("Invalid selection!")
+                        write("Invalid selection!")
                         return
                 except ValueError:
-                    print("Invalid input!")
+                    write("Invalid input!")
                     return
             else:
-                print("You rest in your own room for free.")
+                write("You rest in your own room for free.")
                 self.player.hp = self.player.max_hp
                 self.player.mp = self.player.max_mp
         else:
-            print("Resting costs 5 gold.")
+            write("Resting costs 5 gold.")
             if self.player.gold >= 5:
-                print("1. Yes | 2. No")
-                choice = input("Selection: ")
+                write("1. Yes | 2. No")
+                choice = await read_line("Selection: ")
                 if choice == "1":
                     self.player.gold -= 5
                     self.player.hp = self.player.max_hp
                     self.player.mp = self.player.max_mp
-                    print("You rest and recover.")
+                    write("You rest and recover.")
             else:
-                print("Not enough gold!")
+                write("Not enough gold!")
                 return
         
         # Return to main menu by raising a custom exception
         raise ReturnToMainMenu()
 
-    def handle_talk_options(self, npc, talk_options):
+    async def handle_talk_options(self, npc, talk_options):
         bond = npc.get("bond", 0)
         available_options = []
         for i in range(1, 10):
@@ -716,21 +700,21 @@ class Tavern:
             elif any(opt["option"] == base_opt for opt in talk_options):
                 available_options.append(next(opt for opt in talk_options if opt["option"] == base_opt))
         
-        print("\nTalk Options (0 to back):")
+        write("\nTalk Options (0 to back):")
         for i, opt in enumerate(available_options, 1):
-            print(f"{i}. {opt['text']}")
+            write(f"{i}. {opt['text']}")
             for flavor in opt.get("flavor_text", []):
-                print(f"   - {flavor}")
-        print("0. Back")
+                write(f"   - {flavor}")
+        write("0. Back")
         
-        reply_choice = int(input("Select option: ")) - 1
+        reply_choice = int(await read_line("Select option: ")) - 1
         if 0 <= reply_choice < len(available_options):
             selected_opt = available_options[reply_choice]
-            print(f"{npc['name']}: {selected_opt['response']}")
+            write(f"{npc['name']}: {selected_opt['response']}")
             npc["bond"] = bond + selected_opt["bond_change"]
-            print(f"Bond with {npc['name']} is now {npc['bond']}")
+            write(f"Bond with {npc['name']} is now {npc['bond']}")
 
-    def handle_romance_options(self, npc, romance_options):
+    async def handle_romance_options(self, npc, romance_options):
         bond = npc.get("bond", 0)
         available_options = []
         for opt in romance_options:
@@ -740,34 +724,34 @@ class Tavern:
                 if not any(o["option"].startswith(base_opt + "-") and o.get("bond_check", -1) > bond_check and bond >= o.get("bond_check", -1) for o in romance_options):
                     available_options.append(opt)
         
-        print("\nRomance Options (0 to back):")
+        write("\nRomance Options (0 to back):")
         for i, opt in enumerate(available_options, 1):
-            print(f"{i}. {opt['text']}")
+            write(f"{i}. {opt['text']}")
             for flavor in opt.get("flavor_text", []):
-                print(f"   - {flavor}")
-        print("0. Back")
+                write(f"   - {flavor}")
+        write("0. Back")
         
-        reply_choice = int(input("Select option: ")) - 1
+        reply_choice = int(await read_line("Select option: ")) - 1
         if 0 <= reply_choice < len(available_options):
             selected_opt = available_options[reply_choice]
-            print(f"{npc['name']}: {selected_opt['response']}")
+            write(f"{npc['name']}: {selected_opt['response']}")
             npc["bond"] = bond + selected_opt["bond_change"]
-            print(f"Bond with {npc['name']} is now {npc['bond']}")
+            write(f"Bond with {npc['name']} is now {npc['bond']}")
 
     def buy_room(self):
         if not self.player.has_room and self.player.gold >= self.room_cost:  # Use player.has_room
             self.player.gold -= self.room_cost
             self.player.has_room = True
-            print(f"You've bought a permanent room for {self.room_cost} gold!")
+            write(f"You've bought a permanent room for {self.room_cost} gold!")
             save_game(self.player)  # Save state after purchase
         elif self.player.has_room:
-            print("You already own a room!")
+            write("You already own a room!")
         else:
-            print(f"Not enough gold! A room costs {self.room_cost} gold.")
+            write(f"Not enough gold! A room costs {self.room_cost} gold.")
 
-    def interact_special_npc(self):
+    async def interact_special_npc(self):
         if not self.player.tavern_npcs:
-            print("No special NPCs are here yet!")
+            write("No special NPCs are here yet!")
             return
         
         # Filter out NPCs with bonds of -100 or worse and NPCs living with the player
@@ -775,27 +759,26 @@ class Tavern:
                        if npc.get("bond", 0) > -100 and not npc.get("living_with_player", False)]
         
         if not special_npcs:
-            print("No special NPCs are here yet!")
+            write("No special NPCs are here yet!")
             return
             
-        print("\nSpecial NPCs present:")
-        for i, npc in enumerate(special_npcs[:9], 1):
-            print(f"{i}. {npc['name']}")
-        print("0. Back")
+        write("\nSpecial NPCs present:")
+        write_menu([npc["name"] for npc in special_npcs[:9]])
+        write("0. Back")
         
-        choice = input("Selection: ")
+        choice = await read_line("Selection: ")
         try:
             choice_num = int(choice)
             if choice_num == 0:
                 return
             elif 1 <= choice_num <= len(special_npcs[:9]):
-                self.handle_special_npc(special_npcs[choice_num - 1])
+                await self.handle_special_npc(special_npcs[choice_num - 1])
             else:
-                print(f"Invalid selection! Choose a number between 0 and {len(special_npcs[:9])}")
+                write(f"Invalid selection! Choose a number between 0 and {len(special_npcs[:9])}")
         except ValueError:
-            print("Invalid input! Please enter a number between 0 and", len(special_npcs[:9]))
+            write("Invalid input! Please enter a number between 0 and", len(special_npcs[:9]))
 
-def tavern_menu(player):
+async def tavern_menu(player):
     """Wrapper function to provide compatibility with game.py."""
     tavern = Tavern(player)
-    tavern.visit_tavern()
\ No newline at end of file
+    await tavern.visit_tavern()
\ No newline at end of file
@@ -0,0 +1,17 @@
+import pytest
+
+pytest.importorskip("numpy")
+
+import renderer
+from batch_combat import check_consistency
+
+
+@pytest.mark.parametrize("class_type, level, monster_name, skill", [
+    ("1", 3, "Goblin", None),
+    ("2", 2, "Goblin", "Fireball"),
+    ("3", 8, "Troll", None),
+])
+def test_batch_matches_combat_engine(class_type, level, monster_name, skill):
+    renderer.set_mode("silent")
+    ok, vector, scalar = check_consistency(class_type, level, monster_name, n=4000, skill=skill, seed=7)
+    assert ok, (vector, scalar)
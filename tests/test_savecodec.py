@@ -0,0 +1,14 @@
+from savecodec import MAGIC, SCHEMAS, decode_save, encode_save
+
+
+def test_round_trip_keeps_triggered_events():
+    save = {"name": "Ann", "stats": {"S": 6, "A": -2, "I": 300}, "inventory": {"Potion": 3},
+            "triggered_events": ["Night Bell"], "completed_quests": ["Wolves", "Snäll"]}
+    for compress in (True, False):
+        assert decode_save(encode_save(save, compress)) == save
+
+
+def test_version_1_saves_still_load():
+    # String table ["Ann"], name -> string 0, every other field missing, empty extras
+    payload = bytes([1, 3]) + b"Ann" + bytes([5, 0]) + bytes([8]) * (len(SCHEMAS[1]) - 1) + bytes([7, 0])
+    assert decode_save(MAGIC + bytes([1, 0]) + payload) == {"name": "Ann"}
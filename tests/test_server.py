@@ -0,0 +1,95 @@
+import asyncio
+
+import pytest
+
+import player
+from server import GameServer
+from storage import SqliteStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    old_store = player._store
+    store = SqliteStore(str(tmp_path / "saves.db"))
+    player.set_store(store)
+    yield store
+    player.set_store(old_store)
+    store.close()
+
+
+class Client:
+    """One telnet-style connection that answers the server's prompts."""
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.seen = ""
+
+    @classmethod
+    async def connect(cls, port):
+        return cls(*await asyncio.open_connection("127.0.0.1", port))
+
+    async def expect(self, text):
+        """Read until text shows up; returns everything read since the last expect."""
+        start = len(self.seen)
+        while text not in self.seen[start:]:
+            chunk = await asyncio.wait_for(self.reader.read(65536), 10)
+            if not chunk:
+                raise EOFError(f"closed waiting for {text!r}: {self.seen[start:]!r}")
+            self.seen += chunk.decode("utf-8", "replace")
+        return self.seen[start:]
+
+    async def answer(self, line, then):
+        self.writer.write(line.encode() + b"\r\n")
+        return await self.expect(then)
+
+    async def close(self):
+        self.writer.close()
+        await self.writer.wait_closed()
+
+    async def log_in(self, name, password, then):
+        await self.expect("Selection: ")
+        await self.answer("2", "Character name: ")
+        await self.answer(name, "Password: ")
+        return await self.answer(password, then)
+
+
+async def _sessions(store):
+    server = GameServer()
+    listener = await asyncio.start_server(server.handle, "127.0.0.1", 0)
+    port = listener.sockets[0].getsockname()[1]
+    async with listener:
+        first = await Client.connect(port)
+        await first.expect("Enter your name: ")
+        await first.answer("Ann", "Choose a password: ")
+        await first.answer("frost", "Selection: ")
+        await first.answer("1", "Selection: ")  # Warrior; now at the main menu, holding Ann
+        assert "Invalid choice!" in await first.answer("set.gold 999999", "Selection: ")
+        await first.answer("7", "Game saved!")
+
+        wrong = await Client.connect(port)
+        assert "wrong password" in await wrong.log_in("Ann", "thaw", "Enter your name: ")
+        await wrong.close()
+
+        second = await Client.connect(port)
+        assert "already being played in another session" in await second.log_in("Ann", "frost", "Enter your name: ")
+        await second.close()
+
+        await first.answer("8", "Goodbye!")
+        await first.close()
+        for _ in range(100):  # The server releases Ann once it sees the connection close
+            if "Ann" not in player._open_characters:
+                break
+            await asyncio.sleep(0.05)
+
+        third = await Client.connect(port)
+        assert "Welcome back, Ann!" in await third.log_in("Ann", "frost", "Selection: ")
+        await third.close()
+        while server.sessions:
+            await asyncio.sleep(0.05)
+
+
+def test_login_password_and_one_session_per_character(store):
+    asyncio.run(_sessions(store))
+    assert store.load("Ann")["gold"] != 999999  # Debug commands are off on the server
+    assert player._open_characters == {}
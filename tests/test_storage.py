@@ -0,0 +1,35 @@
+from storage import FileStore, SqliteStore
+
+
+def test_journal_after_compaction_survives_a_crash(tmp_path):
+    path = str(tmp_path / "save.json")
+    save = {"name": "Ann", "gold": 0, "inventory": {}}
+
+    # Session 1: a snapshot, a few journaled saves, then a clean exit
+    store = FileStore(path)
+    store.write_batch({"Ann": save})
+    for gold in range(1, 6):
+        store.write_batch({"Ann": dict(save, gold=gold)})
+    store.compact()
+
+    # Session 2 saves again and dies without compacting
+    store = FileStore(path)
+    save = store.load("Ann")
+    assert save["gold"] == 5
+    store.write_batch({"Ann": dict(save, gold=100, inventory={"Potion": 1})})
+
+    reloaded = FileStore(path).load("Ann")
+    assert reloaded["gold"] == 100
+    assert reloaded["inventory"] == {"Potion": 1}
+
+
+def test_sqlite_password_belongs_to_the_character(tmp_path):
+    store = SqliteStore(str(tmp_path / "saves.db"))
+    store.set_password("Ann", "frost")
+    store.write_batch({"Ann": {"name": "Ann", "level": 1}})
+    assert store.check_password("Ann", "frost")
+    assert not store.check_password("Ann", "thaw")
+    assert not store.check_password("Bob", "frost")  # No password set: can't log in
+    store.delete("Ann")
+    assert not store.check_password("Ann", "frost")
+    store.close()
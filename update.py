@@ -6,6 +6,7 @@ import shutil
 import requests
 import zipfile
 import io
+from renderer import write
 
 # GitHub repository details
 GITHUB_USER = "m0nnnna"
@@ -54,12 +55,12 @@ def save_current_commit(commit_hash):
 def download_and_extract_update(game_dir):
     """Download the latest files and extract them to the game directory."""
     try:
-        print("Downloading update...")
+        write("Downloading update...")
         
         # Download the zip file
         response = requests.get(ZIP_URL)
         if response.status_code != 200:
-            print("Failed to download update.")
+            write("Failed to download update.")
             return False
             
         # Create a temporary directory for extraction
@@ -91,11 +92,11 @@ def download_and_extract_update(game_dir):
         
         # Clean up
         shutil.rmtree(temp_dir)
-        print("Update completed successfully!")
+        write("Update completed successfully!")
         return True
         
     except Exception as e:
-        print(f"Update failed: {e}")
+        write(f"Update failed: {e}")
         return False
 
 def check_for_updates():
@@ -106,7 +107,7 @@ def check_for_updates():
     try:
         # Check internet connection first
         if not check_internet_connection():
-            print("No internet connection. Skipping update check.")
+            write("No internet connection. Skipping update check.")
             return
             
         # Get current and latest commit hashes
@@ -114,22 +115,22 @@ def check_for_updates():
         latest_commit = get_latest_commit()
         
         if not latest_commit:
-            print("Could not check for updates.")
+            write("Could not check for updates.")
             return
             
         # If we don't have a current commit or it's different from the latest
         if not current_commit or current_commit != latest_commit:
-            print("New update available!")
+            write("New update available!")
             if download_and_extract_update(game_dir):
                 # Save the new commit hash
                 save_current_commit(latest_commit)
-                print("Update completed. Please restart the game.")
+                write("Update completed. Please restart the game.")
                 sys.exit(0)
         else:
-            print("Game is up to date.")
+            write("Game is up to date.")
             
     except Exception as e:
-        print(f"Update check failed: {e}")
+        write(f"Update check failed: {e}")
 
 if __name__ == "__main__":
     check_for_updates()
\ No newline at end of file
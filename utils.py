@@ -2,6 +2,7 @@ import sys
 import os
 import json
 import shutil
+from renderer import write
 
 def get_base_path():
     """Get the directory containing the executable or script."""
@@ -35,21 +36,21 @@ def setup_game_files():
             dst = os.path.join(art_path, art_file)
             if not os.path.exists(dst) and os.path.exists(src):
                 shutil.copy2(src, dst)
-                print(f"Installed {art_file} to {dst}")
+                write(f"Installed {art_file} to {dst}")
         # Extract NPC files
         for npc_file in bundled_files["NPC"]:
             src = os.path.join(bundled_path, "NPC", npc_file)
             dst = os.path.join(npc_path, npc_file)
             if not os.path.exists(dst) and os.path.exists(src):
                 shutil.copy2(src, dst)
-                print(f"Installed {npc_file} to {dst}")
+                write(f"Installed {npc_file} to {dst}")
         # Extract JSON files
         for json_file in bundled_files["json"]:
             src = os.path.join(bundled_path, json_file)
             dst = os.path.join(base_path, json_file)
             if not os.path.exists(dst) and os.path.exists(src):
                 shutil.copy2(src, dst)
-                print(f"Installed {json_file} to {dst}")
+                write(f"Installed {json_file} to {dst}")
 
 def get_resource_path(filename, subfolder=None):
     """Get the absolute path to a resource file, ensuring base_path consistency."""
@@ -67,7 +68,7 @@ def load_json(filename):
         with open(file_path, "r") as f:
             return json.load(f)
     except Exception as e:
-        print(f"Error loading {file_path}: {e}")
+        write(f"Error loading {file_path}: {e}")
         return {}
 
 def load_file(filename):
@@ -76,34 +77,30 @@ def load_file(filename):
         with open(file_path, "r") as f:
             return f.read().splitlines()
     except Exception as e:
-        print(f"Error loading {file_path}: {e}")
+        write(f"Error loading {file_path}: {e}")
         return []
 
-def load_art_file(filename):
-    file_path = get_resource_path(filename, subfolder="art")
-    try:
-        with open(file_path, "r") as f:
-            return [line.rstrip('\n') for line in f if not line.startswith("#")]
-    except Exception as e:
-        print(f"Error loading {file_path}: {e}")
-        return []
+def load_art_file(filename, fullsize=False):
+    """The art's lines without comments ([] if it isn't installed), from the shared art cache."""
+    from artcache import art_cache  # artcache imports this module
+    return art_cache.lines(filename, fullsize)
 
 def save_json(filename, data):
     base_path = get_base_path()
     file_path = os.path.join(base_path, filename)
-    print(f"Saving to: {file_path}")  # Debug
+    write(f"Saving to: {file_path}")  # Debug
     try:
         with open(file_path, "w") as f:
             json.dump(data, f, indent=4)
         return True
     except Exception as e:
-        print(f"Error saving {file_path}: {e}")
+        write(f"Error saving {file_path}: {e}")
         return False
 
 def parse_stats(stat_str, is_consumable=False):
     stats = {"S": 0, "A": 0, "I": 0, "W": 0, "L": 0}
     if len(stat_str) < 10:
-        print(f"Warning: Invalid stat string '{stat_str}', using defaults.")
+        write(f"Warning: Invalid stat string '{stat_str}', using defaults.")
         return stats
     
     try:
@@ -124,7 +121,7 @@ def parse_stats(stat_str, is_consumable=False):
             stats["T"] = int(stat_str[t_idx:t_idx+1]) if stat_str[t_idx:t_idx+1].isdigit() else 0
             stats["E"] = "E" in stat_str[t_idx+1:]
     except (ValueError, IndexError) as e:
-        print(f"Error parsing stats '{stat_str}': {e}. Using defaults.")
+        write(f"Error parsing stats '{stat_str}': {e}. Using defaults.")
         stats = {"S": 0, "A": 0, "I": 0, "W": 0, "L": 0}
         if is_consumable:
             stats["T"] = 0